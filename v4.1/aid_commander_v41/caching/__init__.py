@@ -0,0 +1 @@
+# Result caching module
\ No newline at end of file
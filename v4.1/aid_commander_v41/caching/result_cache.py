@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+AID Commander v4.1 - Redis Result Cache
+
+Shared TTL cache for expensive knowledge graph, RAG and hallucination detection
+results so identical requests across CLI invocations skip the full pipeline.
+"""
+
+import hashlib
+import pickle
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class RedisResultCache:
+    """
+    Redis-backed result cache with per-entry TTL
+
+    The cache degrades gracefully: if Redis is unavailable every lookup is a
+    miss and writes are dropped, so callers never need to special-case it.
+    Values are pickled, so the Redis instance must be trusted.
+    """
+
+    def __init__(self,
+                 redis_url: str,
+                 default_ttl: int = 3600,
+                 namespace: str = "aid:v41"):
+        self.redis_url = redis_url
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.client = None
+        self.enabled = False
+
+        # Performance tracking
+        self.hits = 0
+        self.misses = 0
+
+        self.logger = logger.bind(component="ResultCache")
+
+    async def initialize(self) -> bool:
+        """Connect to Redis, disabling the cache if it cannot be reached"""
+        try:
+            import redis.asyncio as redis
+
+            self.client = redis.from_url(self.redis_url)
+            await self.client.ping()
+            self.enabled = True
+            self.logger.info("Redis result cache connected")
+        except Exception as e:
+            self.client = None
+            self.enabled = False
+            self.logger.warning(f"Redis result cache disabled: {e}")
+
+        return self.enabled
+
+    def make_key(self, prefix: str, *parts: Any) -> str:
+        """Build a namespaced cache key from a prefix and hashed key parts"""
+        digest = hashlib.sha256(
+            "\x1f".join(str(part) for part in parts).encode("utf-8")
+        ).hexdigest()
+        return f"{self.namespace}:{prefix}:{digest}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        try:
+            raw = await self.client.get(key)
+        except Exception as e:
+            self.logger.debug(f"Cache get failed for {key}: {e}")
+            raw = None
+
+        value = await self._load(key, raw)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Return cached values for several keys in one round-trip"""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        try:
+            raw_values = await self.client.mget(keys)
+        except Exception as e:
+            self.logger.debug(f"Cache mget failed: {e}")
+            raw_values = [None] * len(keys)
+
+        values = []
+        for key, raw in zip(keys, raw_values):
+            value = await self._load(key, raw)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            values.append(value)
+        return values
+
+    async def _load(self, key: str, raw: Optional[bytes]) -> Optional[Any]:
+        """Unpickle a cached value, deleting entries that no longer load"""
+        if raw is None:
+            return None
+
+        try:
+            return pickle.loads(raw)
+        except Exception as e:
+            # Entries pickled by an older version of a class are dropped so
+            # the caller recomputes and re-caches them
+            self.logger.debug(f"Discarding unreadable cache entry {key}: {e}")
+            try:
+                await self.client.delete(key)
+            except Exception:
+                pass
+            return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Store a value under a key with a TTL in seconds"""
+        if not self.enabled:
+            return
+
+        try:
+            await self.client.setex(
+                key,
+                ttl or self.default_ttl,
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except Exception as e:
+            self.logger.debug(f"Cache set failed for {key}: {e}")
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every key built with the given prefix, returning how many were removed"""
+        if not self.enabled:
+            return 0
+
+        try:
+            keys = [key async for key in self.client.scan_iter(match=f"{self.namespace}:{prefix}:*")]
+            if keys:
+                await self.client.delete(*keys)
+            return len(keys)
+        except Exception as e:
+            self.logger.debug(f"Cache delete failed for {prefix}: {e}")
+            return 0
+
+    async def get_performance_stats(self) -> Dict[str, Any]:
+        """Get performance statistics for the result cache"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self.client:
+            await self.client.aclose()
+            self.logger.info("Redis result cache closed")
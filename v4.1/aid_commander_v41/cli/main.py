@@ -7,37 +7,142 @@ hallucination detection, and multi-layer validation commands.
 """
 
 import asyncio
+import functools
+import importlib
+import os
 import sys
-import json
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
+import aiofiles
 import click
+import orjson
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.segment import Segments
 from rich.syntax import Syntax
 import structlog
 
-# Import v4.1 components
-from ..knowledge_graph.graphiti.temporal_engine import AIDGraphitiEngine
-from ..knowledge_graph.rag.hybrid_search import HybridRAGSystem
-from ..frameworks.pydantic_ai.knowledge_builder import PydanticAIKnowledgeBuilder
-from ..validation.multi_layer.validation_engine import MultiLayerValidationEngine
-from ..validation.hallucination.detection_engine import HallucinationDetectionEngine
-from ..memory_enhanced.graph_memory_bank import GraphEnhancedMemoryBank
-
-# Import v4.0 base CLI
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "v4"))
-from aid_commander import AIDCommanderV4
-
 console = Console()
 logger = structlog.get_logger(__name__)
 
+# v4.1 components are imported lazily so `--help` and other cheap commands
+# don't pay for the Neo4j/Chroma/transformer import chain
+_LAZY_IMPORTS = {
+    "AIDGraphitiEngine": "..knowledge_graph.graphiti.temporal_engine",
+    "HybridRAGSystem": "..knowledge_graph.rag.hybrid_search",
+    "PydanticAIKnowledgeBuilder": "..frameworks.pydantic_ai.knowledge_builder",
+    "MultiLayerValidationEngine": "..validation.multi_layer.validation_engine",
+    "HallucinationDetectionEngine": "..validation.hallucination.detection_engine",
+    "GraphEnhancedMemoryBank": "..memory_enhanced.graph_memory_bank",
+}
+
+
+def _get_v4_commander():
+    """Import the v4.0 base commander on first use"""
+    v4_path = str(Path(__file__).parent.parent.parent.parent / "v4")
+    if v4_path not in sys.path:
+        sys.path.insert(0, v4_path)
+    from aid_commander import AIDCommanderV4
+    return AIDCommanderV4
+
+
+def __getattr__(name: str):
+    """Resolve component classes lazily for backward compatibility"""
+    if name == "AIDCommanderV4":
+        return _get_v4_commander()
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __package__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Process-wide event loop shared by every async command callback
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared CLI event loop, creating it on first use"""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+
+def click_async(f):
+    """Run an async click callback to completion on the shared event loop"""
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        return _get_event_loop().run_until_complete(f(*args, **kwargs))
+    return wrapper
+
+
+# Built-in v4.1 configuration, constructed once at import time
+_DEFAULT_CONFIG = {
+    "neo4j_uri": "bolt://localhost:7687",
+    "neo4j_username": "neo4j", 
+    "neo4j_password": "aid-commander-v41-secure",
+    "neo4j_max_connection_pool_size": 100,
+    "redis_url": "redis://localhost:6379",
+    "result_cache_ttl": 3600,
+    "chroma_persist_dir": "./chroma_db",
+    "confidence_threshold": 0.92,
+    "hallucination_threshold": 0.3
+}
+
+
+# Shared Rich renderable specs - (header, style) pairs per table layout
+_METRIC_COLUMNS = (("Metric", "cyan"), ("Value", "green"))
+_API_STRUCTURE_COLUMNS = (("Class", "cyan"), ("Method", "green"), ("Signature", "yellow"))
+_PATTERN_COLUMNS = (
+    ("Pattern Name", "cyan"), ("Success Rate", "green"),
+    ("Usage Count", "yellow"), ("Framework", "blue")
+)
+_LAYER_COLUMNS = (("Layer", "cyan"), ("Confidence", "green"), ("Issues", "yellow"), ("Status", "blue"))
+_HALLUCINATION_COLUMNS = (
+    ("Type", "red"), ("Incorrect Usage", "yellow"),
+    ("Correct Usage", "green"), ("Confidence", "blue")
+)
+_DECISION_TYPE_COLUMNS = (
+    ("Decision Type", "cyan"), ("Decisions", "yellow"),
+    ("Success Rate", "green"), ("Projects", "blue")
+)
+
+
+# Rich colour per validation issue severity
+_SEVERITY_COLORS = {
+    "critical": "red",
+    "high": "orange",
+    "medium": "yellow",
+    "low": "blue"
+}
+
+
+def _make_progress(progress_console: Optional[Console] = None) -> Progress:
+    """Create a spinner progress display with the standard CLI columns"""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=progress_console or console
+    )
+
+
+def _format_percentages(values: List[float]) -> List[str]:
+    """Format a column of ratios as percentages (e.g. 0.923 -> '92.3%')"""
+    return [f"{value:.1%}" for value in values]
+
+
+def _make_table(title: str, columns: Tuple[Tuple[str, str], ...]) -> Table:
+    """Create a Rich table from a shared (header, style) column spec"""
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
 
 class AIDCommanderV41:
     """
@@ -60,6 +165,8 @@ class AIDCommanderV41:
         self.validation_engine = None
         self.hallucination_detector = None
         self.graph_memory_bank = None
+        self.result_cache = None
+        self.neo4j_driver = None
         
         # Configuration
         self.config = self._load_config()
@@ -67,32 +174,41 @@ class AIDCommanderV41:
     
     def _load_config(self) -> dict:
         """Load v4.1 configuration"""
-        return {
-            "neo4j_uri": "bolt://localhost:7687",
-            "neo4j_username": "neo4j", 
-            "neo4j_password": "aid-commander-v41-secure",
-            "redis_url": "redis://localhost:6379",
-            "chroma_persist_dir": "./chroma_db",
-            "confidence_threshold": 0.92,
-            "hallucination_threshold": 0.3
-        }
+        # Built-in defaults are trusted, so hand out a copy without re-validating
+        return dict(_DEFAULT_CONFIG)
     
     async def initialize(self, project_path: Optional[str] = None) -> bool:
         """Initialize AID Commander v4.1 with all knowledge graph components"""
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console
-        ) as progress:
+        from neo4j import AsyncGraphDatabase
+        
+        from ..knowledge_graph.graphiti.temporal_engine import AIDGraphitiEngine
+        from ..knowledge_graph.rag.hybrid_search import HybridRAGSystem
+        from ..validation.multi_layer.validation_engine import MultiLayerValidationEngine
+        from ..validation.hallucination.detection_engine import HallucinationDetectionEngine
+        from ..memory_enhanced.graph_memory_bank import GraphEnhancedMemoryBank
+        from ..caching.result_cache import RedisResultCache
+        
+        with _make_progress(self.console) as progress:
             
             # Initialize base v4.0 commander
             init_task = progress.add_task("Initializing AID Commander v4.0 base...", total=None)
-            self.v4_commander = AIDCommanderV4()
+            self.v4_commander = _get_v4_commander()()
             if project_path:
                 await self.v4_commander.initialize_project(project_path)
             progress.update(init_task, description="✅ AID Commander v4.0 base initialized")
             
+            # Initialize Redis result cache
+            cache_task = progress.add_task("Connecting result cache...", total=None)
+            self.result_cache = RedisResultCache(
+                self.config["redis_url"],
+                default_ttl=self.config["result_cache_ttl"]
+            )
+            if await self.result_cache.initialize():
+                progress.update(cache_task, description="✅ Result cache connected")
+            else:
+                progress.update(cache_task, description="⚠️  Result cache unavailable, continuing without it")
+            
             # Initialize Graphiti temporal engine
             graphiti_task = progress.add_task("Initializing Graphiti temporal engine...", total=None)
             neo4j_config = {
@@ -100,14 +216,32 @@ class AIDCommanderV41:
                 "username": self.config["neo4j_username"],
                 "password": self.config["neo4j_password"]
             }
-            self.graphiti_engine = AIDGraphitiEngine(neo4j_config)
+            
+            # One driver (and bolt connection pool) shared by all graph components
+            self.neo4j_driver = AsyncGraphDatabase.driver(
+                neo4j_config["uri"],
+                auth=(neo4j_config["username"], neo4j_config["password"]),
+                max_connection_pool_size=self.config["neo4j_max_connection_pool_size"],
+                connection_acquisition_timeout=60,
+                max_connection_lifetime=3600,
+                connection_timeout=30,
+                max_transaction_retry_time=15
+            )
+            
+            self.graphiti_engine = AIDGraphitiEngine(
+                neo4j_config, result_cache=self.result_cache, driver=self.neo4j_driver
+            )
             await self.graphiti_engine.initialize()
             progress.update(graphiti_task, description="✅ Graphiti temporal engine ready")
             
             # Initialize RAG system
             rag_task = progress.add_task("Initializing hybrid RAG system...", total=None)
             chroma_config = {"persist_directory": self.config["chroma_persist_dir"]}
-            self.rag_system = HybridRAGSystem(chroma_config, neo4j_config)
+            self.rag_system = HybridRAGSystem(
+                chroma_config, neo4j_config,
+                result_cache=self.result_cache,
+                neo4j_driver=self.neo4j_driver
+            )
             await self.rag_system.initialize()
             progress.update(rag_task, description="✅ Hybrid RAG system ready")
             
@@ -135,7 +269,8 @@ class AIDCommanderV41:
             self.hallucination_detector = HallucinationDetectionEngine(
                 self.validation_engine,
                 self.graphiti_engine,
-                self.rag_system
+                self.rag_system,
+                result_cache=self.result_cache
             )
             progress.update(hallucination_task, description="✅ Hallucination detector ready")
         
@@ -155,6 +290,18 @@ class AIDCommanderV41:
         ))
         
         return True
+    
+    async def close(self):
+        """Close all components and the shared Neo4j driver"""
+        if self.graphiti_engine:
+            await self.graphiti_engine.close()
+        if self.rag_system:
+            await self.rag_system.close()
+        if self.result_cache:
+            await self.result_cache.close()
+        if self.neo4j_driver:
+            await self.neo4j_driver.close()
+            self.neo4j_driver = None
 
 
 # CLI Groups
@@ -172,7 +319,10 @@ def cli(ctx):
     • Enhanced memory bank
     """
     ctx.ensure_object(dict)
-    ctx.obj['commander'] = AIDCommanderV41()
+    commander = AIDCommanderV41()
+    ctx.obj['commander'] = commander
+    # Release drivers and connections once the command has finished
+    ctx.call_on_close(lambda: _get_event_loop().run_until_complete(commander.close()))
 
 
 @cli.group()
@@ -203,11 +353,26 @@ def memory(ctx):
     pass
 
 
+@functools.lru_cache(maxsize=64)
+def _render_python(code: str) -> Segments:
+    """Highlight Python code once and reuse the rendered segments"""
+    syntax = Syntax(code, "python", theme="monokai", line_numbers=True)
+    return Segments(list(console.render(syntax)))
+
+
+async def _read_code_file(file_path: Path) -> str:
+    """Read a source file without blocking the event loop"""
+    async with aiofiles.open(file_path, 'rb') as f:
+        raw = await f.read()
+    return raw.decode('utf-8', errors='replace')
+
+
 # Core Commands
 @cli.command()
 @click.option('--project-path', '-p', default='.', help='Project directory path')
 @click.option('--with-knowledge-graphs', '-kg', is_flag=True, help='Initialize with knowledge graph support')
 @click.pass_context
+@click_async
 async def init(ctx, project_path: str, with_knowledge_graphs: bool):
     """🚀 Initialize AID Commander v4.1 with optional knowledge graphs"""
     
@@ -232,8 +397,12 @@ async def init(ctx, project_path: str, with_knowledge_graphs: bool):
 @click.argument('framework_name')
 @click.option('--docs-url', '-d', help='Framework documentation URL')
 @click.option('--local-docs', '-l', help='Local documentation path')
+@click.option('--concurrency', '-j', default=lambda: min(32, (os.cpu_count() or 1) * 4),
+              type=int, show_default="min(32, cpu_count * 4)",
+              help='Maximum concurrent knowledge graph writes')
 @click.pass_context
-async def add_framework(ctx, framework_name: str, docs_url: str, local_docs: str):
+@click_async
+async def add_framework(ctx, framework_name: str, docs_url: str, local_docs: str, concurrency: int):
     """📚 Add framework knowledge graph (e.g., pydantic-ai, fastapi)"""
     
     commander = ctx.obj['commander']
@@ -244,16 +413,20 @@ async def add_framework(ctx, framework_name: str, docs_url: str, local_docs: str
     console.print(f"[blue]🔧 Building knowledge graph for {framework_name}...[/blue]")
     
     if framework_name.lower() == 'pydantic-ai':
+        from ..frameworks.pydantic_ai.knowledge_builder import PydanticAIKnowledgeBuilder
+        
         builder = PydanticAIKnowledgeBuilder(
             commander.graphiti_engine,
-            commander.rag_system
+            commander.rag_system,
+            concurrency=concurrency
         )
-        result = await builder.build_complete_knowledge_graph()
+        try:
+            result = await builder.build_complete_knowledge_graph()
+        finally:
+            await builder.aclose()
         
         # Display results
-        table = Table(title=f"📊 {framework_name} Knowledge Graph Results")
-        table.add_column("Metric", style="cyan")
-        table.add_column("Value", style="green")
+        table = _make_table(f"📊 {framework_name} Knowledge Graph Results", _METRIC_COLUMNS)
         
         table.add_row("Entities Processed", str(result["entities_processed"]))
         table.add_row("Validation Patterns", str(result["validation_patterns"]))
@@ -267,31 +440,13 @@ async def add_framework(ctx, framework_name: str, docs_url: str, local_docs: str
         console.print(f"[yellow]⚠️  Framework {framework_name} not yet supported. Available: pydantic-ai[/yellow]")
 
 
-@kg.command('query-api')
-@click.argument('api_call')
-@click.option('--framework', '-f', required=True, help='Framework name')
-@click.pass_context
-async def query_api(ctx, api_call: str, framework: str):
-    """🔍 Query knowledge graph for API validation"""
-    
-    commander = ctx.obj['commander']
-    if not commander.initialized:
-        console.print("[red]❌ Please initialize with knowledge graphs first[/red]")
-        return
-    
-    console.print(f"[blue]🔍 Validating API: {api_call} in {framework}...[/blue]")
-    
-    validation = await commander.rag_system.validate_api_usage(api_call, framework)
-    
-    # Display validation results
+def _print_api_validation(validation) -> None:
+    """Display the outcome of a single API validation"""
     if validation.is_valid:
         console.print(f"[bold green]✅ API Valid: {validation.confidence:.1%} confidence[/bold green]")
         
         if validation.api_structure:
-            table = Table(title="📋 API Structure")
-            table.add_column("Class", style="cyan")
-            table.add_column("Method", style="green")
-            table.add_column("Signature", style="yellow")
+            table = _make_table("📋 API Structure", _API_STRUCTURE_COLUMNS)
             
             for api in validation.api_structure:
                 table.add_row(
@@ -305,13 +460,70 @@ async def query_api(ctx, api_call: str, framework: str):
         
         if validation.issues:
             console.print("[bold red]Issues:[/bold red]")
-            for issue in validation.issues:
-                console.print(f"  • {issue}")
+            console.print("\n".join(f"  • {issue}" for issue in validation.issues))
         
         if validation.suggestions:
             console.print("[bold yellow]Suggestions:[/bold yellow]")
-            for suggestion in validation.suggestions:
-                console.print(f"  • {suggestion}")
+            console.print("\n".join(f"  • {suggestion}" for suggestion in validation.suggestions))
+
+
+async def _validate_api_batch(commander, api_calls: List[str], framework: str) -> None:
+    """Validate several API calls in one knowledge graph round-trip"""
+    console.print(f"[blue]🔍 Validating {len(api_calls)} APIs in {framework}...[/blue]")
+    
+    validations = await commander.rag_system.validate_api_usage_batch(api_calls, framework)
+    
+    for api_call, validation in validations.items():
+        console.print(f"\n[bold]{api_call}[/bold]")
+        _print_api_validation(validation)
+
+
+@kg.command('query-api')
+@click.argument('api_call')
+@click.option('--framework', '-f', required=True, help='Framework name')
+@click.pass_context
+@click_async
+async def query_api(ctx, api_call: str, framework: str):
+    """🔍 Query knowledge graph for API validation"""
+    
+    commander = ctx.obj['commander']
+    if not commander.initialized:
+        console.print("[red]❌ Please initialize with knowledge graphs first[/red]")
+        return
+    
+    # Comma-separated API calls are validated as a single batch
+    if ',' in api_call:
+        api_calls = [call.strip() for call in api_call.split(',') if call.strip()]
+        await _validate_api_batch(commander, api_calls, framework)
+        return
+    
+    console.print(f"[blue]🔍 Validating API: {api_call} in {framework}...[/blue]")
+    
+    validation = await commander.rag_system.validate_api_usage(api_call, framework)
+    
+    # Display validation results
+    _print_api_validation(validation)
+
+
+@kg.command('query-api-batch')
+@click.argument('calls_file', type=click.File('r'), default='-')
+@click.option('--framework', '-f', required=True, help='Framework name')
+@click.pass_context
+@click_async
+async def query_api_batch(ctx, calls_file, framework: str):
+    """📦 Validate API calls listed one per line in a file (or stdin)"""
+    
+    commander = ctx.obj['commander']
+    if not commander.initialized:
+        console.print("[red]❌ Please initialize with knowledge graphs first[/red]")
+        return
+    
+    api_calls = [line.strip() for line in calls_file if line.strip()]
+    if not api_calls:
+        console.print("[yellow]⚠️  No API calls provided[/yellow]")
+        return
+    
+    await _validate_api_batch(commander, api_calls, framework)
 
 
 @kg.command('search-patterns')
@@ -319,6 +531,7 @@ async def query_api(ctx, api_call: str, framework: str):
 @click.option('--framework', '-f', help='Filter by framework')
 @click.option('--min-success-rate', '-s', default=0.8, help='Minimum success rate')
 @click.pass_context
+@click_async
 async def search_patterns(ctx, query: str, framework: str, min_success_rate: float):
     """📈 Search for successful patterns in knowledge graph"""
     
@@ -339,16 +552,15 @@ async def search_patterns(ctx, query: str, framework: str, min_success_rate: flo
         return
     
     if patterns:
-        table = Table(title=f"📈 Successful Patterns for '{query}'")
-        table.add_column("Pattern Name", style="cyan")
-        table.add_column("Success Rate", style="green")
-        table.add_column("Usage Count", style="yellow")
-        table.add_column("Framework", style="blue")
+        table = _make_table(f"📈 Successful Patterns for '{query}'", _PATTERN_COLUMNS)
+        
+        top_patterns = patterns[:10]  # Top 10
+        success_rates = _format_percentages([pattern.success_rate for pattern in top_patterns])
         
-        for pattern in patterns[:10]:  # Top 10
+        for pattern, success_rate in zip(top_patterns, success_rates):
             table.add_row(
                 pattern.name,
-                f"{pattern.success_rate:.1%}",
+                success_rate,
                 str(pattern.usage_count),
                 pattern.framework
             )
@@ -364,6 +576,7 @@ async def search_patterns(ctx, query: str, framework: str, min_success_rate: flo
 @click.option('--framework', '-f', required=True, help='Target framework')
 @click.option('--confidence-threshold', '-c', default=0.92, help='Confidence threshold')
 @click.pass_context
+@click_async
 async def validate_generate_code(ctx, intent: str, framework: str, confidence_threshold: float):
     """🎯 Validate code generation with multi-layer analysis"""
     
@@ -374,11 +587,7 @@ async def validate_generate_code(ctx, intent: str, framework: str, confidence_th
     
     console.print(f"[blue]🎯 Validating code generation for: {intent}...[/blue]")
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _make_progress() as progress:
         
         validation_task = progress.add_task("Running multi-layer validation...", total=None)
         
@@ -397,11 +606,7 @@ async def validate_generate_code(ctx, intent: str, framework: str, confidence_th
         console.print(f"[bold red]⚠️  VALIDATION NEEDS IMPROVEMENT: {consensus_score:.1%} consensus[/bold red]")
     
     # Show layer breakdown
-    table = Table(title="📊 Validation Layer Results")
-    table.add_column("Layer", style="cyan")
-    table.add_column("Confidence", style="green") 
-    table.add_column("Issues", style="yellow")
-    table.add_column("Status", style="blue")
+    table = _make_table("📊 Validation Layer Results", _LAYER_COLUMNS)
     
     for layer_name, result in validation_result.layer_results.items():
         status = "✅ Pass" if result.confidence >= 0.8 else "⚠️  Review" if result.confidence >= 0.5 else "❌ Fail"
@@ -417,13 +622,12 @@ async def validate_generate_code(ctx, intent: str, framework: str, confidence_th
     # Show recommendations
     if validation_result.recommendations:
         console.print("\n[bold yellow]💡 Recommendations:[/bold yellow]")
-        for rec in validation_result.recommendations:
-            console.print(f"  {rec}")
+        console.print("\n".join(f"  {rec}" for rec in validation_result.recommendations))
     
     # Show validated approach if available
     if validation_result.validated_approach:
         console.print("\n[bold green]✅ Validated Approach:[/bold green]")
-        syntax = Syntax(validation_result.validated_approach, "python", theme="monokai", line_numbers=True)
+        syntax = _render_python(validation_result.validated_approach)
         console.print(syntax)
 
 
@@ -432,6 +636,7 @@ async def validate_generate_code(ctx, intent: str, framework: str, confidence_th
 @click.option('--frameworks', '-f', help='Comma-separated list of frameworks')
 @click.option('--detect-mixing', is_flag=True, help='Detect framework mixing issues')
 @click.pass_context
+@click_async
 async def validate_code_file(ctx, file_path: str, frameworks: str, detect_mixing: bool):
     """📝 Validate existing code file against knowledge graphs"""
     
@@ -448,33 +653,49 @@ async def validate_code_file(ctx, file_path: str, frameworks: str, detect_mixing
     console.print(f"[blue]📝 Validating code file: {file_path}...[/blue]")
     
     # Read code
-    code_content = file_path_obj.read_text()
+    code_content = await _read_code_file(file_path_obj)
     
     # Determine frameworks
-    framework_list = frameworks.split(',') if frameworks else ['PydanticAI']  # Default
+    framework_list = (
+        [fw.strip() for fw in frameworks.split(',') if fw.strip()] if frameworks else ['PydanticAI']  # Default
+    )
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _make_progress() as progress:
         
         validation_task = progress.add_task("Analyzing code structure...", total=None)
         
-        validation_result = await commander.validation_engine.validate_code_generation(
-            "code file validation",
-            framework_list[0],
-            code_content
-        )
+        # Validate against every listed framework concurrently
+        validation_results = await asyncio.gather(*(
+            commander.validation_engine.validate_code_generation(
+                "code file validation",
+                framework,
+                code_content
+            )
+            for framework in framework_list
+        ))
         
         progress.update(validation_task, description="✅ Code analysis complete")
     
-    # Display results
-    consensus_score = validation_result.consensus_score
+    # Merge per-framework results: average consensus, de-duplicated issues
+    consensus_score = sum(
+        result.consensus_score for result in validation_results
+    ) / len(validation_results)
     
+    overall_issues = {}
+    for result in validation_results:
+        for issue in result.overall_issues:
+            overall_issues.setdefault((issue.severity, issue.description), issue)
+    
+    # Display results
     console.print(f"\n[bold]📊 Validation Results for {file_path}[/bold]")
     console.print(f"Consensus Score: {consensus_score:.1%}")
     
+    if len(framework_list) > 1:
+        console.print("\n".join(
+            f"  {framework}: {result.consensus_score:.1%}"
+            for framework, result in zip(framework_list, validation_results)
+        ))
+    
     if consensus_score >= 0.9:
         console.print("[bold green]✅ Excellent code quality[/bold green]")
     elif consensus_score >= 0.7:
@@ -483,16 +704,13 @@ async def validate_code_file(ctx, file_path: str, frameworks: str, detect_mixing
         console.print("[bold red]❌ Code needs significant improvement[/bold red]")
     
     # Show issues if any
-    if validation_result.overall_issues:
+    if overall_issues:
         console.print("\n[bold red]🚨 Issues Found:[/bold red]")
-        for issue in validation_result.overall_issues[:10]:  # Top 10 issues
-            severity_color = {
-                "critical": "red",
-                "high": "orange",
-                "medium": "yellow",
-                "low": "blue"
-            }.get(issue.severity.value, "white")
-            console.print(f"  [{severity_color}]• {issue.description}[/{severity_color}]")
+        issue_lines = []
+        for issue in list(overall_issues.values())[:10]:  # Top 10 issues
+            severity_color = _SEVERITY_COLORS.get(issue.severity.value, "white")
+            issue_lines.append(f"  [{severity_color}]• {issue.description}[/{severity_color}]")
+        console.print("\n".join(issue_lines))
 
 
 # Hallucination Detection Commands
@@ -501,6 +719,7 @@ async def validate_code_file(ctx, file_path: str, frameworks: str, detect_mixing
 @click.option('--frameworks', '-f', default='PydanticAI', help='Comma-separated frameworks')
 @click.option('--auto-correct', is_flag=True, help='Automatically generate corrections')
 @click.pass_context
+@click_async
 async def detect_hallucinations(ctx, file_path: str, frameworks: str, auto_correct: bool):
     """🚨 Detect AI hallucinations in generated code"""
     
@@ -517,14 +736,10 @@ async def detect_hallucinations(ctx, file_path: str, frameworks: str, auto_corre
     console.print(f"[blue]🚨 Detecting hallucinations in: {file_path}...[/blue]")
     
     # Read code
-    code_content = file_path_obj.read_text()
+    code_content = await _read_code_file(file_path_obj)
     framework_list = frameworks.split(',')
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    with _make_progress() as progress:
         
         detection_task = progress.add_task("Running hallucination detection...", total=None)
         
@@ -542,11 +757,7 @@ async def detect_hallucinations(ctx, file_path: str, frameworks: str, auto_corre
         console.print(f"[bold red]🚨 HALLUCINATIONS DETECTED: {len(hallucination_result.detected_hallucinations)} issues[/bold red]")
         
         # Show detected hallucinations
-        table = Table(title="🚨 Detected Hallucinations")
-        table.add_column("Type", style="red")
-        table.add_column("Incorrect Usage", style="yellow")
-        table.add_column("Correct Usage", style="green")
-        table.add_column("Confidence", style="blue")
+        table = _make_table("🚨 Detected Hallucinations", _HALLUCINATION_COLUMNS)
         
         for hallucination in hallucination_result.detected_hallucinations:
             table.add_row(
@@ -561,13 +772,14 @@ async def detect_hallucinations(ctx, file_path: str, frameworks: str, auto_corre
         # Show corrected code if auto-correct enabled
         if auto_correct and hallucination_result.corrected_code:
             console.print("\n[bold green]✅ Auto-Corrected Code:[/bold green]")
-            syntax = Syntax(hallucination_result.corrected_code, "python", theme="monokai", line_numbers=True)
+            syntax = _render_python(hallucination_result.corrected_code)
             console.print(syntax)
             
             # Offer to save corrected code
-            if click.confirm("Save corrected code to file?"):
+            if await asyncio.to_thread(click.confirm, "Save corrected code to file?"):
                 corrected_path = file_path_obj.with_suffix('.corrected.py')
-                corrected_path.write_text(hallucination_result.corrected_code)
+                async with aiofiles.open(corrected_path, 'w') as f:
+                    await f.write(hallucination_result.corrected_code)
                 console.print(f"[green]✅ Corrected code saved to: {corrected_path}[/green]")
     else:
         console.print("[bold green]✅ No hallucinations detected - code looks good![/bold green]")
@@ -578,6 +790,7 @@ async def detect_hallucinations(ctx, file_path: str, frameworks: str, auto_corre
 @click.option('--framework', '-f', required=True, help='Framework name')
 @click.option('--decision-type', '-t', help='Filter by decision type')
 @click.pass_context
+@click_async
 async def cross_project_learnings(ctx, framework: str, decision_type: str):
     """🔗 Get learnings from across all projects"""
     
@@ -600,17 +813,16 @@ async def cross_project_learnings(ctx, framework: str, decision_type: str):
         console.print(f"🎯 Overall Success Rate: {stats['avg_success_rate']:.1%} (across {stats['total_decisions']} decisions)")
     
     if learnings["decision_types"]:
-        table = Table(title="📈 Decision Type Analysis")
-        table.add_column("Decision Type", style="cyan")
-        table.add_column("Decisions", style="yellow")
-        table.add_column("Success Rate", style="green")
-        table.add_column("Projects", style="blue")
+        table = _make_table("📈 Decision Type Analysis", _DECISION_TYPE_COLUMNS)
+        
+        decision_types = learnings["decision_types"]
+        success_rates = _format_percentages([dt["avg_success"] for dt in decision_types])
         
-        for dt in learnings["decision_types"]:
+        for dt, success_rate in zip(decision_types, success_rates):
             table.add_row(
                 dt["decision_type"] or "General",
                 str(dt["total_decisions"]),
-                f"{dt['avg_success']:.1%}",
+                success_rate,
                 str(dt["project_count"])
             )
         
@@ -624,6 +836,7 @@ async def cross_project_learnings(ctx, framework: str, decision_type: str):
 @click.option('--framework', '-f', required=True, help='Framework name')
 @click.option('--include-cross-project', is_flag=True, help='Include cross-project insights')
 @click.pass_context
+@click_async
 async def memory_recommend(ctx, query: str, framework: str, include_cross_project: bool):
     """💡 Get memory-enhanced recommendations"""
     
@@ -644,24 +857,37 @@ async def memory_recommend(ctx, query: str, framework: str, include_cross_projec
     console.print(f"Confidence: {optimization['confidence']:.1%}")
     
     console.print("\n[bold yellow]📋 Recommendations:[/bold yellow]")
-    for rec in optimization["recommendations"]:
-        console.print(f"  {rec}")
+    if optimization["recommendations"]:
+        console.print("\n".join(f"  {rec}" for rec in optimization["recommendations"]))
     
     if optimization["temporal_patterns"]:
         console.print("\n[bold blue]📈 Proven Patterns:[/bold blue]")
-        for pattern in optimization["temporal_patterns"]:
-            console.print(f"  • {pattern}")
+        console.print("\n".join(f"  • {pattern}" for pattern in optimization["temporal_patterns"]))
     
     if optimization["cross_framework_insights"]:
         console.print("\n[bold green]🔄 Cross-Framework Insights:[/bold green]")
-        for insight in optimization["cross_framework_insights"]:
-            console.print(f"  • {insight}")
+        console.print("\n".join(f"  • {insight}" for insight in optimization["cross_framework_insights"]))
 
 
 # Performance and Stats Commands
+def _format_stat_value(key: str, value) -> str:
+    """Format a single performance stat for display"""
+    if isinstance(value, float):
+        if 'time' in key.lower():
+            return f"{value:.3f}s"
+        elif 'rate' in key.lower() or 'threshold' in key.lower():
+            return f"{value:.1%}"
+        return f"{value:.2f}"
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, default=str).decode()
+    return str(value)
+
+
 @cli.command('stats')
+@click.option('--json', 'as_json', is_flag=True, help='Output raw statistics as JSON')
 @click.pass_context
-async def stats(ctx):
+@click_async
+async def stats(ctx, as_json: bool):
     """📊 Show performance statistics for all components"""
     
     commander = ctx.obj['commander']
@@ -669,42 +895,41 @@ async def stats(ctx):
         console.print("[red]❌ Please initialize first[/red]")
         return
     
-    console.print("[blue]📊 Gathering performance statistics...[/blue]")
-    
-    # Gather stats from all components
-    stats_data = {}
-    
-    if commander.graphiti_engine:
-        stats_data["Graphiti Engine"] = await commander.graphiti_engine.get_performance_stats()
-    
-    if commander.rag_system:
-        stats_data["RAG System"] = await commander.rag_system.get_performance_stats()
-    
-    if commander.validation_engine:
-        stats_data["Validation Engine"] = await commander.validation_engine.get_performance_stats()
-    
-    if commander.hallucination_detector:
-        stats_data["Hallucination Detector"] = await commander.hallucination_detector.get_performance_stats()
+    if not as_json:
+        console.print("[blue]📊 Gathering performance statistics...[/blue]")
+    
+    # Gather stats from all components concurrently
+    components = {
+        "Graphiti Engine": commander.graphiti_engine,
+        "RAG System": commander.rag_system,
+        "Validation Engine": commander.validation_engine,
+        "Hallucination Detector": commander.hallucination_detector,
+        "Memory Bank": commander.graph_memory_bank,
+        "Result Cache": commander.result_cache
+    }
+    components = {name: component for name, component in components.items() if component}
+    
+    results = await asyncio.gather(
+        *(component.get_performance_stats() for component in components.values())
+    )
+    stats_data = dict(zip(components.keys(), results))
     
-    if commander.graph_memory_bank:
-        stats_data["Memory Bank"] = await commander.graph_memory_bank.get_performance_stats()
+    if as_json:
+        console.print_json(
+            orjson.dumps(stats_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        )
+        return
     
     # Display stats
     for component, stats in stats_data.items():
-        table = Table(title=f"📊 {component} Statistics")
-        table.add_column("Metric", style="cyan")
-        table.add_column("Value", style="green")
-        
-        for key, value in stats.items():
-            if isinstance(value, float):
-                if 'time' in key.lower():
-                    table.add_row(key.replace('_', ' ').title(), f"{value:.3f}s")
-                elif 'rate' in key.lower() or 'threshold' in key.lower():
-                    table.add_row(key.replace('_', ' ').title(), f"{value:.1%}")
-                else:
-                    table.add_row(key.replace('_', ' ').title(), f"{value:.2f}")
-            else:
-                table.add_row(key.replace('_', ' ').title(), str(value))
+        table = _make_table(f"📊 {component} Statistics", _METRIC_COLUMNS)
+        
+        rows = [
+            (key.replace('_', ' ').title(), _format_stat_value(key, value))
+            for key, value in stats.items()
+        ]
+        for row in rows:
+            table.add_row(*row)
         
         console.print(table)
         console.print()
@@ -719,19 +944,22 @@ def main():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Add async support to click
-    def async_command(f):
-        def wrapper(*args, **kwargs):
-            return asyncio.run(f(*args, **kwargs))
-        return wrapper
-    
-    # Apply async wrapper to all async commands
-    for command in [init, add_framework, query_api, search_patterns, 
-                   validate_generate_code, validate_code_file, detect_hallucinations,
-                   cross_project_learnings, memory_recommend, stats]:
-        command.callback = async_command(command.callback)
-    
-    cli()
+    # Drop structlog events below INFO before their key-value pairs are rendered
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.INFO))
+    
+    # Use uvloop when available for a faster event loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    try:
+        cli()
+    finally:
+        if _event_loop is not None and not _event_loop.is_closed():
+            _event_loop.run_until_complete(_event_loop.shutdown_asyncgens())
+            _event_loop.close()
 
 
 if __name__ == "__main__":
@@ -7,17 +7,26 @@ for the Pydantic AI framework with 99% API accuracy validation.
 """
 
 import asyncio
+import array
 import json
 import ast
 import inspect
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+import math
+import pickle
+import re
+import time
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
+from urllib.parse import urljoin, urldefrag, urlparse
 
+import ahocorasick
 import httpx
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import structlog
 
 from ...knowledge_graph.graphiti.temporal_engine import AIDGraphitiEngine, Pattern
@@ -25,8 +34,34 @@ from ...knowledge_graph.rag.hybrid_search import HybridRAGSystem, APIReference
 
 logger = structlog.get_logger(__name__)
 
+# XPath expressions are compiled once and reused for every documentation page
+_SECTION_HEADINGS = frozenset({'h2', 'h3', 'h4'})
+_SECTION_CONTENT_LIMIT = 11
+_HEADER_XPATH = etree.XPath("//*[self::h2 or self::h3 or self::h4]")
+_CODE_XPATH = etree.XPath("//pre|//code")
+_LINK_XPATH = etree.XPath("//a/@href")
 
-@dataclass
+# The Pydantic AI docs are an mkdocs Material site: API sections are anchored
+# h2/h3 headings and examples are highlighted pre blocks inside the article,
+# so navigation, sidebars and footers never need to be visited
+_MKDOCS_DOCS_PREFIX = "https://ai.pydantic.dev"
+_MKDOCS_ARTICLE_XPATH = etree.XPath("//article[contains(@class, 'md-content__inner')]")
+_MKDOCS_HEADER_XPATH = etree.XPath(".//h2[@id]|.//h3[@id]")
+_MKDOCS_CODE_XPATH = etree.XPath(".//div[contains(@class, 'highlight')]/pre")
+
+# Regexes applied to every documentation section and code block
+_IMPORT_RE = re.compile(r'from\s+pydantic_ai\s+import\s+(\w+)')
+_METHOD_CALL_RE = re.compile(r'(\w+)\.(\w+)\([^)]*\)')
+_AGENT_CTOR_RE = re.compile(r'Agent\([^)]*\)')
+
+_SUCCESS_RATE = attrgetter("success_rate")
+
+# Part of the documentation cache key; bump whenever page extraction or the
+# pickled FrameworkEntity layout changes so stale caches are not reused
+_DOCS_CACHE_VERSION = 1
+
+
+@dataclass(slots=True, frozen=True)
 class FrameworkEntity:
     """Represents a framework entity (class, method, function)"""
     name: str
@@ -41,7 +76,7 @@ class FrameworkEntity:
     confidence: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ValidationPattern:
     """Represents a validation pattern for API usage"""
     pattern_name: str
@@ -66,21 +101,63 @@ class PydanticAIKnowledgeBuilder:
     
     def __init__(self, 
                  graphiti_engine: AIDGraphitiEngine,
-                 rag_system: HybridRAGSystem):
+                 rag_system: HybridRAGSystem,
+                 concurrency: int = 8,
+                 max_doc_pages: int = 16,
+                 batch_size: int = 500,
+                 cache_dir: Optional[str] = str(Path(".aid_commander") / "kg_cache")):
         
         self.graphiti_engine = graphiti_engine
         self.rag_system = rag_system
         self.logger = logger.bind(component="PydanticAIBuilder")
         
+        # Maximum number of concurrent knowledge graph writes, each carrying
+        # up to batch_size rows in a single bulk statement
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        
+        # Documentation sub-pages fetched alongside the index page
+        self.max_doc_pages = max(0, max_doc_pages)
+        
+        # Shared HTTP/2 client so every documentation request of a build,
+        # including the RAG ingest, reuses pooled keep-alive connections
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+        )
+        
         # Framework configuration
         self.framework_name = "PydanticAI"
         self.docs_url = "https://ai.pydantic.dev"
         self.github_url = "https://github.com/pydantic/pydantic-ai"
+        self._mkdocs_site = self.docs_url.startswith(_MKDOCS_DOCS_PREFIX)
+        
+        # Parsed documentation is cached per framework and reused while the
+        # docs ETag/Last-Modified is unchanged; None disables the cache
+        self.docs_cache_path = Path(cache_dir) / f"{self.framework_name}.pkl" if cache_dir else None
         
         # Extracted entities
         self.entities: Dict[str, FrameworkEntity] = {}
+        
+        # Entity confidences stored column-wise (slot per entity key) so
+        # confidence reductions run over contiguous doubles
+        self._entity_slots: Dict[str, int] = {}
+        self._confidences = array.array('d')
+        
+        # Newly discovered entities waiting to be streamed to Graphiti
+        self._new_entities: List[FrameworkEntity] = []
+        
+        # Bumped whenever entities or validation patterns change so the
+        # overall confidence is only recomputed after a mutation
+        self._version = 0
+        self._confidence_cache: Optional[Tuple[int, float]] = None
         self.validation_patterns: List[ValidationPattern] = []
         
+        # Single-pass matcher over all known mistakes and correct usages,
+        # rebuilt whenever the validation patterns change
+        self._pattern_matcher = None
+        
         # Performance tracking
         self.build_start_time = None
         self.entities_processed = 0
@@ -88,34 +165,31 @@ class PydanticAIKnowledgeBuilder:
     async def build_complete_knowledge_graph(self) -> Dict[str, Any]:
         """Build complete knowledge graph for Pydantic AI"""
         
-        self.build_start_time = datetime.now()
+        self.build_start_time = time.perf_counter_ns()
         self.logger.info("Starting Pydantic AI knowledge graph construction")
         
         try:
-            # Step 1: Extract API structure from documentation
-            docs_entities = await self._extract_from_documentation()
-            
-            # Step 2: Build validated API patterns
-            validation_patterns = await self._build_validation_patterns()
-            
-            # Step 3: Create temporal entities in Graphiti
-            temporal_entities = await self._create_temporal_entities()
+            # Steps 1-3: Extract API structure from documentation, streaming
+            # each entity into Graphiti as it is found, while validated API
+            # patterns and validation rules are built concurrently
+            (docs_entities, temporal_entities), validation_patterns, validation_rules = await asyncio.gather(
+                self._create_temporal_entities(self._extract_from_documentation()),
+                self._build_validation_patterns(),
+                self._create_validation_rules()
+            )
             
             # Step 4: Build success/failure patterns
             success_patterns = await self._build_success_patterns()
             
-            # Step 5: Create comprehensive validation rules
-            validation_rules = await self._create_validation_rules()
-            
             # Step 6: Ingest into RAG system
             await self._ingest_into_rag_system()
             
-            build_time = (datetime.now() - self.build_start_time).total_seconds()
+            build_time = (time.perf_counter_ns() - self.build_start_time) / 1e9
             
             result = {
                 "framework": self.framework_name,
                 "entities_processed": self.entities_processed,
-                "documentation_entities": len(docs_entities),
+                "documentation_entities": docs_entities,
                 "validation_patterns": len(validation_patterns),
                 "temporal_entities": len(temporal_entities),
                 "success_patterns": len(success_patterns),
@@ -125,79 +199,211 @@ class PydanticAIKnowledgeBuilder:
                 "status": "completed"
             }
             
-            self.logger.info(f"Pydantic AI knowledge graph built successfully: {result}")
+            self.logger.info("Pydantic AI knowledge graph built successfully", **result)
             return result
             
         except Exception as e:
-            self.logger.error(f"Failed to build Pydantic AI knowledge graph: {e}")
+            self.logger.error("Failed to build Pydantic AI knowledge graph", error=str(e))
             raise
     
-    async def _extract_from_documentation(self) -> List[FrameworkEntity]:
-        """Extract API entities from Pydantic AI documentation"""
+    async def _extract_from_documentation(self) -> AsyncIterator[FrameworkEntity]:
+        """Extract API entities from Pydantic AI documentation
         
-        entities = []
+        Yields each distinct entity as soon as its page has been parsed.
+        """
+        
+        extracted = 0
         
         try:
+            # Reuse the previous extraction when the documentation is unchanged
+            cache_key = await self._docs_cache_key()
+            cached = await asyncio.to_thread(self._load_docs_cache, cache_key)
+            if cached is not None:
+                cached_entities, entities_processed = cached
+                for key, entity in cached_entities.items():
+                    self._register_entity(key, entity)
+                self.entities_processed += entities_processed
+                self.logger.info("Loaded documentation entities from cache", count=len(cached_entities))
+                for entity in self._drain_new_entities():
+                    yield entity
+                return
+            
+            processed_before = self.entities_processed
+            
             # Fetch main documentation
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(self.docs_url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract API documentation sections
-                api_sections = soup.find_all(['h2', 'h3', 'h4'])
-                
-                for section in api_sections:
-                    section_text = section.get_text().lower()
-                    
-                    # Look for class documentation
-                    if 'agent' in section_text and 'class' in section_text:
-                        agent_entity = await self._extract_agent_class_info(soup, section)
-                        if agent_entity:
-                            entities.append(agent_entity)
-                    
-                    # Look for method documentation
-                    elif any(method in section_text for method in ['run', 'run_sync', 'stream']):
-                        method_entity = await self._extract_method_info(soup, section)
-                        if method_entity:
-                            entities.append(method_entity)
-                
-                # Extract from code examples
-                code_blocks = soup.find_all(['pre', 'code'])
-                for code_block in code_blocks:
-                    code_entities = await self._extract_from_code_examples(code_block.get_text())
-                    entities.extend(code_entities)
+            tree = await self._fetch_page(self.docs_url)
+            await asyncio.to_thread(self._extract_from_page, tree)
+            for entity in self._drain_new_entities():
+                extracted += 1
+                yield entity
+            
+            # Fetch the linked documentation sub-pages concurrently
+            sub_pages = self._discover_sub_pages(tree)
+            sub_trees = await asyncio.gather(
+                *(self._fetch_page(url) for url in sub_pages),
+                return_exceptions=True
+            )
+            
+            complete = True
+            for url, sub_tree in zip(sub_pages, sub_trees):
+                if isinstance(sub_tree, Exception):
+                    self.logger.debug("Skipping documentation page", url=url, error=str(sub_tree))
+                    complete = False
+                    continue
+                await asyncio.to_thread(self._extract_from_page, sub_tree)
+                for entity in self._drain_new_entities():
+                    extracted += 1
+                    yield entity
+            
+            # A partial extraction must not be reused until the docs change
+            if complete:
+                await asyncio.to_thread(
+                    self._store_docs_cache, cache_key, self.entities_processed - processed_before
+                )
         
         except Exception as e:
-            self.logger.error(f"Failed to extract from documentation: {e}")
+            self.logger.error("Failed to extract from documentation", error=str(e))
         
-        self.logger.info(f"Extracted {len(entities)} entities from documentation")
-        return entities
+        self.logger.info("Extracted entities from documentation", count=extracted)
+    
+    def _drain_new_entities(self) -> List[FrameworkEntity]:
+        """Hand over the entities registered since the last drain"""
+        
+        new_entities, self._new_entities = self._new_entities, []
+        return new_entities
+    
+    async def _fetch_page(self, url: str) -> etree._Element:
+        """Download a documentation page, parsing it as the body streams in"""
+        
+        parser = lxml.html.HTMLParser()
+        
+        async with self._client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(65536):
+                parser.feed(chunk)
+        
+        return parser.close()
+    
+    async def _docs_cache_key(self) -> Optional[Tuple[int, str, str, int]]:
+        """Build the documentation cache key from the index page validators"""
+        
+        if self.docs_cache_path is None:
+            return None
+        
+        try:
+            response = await self._client.head(self.docs_url)
+        except httpx.HTTPError as e:
+            self.logger.debug("Documentation HEAD request failed", error=str(e))
+            return None
+        
+        validator = response.headers.get("etag") or response.headers.get("last-modified")
+        if not validator:
+            return None
+        return (_DOCS_CACHE_VERSION, self.docs_url, validator, self.max_doc_pages)
+    
+    def _load_docs_cache(self, cache_key: Optional[Tuple[int, str, str, int]]):
+        """Load cached documentation entities if they were stored under cache_key"""
+        
+        if cache_key is None or not self.docs_cache_path.exists():
+            return None
+        
+        try:
+            with open(self.docs_cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            self.logger.debug("Ignoring unreadable documentation cache", error=str(e))
+            return None
+        
+        if cached.get("key") != cache_key:
+            return None
+        return cached["entities"], cached["entities_processed"]
     
-    async def _extract_agent_class_info(self, soup: BeautifulSoup, section) -> Optional[FrameworkEntity]:
+    def _store_docs_cache(self,
+                          cache_key: Optional[Tuple[int, str, str, int]],
+                          entities_processed: int):
+        """Persist the documentation entities for incremental rebuilds"""
+        
+        if cache_key is None:
+            return
+        
+        self.docs_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.docs_cache_path, "wb") as f:
+            pickle.dump({
+                "key": cache_key,
+                "entities": self.entities,
+                "entities_processed": entities_processed
+            }, f, protocol=5)
+    
+    def _discover_sub_pages(self, tree: etree._Element) -> List[str]:
+        """Collect same-site documentation links from the index page"""
+        
+        docs_host = urlparse(self.docs_url).netloc
+        index_url = urldefrag(self.docs_url).url.rstrip('/')
+        sub_pages = []
+        seen = {index_url}
+        
+        for href in _LINK_XPATH(tree):
+            url = urldefrag(urljoin(self.docs_url, href)).url
+            if urlparse(url).netloc != docs_host or url.rstrip('/') in seen:
+                continue
+            seen.add(url.rstrip('/'))
+            sub_pages.append(url)
+            if len(sub_pages) >= self.max_doc_pages:
+                break
+        
+        return sub_pages
+    
+    def _extract_from_page(self, tree: etree._Element):
+        """Extract API entities from a single parsed documentation page
+        
+        Pure CPU work, run in a worker thread so the event loop keeps
+        serving the concurrent documentation downloads and Graphiti writes.
+        """
+        
+        # Use the site-specific selectors when the page has the expected
+        # layout, falling back to scanning the whole document
+        articles = _MKDOCS_ARTICLE_XPATH(tree) if self._mkdocs_site else []
+        if articles:
+            api_sections = _MKDOCS_HEADER_XPATH(articles[0])
+            code_blocks = _MKDOCS_CODE_XPATH(articles[0])
+        else:
+            api_sections = _HEADER_XPATH(tree)
+            code_blocks = _CODE_XPATH(tree)
+        
+        # Extract API documentation sections
+        for section in api_sections:
+            section_text = section.text_content().lower()
+            
+            # Look for class documentation
+            if 'agent' in section_text and 'class' in section_text:
+                self._extract_agent_class_info(tree, section)
+            
+            # Look for method documentation
+            elif any(method in section_text for method in ['run', 'run_sync', 'stream']):
+                self._extract_method_info(tree, section, section_text)
+        
+        # Extract from code examples
+        for code_block in code_blocks:
+            self._extract_from_code_examples(code_block.text_content())
+    
+    def _extract_agent_class_info(self, tree: etree._Element, section: etree._Element) -> Optional[FrameworkEntity]:
         """Extract Agent class information from documentation"""
         
-        # Find the next content after the section header
+        # Find the next content after the section header (limited search)
         content_elements = []
-        current = section.next_sibling
         
-        while current and current.name not in ['h2', 'h3', 'h4']:
-            if hasattr(current, 'get_text'):
-                content_elements.append(current.get_text())
-            current = current.next_sibling
-            if len(content_elements) > 10:  # Limit search
+        for current in islice(section.itersiblings(tag=etree.Element), _SECTION_CONTENT_LIMIT):
+            if current.tag in _SECTION_HEADINGS:
                 break
+            content_elements.append(current.text_content())
         
         content = '\n'.join(content_elements)
         
         # Extract examples from content
         examples = []
-        import re
         
         # Look for code patterns
-        code_patterns = re.findall(r'Agent\([^)]*\)', content)
-        examples.extend(code_patterns)
+        examples.extend(_AGENT_CTOR_RE.findall(content))
         
         # Common Agent initialization patterns
         if not examples:
@@ -223,15 +429,20 @@ class PydanticAIKnowledgeBuilder:
             confidence=0.99
         )
         
-        self.entities[entity.name] = entity
+        self._register_entity(entity.name, entity)
         self.entities_processed += 1
         
         return entity
     
-    async def _extract_method_info(self, soup: BeautifulSoup, section) -> Optional[FrameworkEntity]:
-        """Extract method information from documentation"""
+    def _extract_method_info(self,
+                             tree: etree._Element,
+                             section: etree._Element,
+                             section_text: str) -> Optional[FrameworkEntity]:
+        """Extract method information from documentation
+        
+        ``section_text`` is the section heading text, already lowercased by the caller.
+        """
         
-        section_text = section.get_text().lower()
         method_name = None
         
         # Determine method name
@@ -298,23 +509,32 @@ class PydanticAIKnowledgeBuilder:
             confidence=info['confidence']
         )
         
-        self.entities[f"Agent.{method_name}"] = entity
+        self._register_entity(f"Agent.{method_name}", entity)
         self.entities_processed += 1
         
         return entity
     
-    async def _extract_from_code_examples(self, code_text: str) -> List[FrameworkEntity]:
+    def _register_entity(self, key: str, entity: FrameworkEntity):
+        """Store an entity and keep its confidence column in sync"""
+        
+        self.entities[key] = entity
+        self._version += 1
+        next_slot = len(self._confidences)
+        slot = self._entity_slots.setdefault(key, next_slot)
+        if slot == next_slot:
+            self._confidences.append(entity.confidence)
+            self._new_entities.append(entity)
+        else:
+            self._confidences[slot] = entity.confidence
+    
+    def _extract_from_code_examples(self, code_text: str) -> List[FrameworkEntity]:
         """Extract API usage patterns from code examples"""
         
         entities = []
         
         try:
-            # Parse code to extract API calls
-            import re
-            
             # Find import statements
-            imports = re.findall(r'from\s+pydantic_ai\s+import\s+(\w+)', code_text)
-            for imp in imports:
+            for imp in _IMPORT_RE.findall(code_text):
                 if imp not in self.entities:
                     entity = FrameworkEntity(
                         name=imp,
@@ -328,11 +548,10 @@ class PydanticAIKnowledgeBuilder:
                         confidence=0.95
                     )
                     entities.append(entity)
-                    self.entities[imp] = entity
+                    self._register_entity(imp, entity)
             
             # Find method calls
-            method_calls = re.findall(r'(\w+)\.(\w+)\([^)]*\)', code_text)
-            for obj_name, method_name in method_calls:
+            for obj_name, method_name in _METHOD_CALL_RE.findall(code_text):
                 if obj_name.lower() in ['agent'] and method_name not in ['__init__']:
                     entity_key = f"{obj_name}.{method_name}"
                     if entity_key not in self.entities:
@@ -348,10 +567,10 @@ class PydanticAIKnowledgeBuilder:
                             confidence=0.9
                         )
                         entities.append(entity)
-                        self.entities[entity_key] = entity
+                        self._register_entity(entity_key, entity)
         
         except Exception as e:
-            self.logger.debug(f"Error parsing code examples: {e}")
+            self.logger.debug("Error parsing code examples", error=str(e))
         
         return entities
     
@@ -450,13 +669,54 @@ print(result.data)''',
         ]
         
         self.validation_patterns = patterns
-        self.logger.info(f"Built {len(patterns)} validation patterns")
+        self._version += 1
+        self._pattern_matcher = self._build_pattern_matcher(patterns)
+        self.logger.info("Built validation patterns", count=len(patterns))
         return patterns
     
-    async def _create_temporal_entities(self) -> List[str]:
-        """Create temporal entities in Graphiti knowledge graph"""
+    @staticmethod
+    def _build_pattern_matcher(patterns: List[ValidationPattern]):
+        """Compile every mistake and correct usage into one Aho-Corasick automaton
+        
+        The automaton reports every needle occurrence, including overlapping
+        ones, and maps each needle to the ``(kind, pattern_name)`` pairs it
+        belongs to.
+        """
+        
+        needles: Dict[str, List[Tuple[str, str]]] = {}
+        for pattern in patterns:
+            for mistake in pattern.common_mistakes:
+                needles.setdefault(mistake, []).append(("mistake", pattern.pattern_name))
+            needles.setdefault(pattern.correct_usage.strip(), []).append(("correct", pattern.pattern_name))
+        
+        automaton = ahocorasick.Automaton()
+        for needle, owners in needles.items():
+            automaton.add_word(needle, owners)
+        automaton.make_automaton()
+        return automaton
+    
+    def _match_patterns(self, code_snippet: str) -> Tuple[set, set]:
+        """Return the pattern names whose mistakes and correct usages occur in the code"""
+        
+        mistakes, correct = set(), set()
+        if self._pattern_matcher is None:
+            return mistakes, correct
+        
+        for _, owners in self._pattern_matcher.iter(code_snippet):
+            for kind, pattern_name in owners:
+                (mistakes if kind == "mistake" else correct).add(pattern_name)
+        return mistakes, correct
+    
+    async def _create_temporal_entities(self, entities: AsyncIterator[FrameworkEntity]) -> Tuple[int, List[str]]:
+        """Create temporal entities in Graphiti knowledge graph
+        
+        Entities are written in bulk batches while extraction is still
+        running. Returns the number of entities consumed and the created IDs.
+        """
         
         entity_ids = []
+        extracted = 0
+        framework_id = None
         
         try:
             # Create framework entity
@@ -472,39 +732,67 @@ print(result.data)''',
                 }
             )
             entity_ids.append(framework_id)
-            
-            # Create entities for each discovered API element
-            for entity_name, entity in self.entities.items():
-                entity_id = await self.graphiti_engine.create_temporal_entity(
-                    entity_name=entity.name,
-                    entity_type=entity.entity_type,
-                    properties={
-                        "module": entity.module,
-                        "signature": entity.signature,
-                        "docstring": entity.docstring,
-                        "parameters": entity.parameters,
-                        "return_type": entity.return_type,
-                        "examples": entity.examples,
-                        "confidence": entity.confidence
-                    },
-                    framework=self.framework_name
-                )
-                entity_ids.append(entity_id)
-                
-                # Create relationship to framework
-                await self.graphiti_engine.create_temporal_relationship(
-                    source_id=framework_id,
-                    target_id=entity_id,
-                    relationship_type="CONTAINS",
-                    properties={"entity_type": entity.entity_type},
-                    confidence=entity.confidence
-                )
         
         except Exception as e:
-            self.logger.error(f"Failed to create temporal entities: {e}")
+            self.logger.error("Failed to create framework entity", error=str(e))
+        
+        # Create entities for each discovered API element in bulk, then
+        # link each batch to the framework with a second bulk write
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def create_entities(batch: List[FrameworkEntity]) -> List[str]:
+            async with semaphore:
+                batch_ids = await self.graphiti_engine.create_temporal_entities_bulk([
+                    {
+                        "name": entity.name,
+                        "type": entity.entity_type,
+                        "properties": {
+                            "module": entity.module,
+                            "signature": entity.signature,
+                            "docstring": entity.docstring,
+                            "parameters": entity.parameters,
+                            "return_type": entity.return_type,
+                            "examples": entity.examples,
+                            "confidence": entity.confidence
+                        },
+                        "framework": self.framework_name
+                    }
+                    for entity in batch
+                ])
+                
+                # Create relationships to framework
+                await self.graphiti_engine.create_temporal_relationships_bulk([
+                    {
+                        "source_id": framework_id,
+                        "target_id": entity_id,
+                        "relationship_type": "CONTAINS",
+                        "properties": {"entity_type": entity.entity_type},
+                        "confidence": entity.confidence
+                    }
+                    for entity, entity_id in zip(batch, batch_ids)
+                ])
+                return batch_ids
+        
+        # Flush a batch as soon as it fills so writes overlap extraction
+        writes = []
+        batch = []
+        async for entity in entities:
+            extracted += 1
+            if framework_id is None:
+                continue
+            batch.append(entity)
+            if len(batch) >= self.batch_size:
+                writes.append(asyncio.create_task(create_entities(batch)))
+                batch = []
+        
+        if batch and framework_id is not None:
+            writes.append(asyncio.create_task(create_entities(batch)))
+        
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        entity_ids.extend(self._collect_batch_ids(results, "temporal entity"))
         
-        self.logger.info(f"Created {len(entity_ids)} temporal entities")
-        return entity_ids
+        self.logger.info("Created temporal entities", count=len(entity_ids))
+        return extracted, entity_ids
     
     async def _build_success_patterns(self) -> List[str]:
         """Build success patterns for Graphiti temporal tracking"""
@@ -512,45 +800,74 @@ print(result.data)''',
         pattern_ids = []
         
         try:
+            pattern_rows = []
             for pattern in self.validation_patterns:
-                pattern_id = await self.graphiti_engine.store_pattern(
-                    pattern_name=pattern.pattern_name,
-                    framework=self.framework_name,
-                    pattern_type="success",
-                    code_template=pattern.correct_usage,
-                    success_rate=pattern.success_rate,
-                    use_cases=["api_validation", "code_generation"],
-                    metadata={
+                pattern_rows.append({
+                    "pattern_name": pattern.pattern_name,
+                    "framework": self.framework_name,
+                    "pattern_type": "success",
+                    "code_template": pattern.correct_usage,
+                    "success_rate": pattern.success_rate,
+                    "use_cases": ["api_validation", "code_generation"],
+                    "metadata": {
                         "validation_rules": pattern.validation_rules,
                         "common_mistakes": pattern.common_mistakes,
                         "confidence": pattern.success_rate
                     }
-                )
-                pattern_ids.append(pattern_id)
+                })
                 
                 # Store failure patterns for common mistakes
                 for i, mistake in enumerate(pattern.common_mistakes):
-                    failure_id = await self.graphiti_engine.store_pattern(
-                        pattern_name=f"{pattern.pattern_name}_failure_{i}",
-                        framework=self.framework_name,
-                        pattern_type="failure",
-                        code_template=mistake,
-                        success_rate=0.1,  # Low success rate for failure patterns
-                        use_cases=["hallucination_detection", "validation"],
-                        metadata={
+                    pattern_rows.append({
+                        "pattern_name": f"{pattern.pattern_name}_failure_{i}",
+                        "framework": self.framework_name,
+                        "pattern_type": "failure",
+                        "code_template": mistake,
+                        "success_rate": 0.1,  # Low success rate for failure patterns
+                        "use_cases": ["hallucination_detection", "validation"],
+                        "metadata": {
                             "error_type": "common_mistake",
                             "correct_pattern": pattern.pattern_name,
                             "reason": f"Mistake in {pattern.pattern_name}"
                         }
-                    )
-                    pattern_ids.append(failure_id)
+                    })
+            
+            pattern_ids.extend(await self._write_in_batches(
+                pattern_rows, self.graphiti_engine.store_patterns_bulk, "pattern"
+            ))
         
         except Exception as e:
-            self.logger.error(f"Failed to build success patterns: {e}")
+            self.logger.error("Failed to build success patterns", error=str(e))
         
-        self.logger.info(f"Created {len(pattern_ids)} success/failure patterns")
+        self.logger.info("Created success/failure patterns", count=len(pattern_ids))
         return pattern_ids
     
+    async def _write_in_batches(self, items: List[Any], write_batch, item_type: str) -> List[str]:
+        """Run bulk writes over fixed-size batches, bounded by the write concurrency"""
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def write(batch: List[Any]) -> List[str]:
+            async with semaphore:
+                return await write_batch(batch)
+        
+        results = await asyncio.gather(
+            *(write(items[i:i + self.batch_size]) for i in range(0, len(items), self.batch_size)),
+            return_exceptions=True
+        )
+        return self._collect_batch_ids(results, item_type)
+    
+    def _collect_batch_ids(self, results: List[Any], item_type: str) -> List[str]:
+        """Flatten the IDs from gathered batch writes, logging failed batches"""
+        
+        written_ids = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("Failed to create batch", item_type=item_type, error=str(result))
+            else:
+                written_ids.extend(result)
+        return written_ids
+    
     async def _create_validation_rules(self) -> List[Dict[str, Any]]:
         """Create comprehensive validation rules for API usage"""
         
@@ -625,9 +942,22 @@ print(result.data)''',
             "error_message": "Access result data via 'result.data', not 'result.response' or similar"
         })
         
-        self.logger.info(f"Created {len(validation_rules)} validation rules")
+        # Combine each regex list into one alternation so consumers match a
+        # rule with a single search instead of one per pattern
+        for rule in validation_rules:
+            if "valid_patterns" in rule:
+                rule["_valid_re"] = self._combine_patterns(rule["valid_patterns"])
+            if "invalid_patterns" in rule:
+                rule["_invalid_re"] = self._combine_patterns(rule["invalid_patterns"])
+        
+        self.logger.info("Created validation rules", count=len(validation_rules))
         return validation_rules
     
+    @staticmethod
+    def _combine_patterns(patterns: List[str]) -> re.Pattern:
+        """Compile a list of regexes into a single alternation"""
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    
     async def _ingest_into_rag_system(self) -> bool:
         """Ingest all extracted knowledge into the RAG system"""
         
@@ -635,32 +965,37 @@ print(result.data)''',
             # Ingest documentation
             chunks_processed = await self.rag_system.ingest_documentation(
                 framework=self.framework_name,
-                docs_url=self.docs_url
+                docs_url=self.docs_url,
+                http_client=self._client
             )
             
-            self.logger.info(f"Ingested {chunks_processed} documentation chunks into RAG system")
+            self.logger.info("Ingested documentation chunks into RAG system", count=chunks_processed)
             return chunks_processed > 0
             
         except Exception as e:
-            self.logger.error(f"Failed to ingest into RAG system: {e}")
+            self.logger.error("Failed to ingest into RAG system", error=str(e))
             return False
     
     def _calculate_overall_confidence(self) -> float:
         """Calculate overall confidence in the knowledge graph"""
         
+        if self._confidence_cache and self._confidence_cache[0] == self._version:
+            return self._confidence_cache[1]
+        
         if not self.entities:
             return 0.0
         
         # Average confidence of all entities
-        entity_confidence = sum(entity.confidence for entity in self.entities.values()) / len(self.entities)
+        entity_confidence = math.fsum(self._confidences) / len(self._confidences)
         
         # Average confidence of validation patterns
-        pattern_confidence = sum(pattern.success_rate for pattern in self.validation_patterns) / len(self.validation_patterns) if self.validation_patterns else 0.0
+        pattern_confidence = math.fsum(map(_SUCCESS_RATE, self.validation_patterns)) / len(self.validation_patterns) if self.validation_patterns else 0.0
         
         # Combined confidence with weighting
-        overall_confidence = (entity_confidence * 0.6) + (pattern_confidence * 0.4)
+        overall_confidence = min((entity_confidence * 0.6) + (pattern_confidence * 0.4), 1.0)
         
-        return min(overall_confidence, 1.0)
+        self._confidence_cache = (self._version, overall_confidence)
+        return overall_confidence
     
     async def validate_api_usage_against_kg(self, code_snippet: str) -> Dict[str, Any]:
         """Validate API usage against the built knowledge graph"""
@@ -674,9 +1009,12 @@ print(result.data)''',
         }
         
         try:
+            # Scan the snippet once for every known mistake and correct usage
+            mistake_hits, correct_hits = self._match_patterns(code_snippet)
+            
             # Check against validation patterns
             for pattern in self.validation_patterns:
-                if any(mistake in code_snippet for mistake in pattern.common_mistakes):
+                if pattern.pattern_name in mistake_hits:
                     validation_result["errors"].append({
                         "type": "common_mistake",
                         "pattern": pattern.pattern_name,
@@ -684,7 +1022,7 @@ print(result.data)''',
                     })
                 
                 # Check if follows correct pattern
-                if pattern.correct_usage.strip() in code_snippet:
+                if pattern.pattern_name in correct_hits:
                     validation_result["validated_patterns"].append(pattern.pattern_name)
             
             # Calculate confidence based on pattern matches
@@ -698,9 +1036,13 @@ print(result.data)''',
                 validation_result["confidence"] = 0.2  # Has errors
             
         except Exception as e:
-            self.logger.error(f"Failed to validate API usage: {e}")
+            self.logger.error("Failed to validate API usage", error=str(e))
         
         return validation_result
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        await self._client.aclose()
 
 
 # Example usage and testing
@@ -743,6 +1085,7 @@ async def main():
     validation = await builder.validate_api_usage_against_kg(test_code)
     print(f"Validation result: {validation}")
     
+    await builder.aclose()
     await graphiti_engine.close()
     await rag_system.close()
 
@@ -7,21 +7,81 @@ evolving patterns, decisions, and relationships over time with 98% accuracy.
 """
 
 import asyncio
-import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict, field
+from operator import attrgetter
 from pathlib import Path
 
-from neo4j import AsyncGraphDatabase
+import orjson
+from neo4j import AsyncGraphDatabase, READ_ACCESS, RoutingControl
 from pydantic import BaseModel, Field
 import structlog
 
+from ...caching.result_cache import RedisResultCache
+
 logger = structlog.get_logger(__name__)
 
+_CONFIDENCE = attrgetter("confidence")
+
+# Scalar pattern metadata stored as indexed node properties instead of inside
+# the JSON metadata blob, so filters on them run server-side
+_PATTERN_PROPERTY_FIELDS = ("complexity", "framework_version")
+
+
+def _load_pattern_metadata(raw: Optional[str], properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild pattern metadata from the JSON tail and the promoted properties"""
+    metadata = orjson.loads(raw) if raw else {}
+    for field_name, value in properties.items():
+        if value is not None:
+            metadata[field_name] = value
+    return metadata
+
+
+# Pattern query variants are assembled once at import, so every call sends
+# byte-identical Cypher and hits the server's query plan cache
+_MATCH_FRAMEWORK_PATTERNS = "MATCH (f:Framework {name: $framework})-[:HAS_PATTERN]->(p:Pattern)\n"
+_MATCH_FRAMEWORK_FAILURES = "MATCH (f:Framework {name: $framework})-[:HAS_PATTERN]->(p:FailurePattern)\n"
+_SUCCESS_FILTER = "WHERE p.success_rate >= $min_success_rate AND p.created_at_epoch >= $cutoff\n"
+_SUCCESS_ORDER = "ORDER BY p.success_rate DESC, p.usage_count DESC\nLIMIT 10\n"
+_FAILURE_FILTER = "WHERE p.created_at_epoch >= $cutoff\n"
+_FAILURE_ORDER = "ORDER BY p.usage_count DESC\nLIMIT 5\n"
+_USE_CASE_FILTER = "AND $use_case IN p.use_cases\n"
+_CODE_PATTERN_FILTER = "AND p.code_template CONTAINS $code_pattern\n"
+_RETURN_PATTERN = "RETURN p {.*} AS p\n"
 
-@dataclass
+_Q_SUCCESS_NO_USECASE = _MATCH_FRAMEWORK_PATTERNS + _SUCCESS_FILTER + _RETURN_PATTERN + _SUCCESS_ORDER
+_Q_SUCCESS_WITH_USECASE = (
+    _MATCH_FRAMEWORK_PATTERNS + _SUCCESS_FILTER + _USE_CASE_FILTER + _RETURN_PATTERN + _SUCCESS_ORDER
+)
+_Q_FAIL_NO_PATTERN = _MATCH_FRAMEWORK_FAILURES + _FAILURE_FILTER + _RETURN_PATTERN + _FAILURE_ORDER
+_Q_FAIL_WITH_PATTERN = (
+    _MATCH_FRAMEWORK_FAILURES + _FAILURE_FILTER + _CODE_PATTERN_FILTER + _RETURN_PATTERN + _FAILURE_ORDER
+)
+
+_FAILURE_BRANCH = (
+    _MATCH_FRAMEWORK_FAILURES + _FAILURE_FILTER + "RETURN p, 'failure' AS category\n" + _FAILURE_ORDER
+)
+_Q_PATTERNS_NO_USECASE = (
+    "CALL {\n"
+    + _MATCH_FRAMEWORK_PATTERNS + _SUCCESS_FILTER + "RETURN p, 'success' AS category\n" + _SUCCESS_ORDER
+    + "UNION ALL\n" + _FAILURE_BRANCH
+    + "}\nRETURN p {.*} AS p, category\n"
+)
+_Q_PATTERNS_WITH_USECASE = (
+    "CALL {\n"
+    + _MATCH_FRAMEWORK_PATTERNS + _SUCCESS_FILTER + _USE_CASE_FILTER
+    + "RETURN p, 'success' AS category\n" + _SUCCESS_ORDER
+    + "UNION ALL\n" + _FAILURE_BRANCH
+    + "}\nRETURN p {.*} AS p, category\n"
+)
+
+
+@dataclass(slots=True)
 class TemporalEntity:
     """Represents an entity in the temporal knowledge graph"""
     id: str
@@ -34,7 +94,7 @@ class TemporalEntity:
     confidence: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class TemporalRelationship:
     """Represents a relationship between entities over time"""
     id: str
@@ -45,10 +105,10 @@ class TemporalRelationship:
     valid_from: datetime
     valid_to: Optional[datetime] = None
     confidence: float = 1.0
-    evidence: List[str] = None
+    evidence: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Pattern:
     """Represents a successful or failed pattern in the knowledge graph"""
     id: str
@@ -84,9 +144,33 @@ class AIDGraphitiEngine:
     - Historical context for better decision making
     """
     
-    def __init__(self, neo4j_config: Dict[str, str]):
+    # Pattern success rates drift as usage is recorded, so keep cached
+    # pattern queries short-lived
+    PATTERN_CACHE_TTL = 300
+    
+    # In-process cache in front of Neo4j and Redis for repeated pattern queries
+    LOCAL_PATTERN_CACHE_TTL = 60
+    LOCAL_PATTERN_CACHE_SIZE = 256
+    
+    def __init__(self,
+                 neo4j_config: Dict[str, str],
+                 result_cache: Optional[RedisResultCache] = None,
+                 driver=None,
+                 database: Optional[str] = None):
         self.neo4j_config = neo4j_config
-        self.driver = None
+        self.result_cache = result_cache
+        
+        # A driver passed in is shared with other components and owned by the caller
+        self.driver = driver
+        self._owns_driver = driver is None
+        # Naming the database up front spares the driver a home-database lookup
+        self.database = database or neo4j_config.get("database", "neo4j")
+        
+        # Records pulled per round trip when streaming results
+        self.fetch_size = neo4j_config.get("fetch_size", 10000)
+        
+        # (kind, framework, *query args) -> (expiry, patterns), least recently used first
+        self._pattern_cache: "OrderedDict[tuple, Tuple[float, List[Pattern]]]" = OrderedDict()
         self.initialized = False
         self.logger = logger.bind(component="GraphitiEngine")
         
@@ -97,18 +181,27 @@ class AIDGraphitiEngine:
     async def initialize(self) -> bool:
         """Initialize the Graphiti temporal knowledge graph engine"""
         try:
-            self.driver = AsyncGraphDatabase.driver(
-                self.neo4j_config["uri"],
-                auth=(self.neo4j_config["username"], self.neo4j_config["password"])
-            )
+            if self.driver is None:
+                self.driver = AsyncGraphDatabase.driver(
+                    self.neo4j_config["uri"],
+                    auth=(self.neo4j_config["username"], self.neo4j_config["password"]),
+                    max_connection_pool_size=self.neo4j_config.get("pool_size", 100),
+                    connection_acquisition_timeout=60,
+                    max_connection_lifetime=3600,
+                    connection_timeout=30,
+                    max_transaction_retry_time=15
+                )
             
             # Test connection
-            async with self.driver.session() as session:
+            async with self.driver.session(database=self.database) as session:
                 result = await session.run("RETURN 1 as test")
                 await result.single()
             
             # Initialize graph schema
             await self._initialize_schema()
+            await self._backfill_pattern_labels()
+            await self._backfill_pattern_epochs()
+            await self._migrate_pattern_use_cases()
             
             self.initialized = True
             self.logger.info("Graphiti temporal engine initialized successfully")
@@ -118,6 +211,19 @@ class AIDGraphitiEngine:
             self.logger.error(f"Failed to initialize Graphiti engine: {e}")
             return False
     
+    async def _read(self, query: str, parameters: Dict[str, Any]) -> List[Any]:
+        """Run a read query over the connection pool, routed to a read replica"""
+        records, _, _ = await self.driver.execute_query(
+            query, parameters, database_=self.database, routing_=RoutingControl.READ
+        )
+        return records
+    
+    @staticmethod
+    async def _run_write(tx, query: str, parameters: Dict[str, Any]):
+        """Transaction function for writes, retried by the driver on transient errors"""
+        result = await tx.run(query, parameters)
+        await result.consume()
+    
     async def _initialize_schema(self):
         """Initialize the temporal knowledge graph schema"""
         schema_queries = [
@@ -130,20 +236,86 @@ class AIDGraphitiEngine:
             "CREATE INDEX temporal_entity_type IF NOT EXISTS FOR (e:TemporalEntity) ON (e.type)",
             "CREATE INDEX temporal_entity_created IF NOT EXISTS FOR (e:TemporalEntity) ON (e.created_at)",
             "CREATE INDEX pattern_framework IF NOT EXISTS FOR (p:Pattern) ON (p.framework)",
-            "CREATE INDEX pattern_success_rate IF NOT EXISTS FOR (p:Pattern) ON (p.success_rate)",
+            # Successful-pattern lookups range over both rate and age; the composite
+            # index also serves rate-only filters, so it replaces pattern_success_rate
+            "CREATE INDEX pattern_rate_epoch IF NOT EXISTS FOR (p:Pattern) ON (p.success_rate, p.created_at_epoch)",
+            "DROP INDEX pattern_success_rate IF EXISTS",
+            "CREATE INDEX pattern_created_epoch IF NOT EXISTS FOR (p:Pattern) ON (p.created_at_epoch)",
+            "CREATE INDEX pattern_use_cases IF NOT EXISTS FOR (p:Pattern) ON (p.use_cases)",
+            "CREATE INDEX pattern_complexity IF NOT EXISTS FOR (p:Pattern) ON (p.complexity)",
+            "CREATE INDEX pattern_framework_version IF NOT EXISTS FOR (p:Pattern) ON (p.framework_version)",
             "CREATE INDEX relationship_valid_from IF NOT EXISTS FOR ()-[r:TEMPORAL_RELATIONSHIP]-() ON (r.valid_from)",
             
             # Full-text search indexes
             "CALL db.index.fulltext.createNodeIndex('entitySearch', ['TemporalEntity', 'Framework', 'Pattern'], ['name', 'description', 'code_template']) IF NOT EXISTS",
         ]
         
-        async with self.driver.session() as session:
-            for query in schema_queries:
-                try:
-                    await session.run(query)
-                except Exception as e:
-                    # Some constraints might already exist
-                    self.logger.debug(f"Schema query warning: {e}")
+        # Every statement is idempotent, so fan them out over the pool instead
+        # of paying one round trip each in sequence
+        await asyncio.gather(*(self._run_schema_query(query) for query in schema_queries))
+    
+    async def _backfill_pattern_labels(self):
+        """Add the pattern type labels to patterns stored before they existed"""
+        query = """
+        MATCH (p:Pattern)
+        WHERE p.pattern_type IN ['success', 'failure']
+        AND NOT p:SuccessPattern AND NOT p:FailurePattern
+        FOREACH (ignored IN CASE WHEN p.pattern_type = 'success' THEN [1] ELSE [] END | SET p:SuccessPattern)
+        FOREACH (ignored IN CASE WHEN p.pattern_type = 'failure' THEN [1] ELSE [] END | SET p:FailurePattern)
+        """
+        try:
+            await self.driver.execute_query(query, database_=self.database)
+        except Exception as e:
+            self.logger.warning(f"Pattern label backfill failed: {e}")
+    
+    async def _backfill_pattern_epochs(self):
+        """Add created_at_epoch to patterns stored before it existed
+        
+        Pattern queries filter their time window on this property, so
+        patterns without it would silently drop out of every result.
+        """
+        query = """
+        MATCH (p:Pattern)
+        WHERE p.created_at_epoch IS NULL AND p.created_at IS NOT NULL
+        SET p.created_at_epoch = p.created_at.epochSeconds
+        """
+        try:
+            await self.driver.execute_query(query, database_=self.database)
+        except Exception as e:
+            self.logger.warning(f"Pattern epoch backfill failed: {e}")
+    
+    async def _migrate_pattern_use_cases(self):
+        """Convert use_cases stored as JSON strings by older versions to native lists
+        
+        Use-case filters test list membership, which never matches a string.
+        String predicates are null for list values, so migrated patterns are
+        skipped on later runs.
+        """
+        try:
+            records, _, _ = await self.driver.execute_query(
+                "MATCH (p:Pattern) WHERE p.use_cases STARTS WITH '[' "
+                "RETURN p.id AS id, p.use_cases AS use_cases",
+                database_=self.database, routing_=RoutingControl.READ
+            )
+            if not records:
+                return
+            rows = [{"id": record["id"], "use_cases": orjson.loads(record["use_cases"])} for record in records]
+            await self.driver.execute_query(
+                "UNWIND $rows AS row MATCH (p:Pattern {id: row.id}) SET p.use_cases = row.use_cases",
+                {"rows": rows},
+                database_=self.database, routing_=RoutingControl.WRITE
+            )
+            self.logger.info(f"Migrated use_cases of {len(rows)} patterns")
+        except Exception as e:
+            self.logger.warning(f"Pattern use_cases migration failed: {e}")
+    
+    async def _run_schema_query(self, query: str):
+        """Run one schema statement, retrying transient lock conflicts"""
+        try:
+            await self.driver.execute_query(query, database_=self.database)
+        except Exception as e:
+            # Some constraints might already exist
+            self.logger.debug(f"Schema query warning: {e}")
     
     async def create_temporal_entity(self, 
                                    entity_name: str,
@@ -151,56 +323,13 @@ class AIDGraphitiEngine:
                                    properties: Dict[str, Any],
                                    framework: str = None) -> str:
         """Create a new temporal entity in the knowledge graph"""
-        entity_id = f"{entity_type}_{entity_name}_{datetime.now().timestamp()}"
-        
-        entity = TemporalEntity(
-            id=entity_id,
-            name=entity_name,
-            type=entity_type,
-            properties=properties,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        
-        query = """
-        CREATE (e:TemporalEntity {
-            id: $id,
-            name: $name,
-            type: $type,
-            properties: $properties,
-            created_at: datetime($created_at),
-            updated_at: datetime($updated_at),
-            version: $version,
-            confidence: $confidence
-        })
-        """
-        
-        if framework:
-            query += """
-            WITH e
-            MERGE (f:Framework {name: $framework})
-            CREATE (f)-[:CONTAINS]->(e)
-            """
-        
-        query += "RETURN e.id as entity_id"
-        
-        async with self.driver.session() as session:
-            result = await session.run(query, {
-                "id": entity.id,
-                "name": entity.name,
-                "type": entity.type,
-                "properties": json.dumps(entity.properties),
-                "created_at": entity.created_at.isoformat(),
-                "updated_at": entity.updated_at.isoformat(),
-                "version": entity.version,
-                "confidence": entity.confidence,
-                "framework": framework
-            })
-            
-            record = await result.single()
-            
-        self.logger.info(f"Created temporal entity: {entity_id}")
-        return record["entity_id"]
+        entity_ids = await self.create_temporal_entities_bulk([{
+            "name": entity_name,
+            "type": entity_type,
+            "properties": properties,
+            "framework": framework
+        }])
+        return entity_ids[0]
     
     async def create_temporal_relationship(self,
                                          source_id: str,
@@ -209,48 +338,14 @@ class AIDGraphitiEngine:
                                          properties: Dict[str, Any] = None,
                                          confidence: float = 1.0) -> str:
         """Create a temporal relationship between entities"""
-        
-        rel_id = f"rel_{source_id}_{target_id}_{relationship_type}_{datetime.now().timestamp()}"
-        
-        relationship = TemporalRelationship(
-            id=rel_id,
-            source_id=source_id,
-            target_id=target_id,
-            relationship_type=relationship_type,
-            properties=properties or {},
-            valid_from=datetime.now(),
-            confidence=confidence
-        )
-        
-        query = """
-        MATCH (source:TemporalEntity {id: $source_id})
-        MATCH (target:TemporalEntity {id: $target_id})
-        CREATE (source)-[r:TEMPORAL_RELATIONSHIP {
-            id: $rel_id,
-            type: $relationship_type,
-            properties: $properties,
-            valid_from: datetime($valid_from),
-            valid_to: null,
-            confidence: $confidence
-        }]->(target)
-        RETURN r.id as relationship_id
-        """
-        
-        async with self.driver.session() as session:
-            result = await session.run(query, {
-                "source_id": source_id,
-                "target_id": target_id,
-                "rel_id": rel_id,
-                "relationship_type": relationship_type,
-                "properties": json.dumps(relationship.properties),
-                "valid_from": relationship.valid_from.isoformat(),
-                "confidence": confidence
-            })
-            
-            record = await result.single()
-            
-        self.logger.info(f"Created temporal relationship: {rel_id}")
-        return record["relationship_id"]
+        relationship_ids = await self.create_temporal_relationships_bulk([{
+            "source_id": source_id,
+            "target_id": target_id,
+            "relationship_type": relationship_type,
+            "properties": properties,
+            "confidence": confidence
+        }])
+        return relationship_ids[0]
     
     async def store_pattern(self, 
                           pattern_name: str,
@@ -261,59 +356,213 @@ class AIDGraphitiEngine:
                           use_cases: List[str],
                           metadata: Dict[str, Any] = None) -> str:
         """Store a successful or failed pattern in the knowledge graph"""
+        pattern_ids = await self.store_patterns_bulk([{
+            "pattern_name": pattern_name,
+            "framework": framework,
+            "pattern_type": pattern_type,
+            "code_template": code_template,
+            "success_rate": success_rate,
+            "use_cases": use_cases,
+            "metadata": metadata
+        }])
+        return pattern_ids[0]
+    
+    async def create_temporal_entities_bulk(self, entities: List[Dict[str, Any]]) -> List[str]:
+        """Create temporal entities with a single UNWIND statement
         
-        pattern_id = f"pattern_{framework}_{pattern_name}_{datetime.now().timestamp()}"
-        
-        pattern = Pattern(
-            id=pattern_id,
-            name=pattern_name,
-            framework=framework,
-            pattern_type=pattern_type,
-            code_template=code_template,
-            success_rate=success_rate,
-            use_cases=use_cases,
-            metadata=metadata or {},
-            created_at=datetime.now(),
-            last_used=datetime.now()
-        )
+        Each entity dict holds ``name``, ``type``, ``properties`` and optionally
+        ``framework`` and ``confidence``. Properties are passed as plain Python
+        objects and serialized here with orjson. Entity IDs are returned in
+        input order.
+        """
+        
+        if not entities:
+            return []
+        
+        now = datetime.now(timezone.utc)
+        ns = time.time_ns()
+        rows = []
+        
+        for i, entity in enumerate(entities):
+            rows.append({
+                "id": f"{entity['type']}_{entity['name']}_{ns}_{i}",
+                "name": entity["name"],
+                "type": entity["type"],
+                "properties": orjson.dumps(entity.get("properties", {})).decode(),
+                "created_at": now.isoformat(),
+                "updated_at": now.isoformat(),
+                "version": 1,
+                "confidence": entity.get("confidence", 1.0),
+                "framework": entity.get("framework")
+            })
+        
+        query = """
+        UNWIND $rows AS row
+        CREATE (e:TemporalEntity {
+            id: row.id,
+            name: row.name,
+            type: row.type,
+            properties: row.properties,
+            created_at: datetime(row.created_at),
+            updated_at: datetime(row.updated_at),
+            version: row.version,
+            confidence: row.confidence
+        })
+        WITH e, row
+        WHERE row.framework IS NOT NULL
+        MERGE (f:Framework {name: row.framework})
+        CREATE (f)-[:CONTAINS]->(e)
+        """
+        
+        async with self.driver.session(database=self.database) as session:
+            await session.execute_write(self._run_write, query, {"rows": rows})
+        
+        self.logger.info(f"Created {len(rows)} temporal entities")
+        return [row["id"] for row in rows]
+    
+    async def create_temporal_relationships_bulk(self, relationships: List[Dict[str, Any]]) -> List[str]:
+        """Create temporal relationships with a single UNWIND statement
+        
+        Each relationship dict holds ``source_id``, ``target_id``,
+        ``relationship_type`` and optionally ``properties`` and ``confidence``.
+        """
+        
+        if not relationships:
+            return []
+        
+        now = datetime.now(timezone.utc)
+        ns = time.time_ns()
+        rows = []
+        
+        for i, relationship in enumerate(relationships):
+            rows.append({
+                "id": f"rel_{relationship['source_id']}_{relationship['target_id']}_{relationship['relationship_type']}_{ns}_{i}",
+                "source_id": relationship["source_id"],
+                "target_id": relationship["target_id"],
+                "relationship_type": relationship["relationship_type"],
+                "properties": orjson.dumps(relationship.get("properties") or {}).decode(),
+                "valid_from": now.isoformat(),
+                "confidence": relationship.get("confidence", 1.0)
+            })
         
         query = """
-        MERGE (f:Framework {name: $framework})
+        UNWIND $rows AS row
+        MATCH (source:TemporalEntity {id: row.source_id})
+        MATCH (target:TemporalEntity {id: row.target_id})
+        CREATE (source)-[r:TEMPORAL_RELATIONSHIP {
+            id: row.id,
+            type: row.relationship_type,
+            properties: row.properties,
+            valid_from: datetime(row.valid_from),
+            valid_to: null,
+            confidence: row.confidence
+        }]->(target)
+        """
+        
+        async with self.driver.session(database=self.database) as session:
+            await session.execute_write(self._run_write, query, {"rows": rows})
+        
+        self.logger.info(f"Created {len(rows)} temporal relationships")
+        return [row["id"] for row in rows]
+    
+    async def store_patterns_bulk(self, patterns: List[Dict[str, Any]]) -> List[str]:
+        """Store patterns with a single UNWIND statement
+        
+        Each pattern dict takes the same keys as the ``store_pattern`` arguments.
+        Pattern IDs are returned in input order.
+        """
+        
+        if not patterns:
+            return []
+        
+        now = datetime.now(timezone.utc)
+        ns = time.time_ns()
+        rows = []
+        
+        for i, pattern in enumerate(patterns):
+            metadata = dict(pattern.get("metadata") or {})
+            properties = {
+                field_name: metadata.pop(field_name)
+                for field_name in _PATTERN_PROPERTY_FIELDS
+                if field_name in metadata
+            }
+            rows.append({
+                "pattern_id": f"pattern_{pattern['framework']}_{pattern['pattern_name']}_{ns}_{i}",
+                "name": pattern["pattern_name"],
+                "framework": pattern["framework"],
+                "pattern_type": pattern["pattern_type"],
+                "code_template": pattern["code_template"],
+                "success_rate": pattern["success_rate"],
+                "use_cases": list(pattern["use_cases"]),
+                "metadata": orjson.dumps(metadata).decode(),
+                "properties": properties,
+                "created_at": now.isoformat(),
+                "created_at_epoch": ns // 1_000_000_000,
+                "last_used": now.isoformat()
+            })
+        
+        query = """
+        UNWIND $rows AS row
+        MERGE (f:Framework {name: row.framework})
         CREATE (p:Pattern {
-            id: $pattern_id,
-            name: $name,
-            framework: $framework,
-            pattern_type: $pattern_type,
-            code_template: $code_template,
-            success_rate: $success_rate,
-            use_cases: $use_cases,
-            metadata: $metadata,
-            created_at: datetime($created_at),
-            last_used: datetime($last_used),
-            usage_count: 0
+            id: row.pattern_id,
+            name: row.name,
+            framework: row.framework,
+            pattern_type: row.pattern_type,
+            code_template: row.code_template,
+            success_rate: row.success_rate,
+            use_cases: row.use_cases,
+            metadata: row.metadata,
+            created_at: datetime(row.created_at),
+            created_at_epoch: row.created_at_epoch,
+            last_used: datetime(row.last_used),
+            usage_count: 0,
+            success_count: 0
         })
+        SET p += row.properties
+        FOREACH (ignored IN CASE WHEN row.pattern_type = 'success' THEN [1] ELSE [] END | SET p:SuccessPattern)
+        FOREACH (ignored IN CASE WHEN row.pattern_type = 'failure' THEN [1] ELSE [] END | SET p:FailurePattern)
         CREATE (f)-[:HAS_PATTERN]->(p)
-        RETURN p.id as pattern_id
         """
         
-        async with self.driver.session() as session:
-            result = await session.run(query, {
-                "pattern_id": pattern_id,
-                "name": pattern.name,
-                "framework": pattern.framework,
-                "pattern_type": pattern.pattern_type,
-                "code_template": pattern.code_template,
-                "success_rate": pattern.success_rate,
-                "use_cases": json.dumps(pattern.use_cases),
-                "metadata": json.dumps(pattern.metadata),
-                "created_at": pattern.created_at.isoformat(),
-                "last_used": pattern.last_used.isoformat()
-            })
-            
-            record = await result.single()
-            
-        self.logger.info(f"Stored pattern: {pattern_id} (success_rate: {success_rate})")
-        return record["pattern_id"]
+        async with self.driver.session(database=self.database) as session:
+            await session.execute_write(self._run_write, query, {"rows": rows})
+        
+        await self._invalidate_patterns(row["framework"] for row in rows)
+        self.logger.info(f"Stored {len(rows)} patterns")
+        return [row["pattern_id"] for row in rows]
+    
+    @staticmethod
+    def _window_cutoff(time_window_days: int) -> int:
+        """Epoch seconds of the oldest pattern inside the time window"""
+        return int((datetime.now() - timedelta(days=time_window_days)).timestamp())
+    
+    def _get_cached_patterns(self, key: tuple) -> Optional[List[Pattern]]:
+        """Return unexpired patterns from the in-process cache"""
+        entry = self._pattern_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._pattern_cache[key]
+            return None
+        self._pattern_cache.move_to_end(key)
+        return entry[1]
+    
+    def _cache_patterns(self, key: tuple, patterns: List[Pattern]):
+        """Store patterns in the in-process cache, evicting the least recently used"""
+        self._pattern_cache[key] = (time.monotonic() + self.LOCAL_PATTERN_CACHE_TTL, patterns)
+        self._pattern_cache.move_to_end(key)
+        if len(self._pattern_cache) > self.LOCAL_PATTERN_CACHE_SIZE:
+            self._pattern_cache.popitem(last=False)
+    
+    async def _invalidate_patterns(self, frameworks):
+        """Drop cached pattern queries for the given frameworks from both cache tiers"""
+        frameworks = set(frameworks)
+        for key in [key for key in self._pattern_cache if key[1] in frameworks]:
+            del self._pattern_cache[key]
+        if self.result_cache:
+            for framework in frameworks:
+                await self.result_cache.delete_prefix(f"patterns:{framework}")
     
     async def query_successful_patterns(self, 
                                       framework: str,
@@ -322,54 +571,44 @@ class AIDGraphitiEngine:
                                       time_window_days: int = 180) -> List[Pattern]:
         """Query for historically successful patterns"""
         
-        start_time = datetime.now()
+        local_key = ("success", framework, use_case, min_success_rate, time_window_days)
+        cached = self._get_cached_patterns(local_key)
+        if cached is not None:
+            return cached
         
-        base_query = """
-        MATCH (f:Framework {name: $framework})-[:HAS_PATTERN]->(p:Pattern)
-        WHERE p.success_rate >= $min_success_rate
-        AND p.created_at >= datetime() - duration({days: $time_window_days})
-        """
+        cache_key = None
+        if self.result_cache:
+            cache_key = self.result_cache.make_key(
+                f"patterns:{framework}", use_case, min_success_rate, time_window_days
+            )
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                self._cache_patterns(local_key, cached)
+                return cached
+        
+        start_time = datetime.now()
         
+        parameters = {
+            "framework": framework,
+            "min_success_rate": min_success_rate,
+            "cutoff": self._window_cutoff(time_window_days)
+        }
         if use_case:
-            base_query += " AND $use_case IN p.use_cases"
-        
-        base_query += """
-        RETURN p.id, p.name, p.framework, p.pattern_type, p.code_template,
-               p.success_rate, p.use_cases, p.metadata, p.created_at, 
-               p.last_used, p.usage_count
-        ORDER BY p.success_rate DESC, p.usage_count DESC
-        LIMIT 10
-        """
+            query = _Q_SUCCESS_WITH_USECASE
+            parameters["use_case"] = use_case
+        else:
+            query = _Q_SUCCESS_NO_USECASE
         
-        async with self.driver.session() as session:
-            result = await session.run(base_query, {
-                "framework": framework,
-                "use_case": use_case,
-                "min_success_rate": min_success_rate,
-                "time_window_days": time_window_days
-            })
-            
-            patterns = []
-            async for record in result:
-                pattern = Pattern(
-                    id=record["p.id"],
-                    name=record["p.name"],
-                    framework=record["p.framework"],
-                    pattern_type=record["p.pattern_type"],
-                    code_template=record["p.code_template"],
-                    success_rate=record["p.success_rate"],
-                    use_cases=json.loads(record["p.use_cases"]) if record["p.use_cases"] else [],
-                    metadata=json.loads(record["p.metadata"]) if record["p.metadata"] else {},
-                    created_at=record["p.created_at"],
-                    last_used=record["p.last_used"],
-                    usage_count=record["p.usage_count"]
-                )
-                patterns.append(pattern)
+        patterns = [self._parse_pattern(record["p"]) for record in await self._read(query, parameters)]
         
         query_time = (datetime.now() - start_time).total_seconds()
         self.query_count += 1
         self.total_query_time += query_time
         
+        self._cache_patterns(local_key, patterns)
+        if cache_key:
+            await self.result_cache.set(cache_key, patterns, ttl=self.PATTERN_CACHE_TTL)
+        
         self.logger.info(f"Found {len(patterns)} successful patterns for {framework}")
         return patterns
     
@@ -379,96 +618,141 @@ class AIDGraphitiEngine:
                                   time_window_days: int = 180) -> List[Pattern]:
         """Query for historically failed patterns to avoid"""
         
-        query = """
-        MATCH (f:Framework {name: $framework})-[:HAS_PATTERN]->(p:Pattern)
-        WHERE p.pattern_type = 'failure'
-        AND p.created_at >= datetime() - duration({days: $time_window_days})
-        """
+        local_key = ("failure", framework, code_pattern, time_window_days)
+        cached = self._get_cached_patterns(local_key)
+        if cached is not None:
+            return cached
         
+        parameters = {
+            "framework": framework,
+            "cutoff": self._window_cutoff(time_window_days)
+        }
         if code_pattern:
-            query += " AND p.code_template CONTAINS $code_pattern"
-        
-        query += """
-        RETURN p.id, p.name, p.framework, p.pattern_type, p.code_template,
-               p.success_rate, p.use_cases, p.metadata, p.created_at,
-               p.last_used, p.usage_count
-        ORDER BY p.usage_count DESC
-        LIMIT 5
-        """
+            query = _Q_FAIL_WITH_PATTERN
+            parameters["code_pattern"] = code_pattern
+        else:
+            query = _Q_FAIL_NO_PATTERN
         
-        async with self.driver.session() as session:
-            result = await session.run(query, {
-                "framework": framework,
-                "code_pattern": code_pattern,
-                "time_window_days": time_window_days
-            })
-            
-            patterns = []
-            async for record in result:
-                pattern = Pattern(
-                    id=record["p.id"],
-                    name=record["p.name"],
-                    framework=record["p.framework"],
-                    pattern_type=record["p.pattern_type"],
-                    code_template=record["p.code_template"],
-                    success_rate=record["p.success_rate"],
-                    use_cases=json.loads(record["p.use_cases"]) if record["p.use_cases"] else [],
-                    metadata=json.loads(record["p.metadata"]) if record["p.metadata"] else {},
-                    created_at=record["p.created_at"],
-                    last_used=record["p.last_used"],
-                    usage_count=record["p.usage_count"]
-                )
-                patterns.append(pattern)
+        patterns = [self._parse_pattern(record["p"]) for record in await self._read(query, parameters)]
         
+        self._cache_patterns(local_key, patterns)
         self.logger.info(f"Found {len(patterns)} failed patterns for {framework}")
         return patterns
     
+    async def query_patterns(self,
+                             framework: str,
+                             use_case: str = None,
+                             min_success_rate: float = 0.8,
+                             time_window_days: int = 180) -> Tuple[List[Pattern], List[Pattern]]:
+        """Query successful patterns to use and failed patterns to avoid in one round trip
+        
+        Returns the same ``(successful, failed)`` lists as calling
+        ``query_successful_patterns`` and ``query_failed_patterns`` separately,
+        and fills the cache entries for both.
+        """
+        
+        success_key = ("success", framework, use_case, min_success_rate, time_window_days)
+        failure_key = ("failure", framework, None, time_window_days)
+        successful = self._get_cached_patterns(success_key)
+        failed = self._get_cached_patterns(failure_key)
+        if successful is not None and failed is not None:
+            return successful, failed
+        
+        parameters = {
+            "framework": framework,
+            "min_success_rate": min_success_rate,
+            "cutoff": self._window_cutoff(time_window_days)
+        }
+        if use_case:
+            query = _Q_PATTERNS_WITH_USECASE
+            parameters["use_case"] = use_case
+        else:
+            query = _Q_PATTERNS_NO_USECASE
+        
+        start_time = datetime.now()
+        
+        successful, failed = [], []
+        for record in await self._read(query, parameters):
+            patterns = successful if record["category"] == "success" else failed
+            patterns.append(self._parse_pattern(record["p"]))
+        
+        query_time = (datetime.now() - start_time).total_seconds()
+        self.query_count += 1
+        self.total_query_time += query_time
+        
+        self._cache_patterns(success_key, successful)
+        self._cache_patterns(failure_key, failed)
+        self.logger.info(
+            f"Found {len(successful)} successful and {len(failed)} failed patterns for {framework}"
+        )
+        return successful, failed
+    
     async def update_pattern_usage(self, pattern_id: str, success: bool = True):
         """Update pattern usage statistics"""
         
+        success_rates = await self.update_pattern_usage_batch([(pattern_id, success)])
+        return success_rates.get(pattern_id)
+    
+    async def update_pattern_usage_batch(self, updates: List[Tuple[str, bool]]) -> Dict[str, float]:
+        """Record many pattern outcomes in one round trip
+        
+        Usage and success are kept as integer counters and the success rate is
+        derived from them, so repeated updates never compound rounding error.
+        Patterns stored before ``success_count`` existed are backfilled from
+        their current rate. Returns the new success rate per pattern ID.
+        """
+        
+        if not updates:
+            return {}
+        
         query = """
-        MATCH (p:Pattern {id: $pattern_id})
-        SET p.usage_count = p.usage_count + 1,
+        UNWIND $updates AS u
+        MATCH (p:Pattern {id: u.id})
+        SET p.success_count = coalesce(p.success_count, toInteger(round(p.success_rate * p.usage_count))) + u.inc,
+            p.usage_count = p.usage_count + 1,
             p.last_used = datetime()
+        SET p.success_rate = toFloat(p.success_count) / p.usage_count
+        RETURN p.id AS id, p.framework AS framework, p.success_rate AS success_rate
         """
         
-        if success:
-            query += ", p.success_rate = (p.success_rate * p.usage_count + 1.0) / (p.usage_count + 1)"
-        else:
-            query += ", p.success_rate = (p.success_rate * p.usage_count) / (p.usage_count + 1)"
+        rows = [{"id": pattern_id, "inc": 1 if success else 0} for pattern_id, success in updates]
         
-        query += " RETURN p.success_rate as new_success_rate"
+        records, _, _ = await self.driver.execute_query(
+            query, {"updates": rows},
+            database_=self.database, routing_=RoutingControl.WRITE
+        )
         
-        async with self.driver.session() as session:
-            result = await session.run(query, {"pattern_id": pattern_id})
-            record = await result.single()
-            
-        self.logger.info(f"Updated pattern {pattern_id} usage (success: {success})")
-        return record["new_success_rate"] if record else None
+        await self._invalidate_patterns(record["framework"] for record in records)
+        self.logger.info(f"Updated usage for {len(records)} patterns")
+        return {record["id"]: record["success_rate"] for record in records}
     
     async def temporal_query(self, 
                            cypher_query: str, 
                            parameters: Dict[str, Any] = None) -> TemporalQueryResult:
         """Execute a custom temporal Cypher query"""
         
+        async with self.driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            return await self._run_temporal_query(session, cypher_query, parameters)
+    
+    async def _run_temporal_query(self,
+                                  session,
+                                  cypher_query: str,
+                                  parameters: Optional[Dict[str, Any]]) -> TemporalQueryResult:
+        """Run a temporal query on the given session and parse its results"""
+        
         start_time = datetime.now()
         
-        async with self.driver.session() as session:
-            result = await session.run(cypher_query, parameters or {})
-            
-            entities = []
-            relationships = []
-            patterns = []
-            
-            async for record in result:
-                # Parse different types of results
-                for key, value in record.items():
-                    if hasattr(value, 'labels') and 'TemporalEntity' in value.labels:
-                        entities.append(self._parse_entity(value))
-                    elif hasattr(value, 'labels') and 'Pattern' in value.labels:
-                        patterns.append(self._parse_pattern(value))
-                    elif hasattr(value, 'type') and value.type == 'TEMPORAL_RELATIONSHIP':
-                        relationships.append(self._parse_relationship(value))
+        entities = []
+        relationships = []
+        patterns = []
+        
+        async for parsed in self._iter_temporal_results(session, cypher_query, parameters):
+            if isinstance(parsed, TemporalEntity):
+                entities.append(parsed)
+            elif isinstance(parsed, Pattern):
+                patterns.append(parsed)
+            else:
+                relationships.append(parsed)
         
         query_time = (datetime.now() - start_time).total_seconds()
         self.query_count += 1
@@ -487,13 +771,54 @@ class AIDGraphitiEngine:
             }
         )
     
+    async def temporal_query_stream(self,
+                                    cypher_query: str,
+                                    parameters: Dict[str, Any] = None
+                                    ) -> AsyncIterator[Union[TemporalEntity, TemporalRelationship, Pattern]]:
+        """Execute a custom read-only temporal Cypher query, yielding results as they arrive
+        
+        Nothing is accumulated, so prefer this over ``temporal_query`` for large
+        read-only result sets.
+        """
+        
+        async with self.driver.session(database=self.database,
+                                       default_access_mode=READ_ACCESS,
+                                       fetch_size=self.fetch_size) as session:
+            async for parsed in self._iter_temporal_results(session, cypher_query, parameters):
+                yield parsed
+    
+    async def _iter_temporal_results(self,
+                                     session,
+                                     cypher_query: str,
+                                     parameters: Optional[Dict[str, Any]]
+                                     ) -> AsyncIterator[Union[TemporalEntity, TemporalRelationship, Pattern]]:
+        """Parse records one fetch_size batch at a time instead of buffering the whole result"""
+        
+        result = await session.run(cypher_query, parameters or {})
+        async for record in result:
+            for value in record.values():
+                parsed = self._parse_result_value(value)
+                if parsed is not None:
+                    yield parsed
+    
+    def _parse_result_value(self, value) -> Optional[Union[TemporalEntity, TemporalRelationship, Pattern]]:
+        """Parse a returned node or relationship, or None for any other value"""
+        if hasattr(value, 'labels'):
+            if 'TemporalEntity' in value.labels:
+                return self._parse_entity(value)
+            if 'Pattern' in value.labels:
+                return self._parse_pattern(value)
+        elif hasattr(value, 'type') and value.type == 'TEMPORAL_RELATIONSHIP':
+            return self._parse_relationship(value)
+        return None
+    
     def _parse_entity(self, node) -> TemporalEntity:
         """Parse a Neo4j node into a TemporalEntity"""
         return TemporalEntity(
             id=node.get("id", ""),
             name=node.get("name", ""),
             type=node.get("type", ""),
-            properties=json.loads(node.get("properties", "{}")),
+            properties=orjson.loads(node.get("properties", "{}")),
             created_at=node.get("created_at", datetime.now()),
             updated_at=node.get("updated_at", datetime.now()),
             version=node.get("version", 1),
@@ -509,8 +834,11 @@ class AIDGraphitiEngine:
             pattern_type=node.get("pattern_type", ""),
             code_template=node.get("code_template", ""),
             success_rate=node.get("success_rate", 0.0),
-            use_cases=json.loads(node.get("use_cases", "[]")),
-            metadata=json.loads(node.get("metadata", "{}")),
+            use_cases=list(node.get("use_cases") or []),
+            metadata=_load_pattern_metadata(
+                node.get("metadata"),
+                {field_name: node.get(field_name) for field_name in _PATTERN_PROPERTY_FIELDS}
+            ),
             created_at=node.get("created_at", datetime.now()),
             last_used=node.get("last_used", datetime.now()),
             usage_count=node.get("usage_count", 0)
@@ -523,7 +851,7 @@ class AIDGraphitiEngine:
             source_id=relationship.start_node.get("id", ""),
             target_id=relationship.end_node.get("id", ""),
             relationship_type=relationship.get("type", ""),
-            properties=json.loads(relationship.get("properties", "{}")),
+            properties=orjson.loads(relationship.get("properties", "{}")),
             valid_from=relationship.get("valid_from", datetime.now()),
             valid_to=relationship.get("valid_to"),
             confidence=relationship.get("confidence", 1.0)
@@ -538,24 +866,18 @@ class AIDGraphitiEngine:
         if not entities and not relationships and not patterns:
             return 0.0
         
-        total_confidence = 0.0
-        total_items = 0
-        
-        for entity in entities:
-            total_confidence += entity.confidence
-            total_items += 1
-        
-        for relationship in relationships:
-            total_confidence += relationship.confidence
-            total_items += 1
-        
-        for pattern in patterns:
-            # Pattern confidence is based on success rate and usage
-            pattern_confidence = (pattern.success_rate + (pattern.usage_count / 100)) / 2
-            total_confidence += min(pattern_confidence, 1.0)
-            total_items += 1
+        # Pattern confidence is based on success rate and usage
+        total_confidence = math.fsum((
+            math.fsum(map(_CONFIDENCE, entities)),
+            math.fsum(map(_CONFIDENCE, relationships)),
+            math.fsum(
+                min((pattern.success_rate + pattern.usage_count / 100) / 2, 1.0)
+                for pattern in patterns
+            )
+        ))
+        total_items = len(entities) + len(relationships) + len(patterns)
         
-        return total_confidence / total_items if total_items > 0 else 0.0
+        return total_confidence / total_items
     
     async def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics for the temporal engine"""
@@ -568,9 +890,9 @@ class AIDGraphitiEngine:
     
     async def close(self):
         """Close the Graphiti temporal engine"""
-        if self.driver:
+        if self.driver and self._owns_driver:
             await self.driver.close()
-            self.logger.info("Graphiti temporal engine closed")
+        self.logger.info("Graphiti temporal engine closed")
 
 
 # Example usage and testing
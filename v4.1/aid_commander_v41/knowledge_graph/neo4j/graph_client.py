@@ -14,11 +14,18 @@ logger = structlog.get_logger(__name__)
 class Neo4jClient:
     """Simple Neo4j client wrapper"""
     
-    def __init__(self, uri: str, username: str, password: str):
+    def __init__(self, uri: str, username: str, password: str, database: str = "neo4j",
+                 max_connection_pool_size: int = 64,
+                 connection_acquisition_timeout: float = 30,
+                 max_connection_lifetime: float = 3600):
         """Initialize Neo4j client"""
         self.uri = uri
         self.username = username
         self.password = password
+        self.database = database
+        self.max_connection_pool_size = max_connection_pool_size
+        self.connection_acquisition_timeout = connection_acquisition_timeout
+        self.max_connection_lifetime = max_connection_lifetime
         self._driver = None
         
     async def connect(self):
@@ -26,11 +33,21 @@ class Neo4jClient:
         try:
             import neo4j
             self._driver = neo4j.AsyncGraphDatabase.driver(
-                self.uri, auth=(self.username, self.password)
+                self.uri,
+                auth=(self.username, self.password),
+                max_connection_pool_size=self.max_connection_pool_size,
+                connection_acquisition_timeout=self.connection_acquisition_timeout,
+                max_connection_lifetime=self.max_connection_lifetime,
+                connection_timeout=30,
+                max_transaction_retry_time=15
             )
             logger.info("Connected to Neo4j", uri=self.uri)
         except ImportError:
             logger.warning("Neo4j driver not available, using mock client")
+    
+    def session(self, database: Optional[str] = None, **kwargs):
+        """Open an async session on the pooled driver, defaulting to the client database"""
+        return self._driver.session(database=database or self.database, **kwargs)
             
     async def execute_query(self, query: str, parameters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Execute a Neo4j query"""
@@ -39,9 +56,10 @@ class Neo4jClient:
             return []
             
         try:
-            async with self._driver.session() as session:
-                result = await session.run(query, parameters or {})
-                return [record.data() for record in result]
+            records, _, _ = await self._driver.execute_query(
+                query, parameters or {}, database_=self.database
+            )
+            return [record.data() for record in records]
         except Exception as e:
             logger.error("Query execution failed", error=str(e), query=query)
             return []
@@ -7,26 +7,65 @@ Provides documentation validation and API usage verification through multi-sourc
 """
 
 import asyncio
-import json
+import hashlib
 import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter, mul
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+import orjson
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 from neo4j import AsyncGraphDatabase
 import httpx
-from bs4 import BeautifulSoup
+from lxml import etree
 from pydantic import BaseModel, Field
 import structlog
 
+from ...caching.result_cache import RedisResultCache
+
 logger = structlog.get_logger(__name__)
 
+# Set bits per byte value, for Hamming distances between packed binary codes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+_RELEVANCE = attrgetter("relevance_score")
+
+# Confidence weight per result type; graph results are more trusted
+_RESULT_TYPE_WEIGHTS = {"graph": 1.2, "vector": 1.0}
+
+# Static query text so Neo4j reuses one cached plan for every graph search
+_GRAPH_SEARCH_QUERY = """
+CALL db.index.fulltext.queryNodes('entitySearch', $query) YIELD node, score
+WHERE $framework IS NULL OR node.framework = $framework OR 'Framework' IN labels(node)
+RETURN node, score
+ORDER BY score DESC
+LIMIT $max_results
+"""
+
+_HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4'))
+_CONTENT_TAGS = ('h1', 'h2', 'h3', 'h4', 'p', 'pre', 'code')
+
+# API and pattern extraction regexes, compiled once at import
+_CLASS_RE = re.compile(r'class\s+(\w+)', re.IGNORECASE)
+_EXAMPLE_RE = re.compile(r'(\w+)\.(\w+)\([^)]*\)')
+_CODEBLOCK_RE = re.compile(r'```[\w]*\n(.*?)\n```', re.DOTALL)
+_IMPORT_RE = re.compile(r'from\s+\w+\s+import\s+\w+|import\s+\w+')
+
 
-@dataclass
+@dataclass(slots=True)
 class DocumentChunk:
     """Represents a chunk of documentation"""
     id: str
@@ -39,7 +78,7 @@ class DocumentChunk:
     confidence: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class APIReference:
     """Represents an API reference from documentation"""
     framework: str
@@ -53,7 +92,7 @@ class APIReference:
     confidence: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Individual search result"""
     content: str
@@ -91,19 +130,63 @@ class HybridRAGSystem:
     - Multi-source validation for 96% accuracy
     """
     
+    # Chunks buffered before a Chroma insert, and API references per Neo4j write
+    INGEST_BATCH_SIZE = 1000
+    API_REF_BATCH_SIZE = 500
+    
+    # Collections this large are searched through an in-memory binary index
+    # first, and only the closest candidates are reranked on FP32 embeddings
+    BINARY_INDEX_MIN_SIZE = 20000
+    BINARY_RERANK_CANDIDATES = 200
+    
+    # Query distributions are heavy-tailed, so repeated queries skip the
+    # embedding model and, for a short while, the whole search
+    QUERY_EMBEDDING_CACHE_SIZE = 10000
+    SEARCH_CACHE_SIZE = 1024
+    SEARCH_CACHE_TTL = 60
+    
+    # Content hashes looked up per query against the embedding cache
+    EMBEDDING_CACHE_LOOKUP_BATCH = 500
+    
     def __init__(self, 
                  chroma_config: Dict[str, Any],
                  neo4j_config: Dict[str, str],
-                 embedding_model_name: str = "all-MiniLM-L6-v2"):
+                 embedding_model_name: str = "all-MiniLM-L6-v2",
+                 result_cache: Optional[RedisResultCache] = None,
+                 neo4j_driver=None):
         
         self.chroma_config = chroma_config
         self.neo4j_config = neo4j_config
+        self.result_cache = result_cache
+        self.embedding_model_name = embedding_model_name
         self.embedding_model = SentenceTransformer(embedding_model_name)
         
-        # Clients (initialized in async init)
+        # Persistent content-hash -> embedding cache, opened on first ingest.
+        # It is used from worker threads, so access is serialized by a lock
+        self._embedding_cache_path = Path(chroma_config.get(
+            "embedding_cache_path",
+            Path(chroma_config.get("persist_directory", "./chroma_db")) / "embedding_cache.sqlite"
+        ))
+        self._embedding_cache: Optional[sqlite3.Connection] = None
+        self._embedding_cache_lock = threading.Lock()
+        
+        # Clients (initialized in async init). A Neo4j driver passed in is
+        # shared with other components and owned by the caller
         self.chroma_client = None
-        self.neo4j_driver = None
+        self._warmup_task = None
+        self.neo4j_driver = neo4j_driver
+        self._owns_neo4j_driver = neo4j_driver is None
         self.collection = None
+        self._ingest_buffer = self._new_ingest_buffer()
+        
+        # Binary-quantized index, loaded on first search of a large collection
+        self._binary_codes: Optional[np.ndarray] = None
+        self._binary_ids: List[str] = []
+        self._binary_frameworks: List[str] = []
+        
+        self._embed_query = lru_cache(maxsize=self.QUERY_EMBEDDING_CACHE_SIZE)(self._encode_query)
+        # (query, framework, max_results) -> (expiry, result), least recently used first
+        self._search_cache: "OrderedDict[tuple, Tuple[float, HybridSearchResult]]" = OrderedDict()
         
         # Performance tracking
         self.search_count = 0
@@ -132,15 +215,22 @@ class HybridRAGSystem:
                 )
             
             # Initialize Neo4j connection
-            self.neo4j_driver = AsyncGraphDatabase.driver(
-                self.neo4j_config["uri"],
-                auth=(self.neo4j_config["username"], self.neo4j_config["password"])
-            )
+            if self.neo4j_driver is None:
+                self.neo4j_driver = AsyncGraphDatabase.driver(
+                    self.neo4j_config["uri"],
+                    auth=(self.neo4j_config["username"], self.neo4j_config["password"])
+                )
             
             # Test Neo4j connection
             async with self.neo4j_driver.session() as session:
                 await session.run("RETURN 1")
             
+            # Pre-fault the persisted vector store in the background so the
+            # first query doesn't pay for cold page faults
+            self._warmup_task = asyncio.create_task(
+                asyncio.to_thread(self._warm_persist_directory)
+            )
+            
             self.initialized = True
             self.logger.info("Hybrid RAG system initialized successfully")
             return True
@@ -149,23 +239,56 @@ class HybridRAGSystem:
             self.logger.error(f"Failed to initialize Hybrid RAG system: {e}")
             return False
     
+    def _warm_persist_directory(self) -> int:
+        """Ask the kernel to read ahead every file in the Chroma persist directory"""
+        
+        if not hasattr(os, "posix_fadvise"):
+            return 0
+        
+        persist_dir = Path(self.chroma_config.get("persist_directory", "./chroma_db"))
+        if not persist_dir.is_dir():
+            return 0
+        
+        files_warmed = 0
+        for file_path in persist_dir.rglob("*"):
+            if not file_path.is_file():
+                continue
+            try:
+                fd = os.open(file_path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                    files_warmed += 1
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                self.logger.debug(f"Could not warm {file_path}: {e}")
+        
+        self.logger.debug(f"Warmed {files_warmed} files in {persist_dir}")
+        return files_warmed
+    
     async def ingest_documentation(self, 
                                  framework: str,
                                  docs_url: str,
-                                 local_docs_path: Optional[Path] = None) -> int:
-        """Ingest documentation from URL and/or local files"""
+                                 local_docs_path: Optional[Path] = None,
+                                 http_client: Optional[httpx.AsyncClient] = None) -> int:
+        """Ingest documentation from URL and/or local files
+        
+        Pass ``http_client`` to reuse a caller's pooled connections for scraping.
+        """
         
         chunks_processed = 0
         
         try:
             # Scrape online documentation
             if docs_url:
-                chunks_processed += await self._scrape_and_ingest_docs(framework, docs_url)
+                chunks_processed += await self._scrape_and_ingest_docs(framework, docs_url, http_client)
             
             # Process local documentation
             if local_docs_path and local_docs_path.exists():
                 chunks_processed += await self._process_local_docs(framework, local_docs_path)
             
+            await self._flush_ingest()
+            
             self.logger.info(f"Ingested {chunks_processed} documentation chunks for {framework}")
             return chunks_processed
             
@@ -173,88 +296,303 @@ class HybridRAGSystem:
             self.logger.error(f"Failed to ingest documentation for {framework}: {e}")
             return 0
     
-    async def _scrape_and_ingest_docs(self, framework: str, docs_url: str) -> int:
+    async def _scrape_and_ingest_docs(self,
+                                      framework: str,
+                                      docs_url: str,
+                                      http_client: Optional[httpx.AsyncClient] = None) -> int:
         """Scrape and process online documentation"""
         
+        if http_client is None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                return await self._scrape_and_ingest_docs(framework, docs_url, client)
+        
         chunks_processed = 0
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(docs_url)
+        try:
+            # Parse the body as it streams in; only the extracted text is kept
+            parser = etree.HTMLPullParser(events=("start", "end"), tag=_CONTENT_TAGS)
+            elements: List[List[Optional[str]]] = []
+            open_elements: Dict[Any, List[Optional[str]]] = {}
+            
+            async with http_client.stream("GET", docs_url) as response:
                 response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract main content sections
-                content_sections = soup.find_all(['h1', 'h2', 'h3', 'h4', 'p', 'pre', 'code'])
-                
-                current_section = "overview"
-                content_buffer = []
-                
-                for element in content_sections:
-                    if element.name in ['h1', 'h2', 'h3', 'h4']:
-                        # Process previous section
-                        if content_buffer:
-                            await self._process_content_chunk(
-                                framework, current_section, "\n".join(content_buffer), docs_url
-                            )
-                            chunks_processed += 1
-                            content_buffer = []
-                        
-                        current_section = element.get_text().strip().lower().replace(" ", "_")
-                        content_buffer.append(f"# {element.get_text().strip()}")
+                async for chunk in response.aiter_bytes(8192):
+                    parser.feed(chunk)
+                    self._read_content_events(parser, elements, open_elements)
+            parser.close()
+            self._read_content_events(parser, elements, open_elements)
+            
+            current_section = "overview"
+            content_buffer = []
+            pending = []
+            
+            # Extract main content sections in document order
+            for tag, text in elements:
+                if text is None:
+                    continue
+                if tag in _HEADING_TAGS:
+                    # Collect previous section
+                    if content_buffer:
+                        pending.append((current_section, "\n".join(content_buffer)))
+                        content_buffer = []
                     
-                    elif element.name in ['p', 'pre', 'code']:
-                        content_buffer.append(element.get_text().strip())
+                    current_section = text.lower().replace(" ", "_")
+                    content_buffer.append(f"# {text}")
                 
-                # Process final section
-                if content_buffer:
-                    await self._process_content_chunk(
-                        framework, current_section, "\n".join(content_buffer), docs_url
-                    )
-                    chunks_processed += 1
-                
-            except Exception as e:
-                self.logger.error(f"Failed to scrape {docs_url}: {e}")
-        
+                else:
+                    content_buffer.append(text)
+            
+            # Collect final section
+            if content_buffer:
+                pending.append((current_section, "\n".join(content_buffer)))
+            
+            chunks_processed = await self._process_content_chunks(framework, pending, docs_url)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to scrape {docs_url}: {e}")
+    
         return chunks_processed
     
-    async def _process_content_chunk(self, 
-                                   framework: str,
-                                   section: str,
-                                   content: str,
-                                   source: str):
-        """Process and store a content chunk in vector database"""
+    @staticmethod
+    def _read_content_events(parser,
+                             elements: List[List[Optional[str]]],
+                             open_elements: Dict[Any, List[Optional[str]]]):
+        """Record content elements in document order as the pull parser closes them
+        
+        A slot is reserved when an element opens, so nested elements keep their
+        document order, and filled with its text when it closes. Outermost
+        elements are cleared once read, keeping memory bounded by one section
+        rather than the whole page.
+        """
+        for event, element in parser.read_events():
+            if event == "start":
+                slot = [element.tag, None]
+                elements.append(slot)
+                open_elements[element] = slot
+                continue
+            
+            slot = open_elements.pop(element, None)
+            if slot is None:
+                continue
+            slot[1] = "".join(element.itertext()).strip()
+            if next(element.iterancestors(*_CONTENT_TAGS), None) is None:
+                element.clear(keep_tail=True)
+    
+    async def _process_content_chunks(self,
+                                      framework: str,
+                                      sections: List[Tuple[str, str]],
+                                      source: str) -> int:
+        """Embed and store (section, content) chunks in the vector database
+        
+        All chunks are embedded in one batched encode call. Sorting by length
+        first groups similarly sized texts into the same batch, so little of
+        each forward pass is spent on padding.
+        """
         
-        if len(content.strip()) < 50:  # Skip very short content
-            return
+        # Skip very short content; chunks with identical IDs are stored once
+        chunks = {}
+        for section, content in sections:
+            if len(content.strip()) >= 50:
+                chunks[self._chunk_id(framework, section, content)] = (section, content)
+        
+        # IDs are content hashes, so chunks already stored or buffered from an
+        # earlier ingest are skipped before paying for their embeddings
+        if chunks:
+            known = set(self._ingest_buffer["ids"])
+            stored = await asyncio.to_thread(self.collection.get, ids=list(chunks), include=[])
+            known.update(stored["ids"])
+            for chunk_id in known.intersection(chunks):
+                del chunks[chunk_id]
+        
+        if not chunks:
+            return 0
         
-        # Generate embedding
-        embedding = self.embedding_model.encode(content).tolist()
+        ordered = sorted(chunks.items(), key=lambda item: len(item[1][1]))
+        documents = [content for _, (_, content) in ordered]
         
-        # Create chunk ID
-        chunk_id = f"{framework}_{section}_{hash(content)}"
+        # Encoding and the synchronous Chroma client run in worker threads so
+        # they don't stall the event loop
+        embeddings = await asyncio.to_thread(self._encode_documents, documents)
         
-        # Extract API references if this looks like API documentation
-        api_refs = await self._extract_api_references(framework, content)
+        binary_codes = self._binary_quantize(embeddings)
         
-        # Store in ChromaDB
-        self.collection.add(
-            ids=[chunk_id],
-            documents=[content],
-            metadatas=[{
+        # Extract API references once every chunk is embedded
+        timestamp = datetime.now().isoformat()
+        ids = []
+        metadatas = []
+        chunk_api_refs = []
+        for (chunk_id, (section, content)), code in zip(ordered, binary_codes):
+            api_refs = await self._extract_api_references(framework, content)
+            ids.append(chunk_id)
+            metadatas.append({
                 "framework": framework,
                 "section": section,
                 "source": source,
-                "api_references": json.dumps([ref.__dict__ for ref in api_refs]),
-                "timestamp": datetime.now().isoformat()
-            }],
-            embeddings=[embedding]
-        )
+                # orjson serializes the APIReference dataclasses natively
+                "api_references": orjson.dumps(api_refs).decode(),
+                "timestamp": timestamp,
+                "bq": code.tobytes().hex()
+            })
+            if api_refs:
+                chunk_api_refs.append((chunk_id, api_refs))
+        
+        # Buffer for ChromaDB, inserting once a full batch has accumulated
+        buffer = self._ingest_buffer
+        buffer["ids"].extend(ids)
+        buffer["documents"].extend(documents)
+        buffer["metadatas"].extend(metadatas)
+        buffer["embeddings"].append(embeddings)
+        if len(buffer["ids"]) >= self.INGEST_BATCH_SIZE:
+            await self._flush_ingest()
         
         # Store API references in Neo4j
-        if api_refs:
-            await self._store_api_references_in_graph(framework, api_refs, chunk_id)
+        if chunk_api_refs:
+            await self._store_api_references_in_graph(framework, chunk_api_refs)
+        
+        return len(ids)
+    
+    def _encode_documents(self, documents: List[str]) -> np.ndarray:
+        """Embed documents, reusing embeddings cached from earlier ingests
+        
+        Embeddings are cached on disk as float16 keyed by a hash of the model
+        name and content, so re-ingesting unchanged documentation needs no
+        model work. Freshly computed embeddings are returned at full float32
+        precision; cache hits carry float16 rounding (about 1e-3 per unit-norm
+        dimension), which halves the cache size at a negligible cost to recall.
+        """
+        
+        keys = [
+            hashlib.blake2b(
+                f"{self.embedding_model_name}\0{document}".encode("utf-8"), digest_size=16
+            ).digest()
+            for document in documents
+        ]
+        
+        with self._embedding_cache_lock:
+            cache = self._open_embedding_cache()
+            cached = {}
+            for start in range(0, len(keys), self.EMBEDDING_CACHE_LOOKUP_BATCH):
+                batch = keys[start:start + self.EMBEDDING_CACHE_LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                cached.update(cache.execute(
+                    f"SELECT h, vec FROM emb_cache WHERE h IN ({placeholders})", batch
+                ).fetchall())
+        
+        embeddings = [
+            np.frombuffer(cached[key], dtype=np.float16) if key in cached else None
+            for key in keys
+        ]
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            computed = self.embedding_model.encode(
+                [documents[i] for i in missing],
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            rows = [
+                (keys[i], embedding.astype(np.float16).tobytes())
+                for i, embedding in zip(missing, computed)
+            ]
+            with self._embedding_cache_lock:
+                with cache:
+                    cache.executemany("INSERT OR REPLACE INTO emb_cache (h, vec) VALUES (?, ?)", rows)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+        
+        self.logger.debug(f"Embedded {len(missing)} documents, {len(keys) - len(missing)} from cache")
+        return np.vstack(embeddings).astype(np.float32, copy=False)
+    
+    def _open_embedding_cache(self) -> sqlite3.Connection:
+        """Open the embedding cache database, creating it if needed"""
+        if self._embedding_cache is None:
+            self._embedding_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache = sqlite3.connect(self._embedding_cache_path, check_same_thread=False)
+            cache.execute("CREATE TABLE IF NOT EXISTS emb_cache (h BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+            self._embedding_cache = cache
+        return self._embedding_cache
+    
+    @staticmethod
+    def _chunk_id(framework: str, section: str, content: str) -> str:
+        """Chunk ID that is stable across processes, unlike the salted builtin hash()"""
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+        return f"{framework}_{section}_{digest}"
+    
+    @staticmethod
+    def _new_ingest_buffer() -> Dict[str, List[Any]]:
+        """Empty column buffer for collection.upsert; embeddings hold (n, dim) blocks"""
+        return {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+    
+    async def _flush_ingest(self):
+        """Write all buffered chunks to ChromaDB with one idempotent upsert"""
+        
+        buffer = self._ingest_buffer
+        if not buffer["ids"]:
+            return
+        
+        self._ingest_buffer = self._new_ingest_buffer()
+        # Chroma's client is synchronous; keep the insert off the event loop,
+        # and hand it the embeddings as one float32 matrix rather than boxed floats
+        await asyncio.to_thread(
+            self.collection.upsert,
+            ids=buffer["ids"],
+            documents=buffer["documents"],
+            metadatas=buffer["metadatas"],
+            embeddings=np.vstack(buffer["embeddings"])
+        )
+        self.logger.debug(f"Flushed {len(buffer['ids'])} chunks to ChromaDB")
+        
+        if self._binary_codes is not None:
+            self._append_binary_codes(buffer["ids"], buffer["metadatas"])
+        
+        # New documents can change any cached search
+        self._search_cache.clear()
+    
+    @staticmethod
+    def _binary_quantize(embeddings: np.ndarray) -> np.ndarray:
+        """Pack the sign bit of each embedding dimension, 32x smaller than FP32"""
+        return np.packbits(embeddings > 0, axis=-1)
+    
+    def _append_binary_codes(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """Add stored chunks to the in-memory binary index"""
+        codes = np.array(
+            [np.frombuffer(bytes.fromhex(metadata["bq"]), dtype=np.uint8) for metadata in metadatas]
+        )
+        self._binary_codes = np.vstack([self._binary_codes, codes])
+        self._binary_ids.extend(ids)
+        self._binary_frameworks.extend(metadata.get("framework") for metadata in metadatas)
+    
+    def _load_binary_index(self):
+        """Build the binary index from the codes stored in chunk metadata
+        
+        Chunks ingested before codes were stored are quantized from their
+        FP32 embeddings once.
+        """
+        
+        stored = self.collection.get(include=["metadatas"])
+        ids = stored["ids"]
+        metadatas = stored["metadatas"]
+        
+        legacy_codes = {}
+        missing = [chunk_id for chunk_id, metadata in zip(ids, metadatas) if "bq" not in metadata]
+        if missing:
+            legacy = self.collection.get(ids=missing, include=["embeddings"])
+            legacy_codes = dict(zip(
+                legacy["ids"],
+                self._binary_quantize(np.asarray(legacy["embeddings"], dtype=np.float32))
+            ))
+        
+        codes = [
+            np.frombuffer(bytes.fromhex(metadata["bq"]), dtype=np.uint8)
+            if "bq" in metadata else legacy_codes[chunk_id]
+            for chunk_id, metadata in zip(ids, metadatas)
+        ]
+        
+        self._binary_codes = np.array(codes, dtype=np.uint8)
+        self._binary_ids = list(ids)
+        self._binary_frameworks = [metadata.get("framework") for metadata in metadatas]
+        self.logger.info(f"Loaded binary index with {len(ids)} chunks")
     
     async def _extract_api_references(self, framework: str, content: str) -> List[APIReference]:
         """Extract API references from documentation content"""
@@ -264,19 +602,11 @@ class HybridRAGSystem:
         # Simple pattern matching for common API patterns
         # This would be enhanced with more sophisticated NLP in production
         
-        import re
-        
         # Pattern for class definitions
-        class_patterns = re.findall(r'class\s+(\w+)', content, re.IGNORECASE)
-        
-        # Pattern for method signatures
-        method_patterns = re.findall(
-            r'(?:def\s+|\.)?(\w+)\s*\([^)]*\)\s*(?:->\s*[\w\[\],\s]+)?',
-            content
-        )
+        class_patterns = _CLASS_RE.findall(content)
         
         # Pattern for function calls in examples
-        example_patterns = re.findall(r'(\w+)\.(\w+)\([^)]*\)', content)
+        example_patterns = _EXAMPLE_RE.findall(content)
         
         for class_name in class_patterns:
             api_refs.append(APIReference(
@@ -308,61 +638,92 @@ class HybridRAGSystem:
     
     async def _store_api_references_in_graph(self, 
                                            framework: str,
-                                           api_refs: List[APIReference],
-                                           chunk_id: str):
-        """Store API references in Neo4j knowledge graph"""
+                                           chunk_api_refs: List[Tuple[str, List[APIReference]]]):
+        """Store API references in Neo4j knowledge graph
+        
+        Takes (chunk_id, api_refs) pairs and writes them with UNWIND in
+        batches of ``API_REF_BATCH_SIZE`` references per transaction. Methods
+        are merged on their identity and their details updated in place.
+        """
+        
+        query = """
+        MERGE (f:Framework {name: $framework})
+        WITH f
+        UNWIND $rows AS row
+        MERGE (c:Class {name: row.class_name, framework: $framework})
+        MERGE (m:Method {name: row.method_name, class: row.class_name, framework: $framework})
+        MERGE (doc:DocumentChunk {id: row.chunk_id})
+        
+        MERGE (f)-[:CONTAINS]->(c)
+        MERGE (c)-[:HAS_METHOD]->(m)
+        MERGE (m)-[:DOCUMENTED_IN]->(doc)
+        
+        SET m.signature = row.signature,
+            m.description = row.description,
+            m.return_type = row.return_type,
+            m.confidence = row.confidence,
+            m.examples = row.examples,
+            m.parameters = row.parameters,
+            m.last_updated = datetime()
+        """
+        
+        rows = [
+            {
+                "class_name": api_ref.class_name,
+                "method_name": api_ref.method_name,
+                "signature": api_ref.signature,
+                "description": api_ref.description,
+                "return_type": api_ref.return_type,
+                "confidence": api_ref.confidence,
+                "chunk_id": chunk_id,
+                "examples": orjson.dumps(api_ref.examples).decode(),
+                "parameters": orjson.dumps(api_ref.parameters).decode()
+            }
+            for chunk_id, api_refs in chunk_api_refs
+            for api_ref in api_refs
+        ]
         
         async with self.neo4j_driver.session() as session:
-            for api_ref in api_refs:
-                query = """
-                MERGE (f:Framework {name: $framework})
-                MERGE (c:Class {name: $class_name, framework: $framework})
-                MERGE (m:Method {
-                    name: $method_name,
-                    class: $class_name,
-                    framework: $framework,
-                    signature: $signature,
-                    description: $description,
-                    return_type: $return_type,
-                    confidence: $confidence
-                })
-                MERGE (doc:DocumentChunk {id: $chunk_id})
-                
-                MERGE (f)-[:CONTAINS]->(c)
-                MERGE (c)-[:HAS_METHOD]->(m)
-                MERGE (m)-[:DOCUMENTED_IN]->(doc)
-                
-                SET m.examples = $examples,
-                    m.parameters = $parameters,
-                    m.last_updated = datetime()
-                """
-                
-                await session.run(query, {
+            for start in range(0, len(rows), self.API_REF_BATCH_SIZE):
+                await session.execute_write(self._run_write, query, {
                     "framework": framework,
-                    "class_name": api_ref.class_name,
-                    "method_name": api_ref.method_name,
-                    "signature": api_ref.signature,
-                    "description": api_ref.description,
-                    "return_type": api_ref.return_type,
-                    "confidence": api_ref.confidence,
-                    "chunk_id": chunk_id,
-                    "examples": json.dumps(api_ref.examples),
-                    "parameters": json.dumps(api_ref.parameters)
+                    "rows": rows[start:start + self.API_REF_BATCH_SIZE]
                 })
     
+    @staticmethod
+    async def _run_write(tx, query: str, parameters: Dict[str, Any]):
+        """Transaction function for writes, retried by the driver on transient errors"""
+        result = await tx.run(query, parameters)
+        await result.consume()
+    
+    @staticmethod
+    async def _run_read(tx, query: str, parameters: Dict[str, Any]) -> List[Any]:
+        """Transaction function for reads, retried by the driver on transient errors"""
+        result = await tx.run(query, parameters)
+        return [record async for record in result]
+    
     async def hybrid_search(self, 
                           query: str,
                           framework: str = None,
                           max_results: int = 10) -> HybridSearchResult:
         """Perform hybrid search combining vector and graph approaches"""
         
-        start_time = datetime.now()
-        
-        # 1. Vector search for semantic similarity
-        vector_results = await self._vector_search(query, framework, max_results // 2)
-        
-        # 2. Graph search for structural relationships
-        graph_results = await self._graph_search(query, framework, max_results // 2)
+        cache_key = (query, framework, max_results)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._search_cache.move_to_end(cache_key)
+                return cached[1]
+            del self._search_cache[cache_key]
+        
+        start_ns = time.perf_counter_ns()
+        
+        # 1-2. Vector search for semantic similarity and graph search for
+        # structural relationships are independent, so run them concurrently
+        vector_results, graph_results = await asyncio.gather(
+            self._vector_search(query, framework, max_results // 2),
+            self._graph_search(query, framework, max_results // 2)
+        )
         
         # 3. Combine and rank results
         combined_results = self._combine_search_results(vector_results, graph_results)
@@ -374,11 +735,11 @@ class HybridRAGSystem:
         # 5. Calculate overall confidence
         confidence = self._calculate_search_confidence(combined_results)
         
-        search_time = (datetime.now() - start_time).total_seconds()
+        search_time = (time.perf_counter_ns() - start_ns) / 1e9
         self.search_count += 1
         self.total_search_time += search_time
         
-        return HybridSearchResult(
+        search_result = HybridSearchResult(
             results=combined_results[:max_results],
             confidence=confidence,
             search_metadata={
@@ -391,6 +752,18 @@ class HybridRAGSystem:
             api_references=api_references,
             patterns=patterns
         )
+        
+        self._search_cache[cache_key] = (time.monotonic() + self.SEARCH_CACHE_TTL, search_result)
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        
+        return search_result
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Embed a query with the ingest model; cached per instance as _embed_query"""
+        return self.embedding_model.encode(
+            [query], convert_to_numpy=True, normalize_embeddings=True
+        )[0]
     
     async def _vector_search(self, 
                            query: str,
@@ -398,14 +771,26 @@ class HybridRAGSystem:
                            max_results: int = 5) -> List[SearchResult]:
         """Perform vector-based semantic search"""
         
+        # Embed with the same model used at ingest rather than Chroma's default
+        query_embedding = await asyncio.to_thread(self._embed_query, query)
+        
+        if (self._binary_codes is None
+                and await asyncio.to_thread(self.collection.count) >= self.BINARY_INDEX_MIN_SIZE):
+            await asyncio.to_thread(self._load_binary_index)
+        if self._binary_codes is not None:
+            return await asyncio.to_thread(
+                self._binary_vector_search, query_embedding, framework, max_results
+            )
+        
         # Build query filter
         where_filter = {}
         if framework:
             where_filter["framework"] = framework
         
         # Query ChromaDB
-        results = self.collection.query(
-            query_texts=[query],
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=[query_embedding],
             n_results=max_results,
             where=where_filter if where_filter else None
         )
@@ -415,18 +800,62 @@ class HybridRAGSystem:
         if results["documents"] and results["documents"][0]:
             for i, doc in enumerate(results["documents"][0]):
                 metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-                distance = results["distances"][0][i] if results["distances"] else 0.5
+                distance = results["distances"][0][i] if results["distances"] else 1.0
                 
                 search_results.append(SearchResult(
                     content=doc,
                     source=metadata.get("source", "unknown"),
-                    relevance_score=1.0 - distance,  # Convert distance to relevance
+                    # Squared L2 between unit vectors is 2 - 2cos; report cosine
+                    # like the binary index does
+                    relevance_score=1.0 - distance / 2.0,
                     metadata=metadata,
                     result_type="vector"
                 ))
         
         return search_results
     
+    def _binary_vector_search(self,
+                              query_embedding: np.ndarray,
+                              framework: Optional[str],
+                              max_results: int) -> List[SearchResult]:
+        """Two-stage search: Hamming distance over binary codes, cosine rerank on FP32"""
+        
+        codes = self._binary_codes
+        row_ids = np.arange(len(codes))
+        if framework:
+            row_ids = row_ids[np.array(self._binary_frameworks, dtype=object) == framework]
+            codes = codes[row_ids]
+        if not len(row_ids):
+            return []
+        
+        query_code = self._binary_quantize(query_embedding)
+        distances = _POPCOUNT[codes ^ query_code].sum(axis=1, dtype=np.uint32)
+        
+        n_candidates = min(self.BINARY_RERANK_CANDIDATES, len(distances))
+        nearest = np.argpartition(distances, n_candidates - 1)[:n_candidates]
+        candidate_ids = [self._binary_ids[i] for i in row_ids[nearest]]
+        
+        candidates = self.collection.get(
+            ids=candidate_ids, include=["embeddings", "documents", "metadatas"]
+        )
+        embeddings = np.asarray(candidates["embeddings"], dtype=np.float32)
+        # Legacy chunks may predate normalized embeddings, so divide by their norms
+        norms = np.linalg.norm(embeddings, axis=1)
+        similarities = (embeddings @ query_embedding) / np.maximum(norms, 1e-12)
+        
+        search_results = []
+        for i in np.argsort(-similarities)[:max_results]:
+            metadata = candidates["metadatas"][i] or {}
+            search_results.append(SearchResult(
+                content=candidates["documents"][i],
+                source=metadata.get("source", "unknown"),
+                relevance_score=float(similarities[i]),
+                metadata=metadata,
+                result_type="vector"
+            ))
+        
+        return search_results
+    
     async def _graph_search(self, 
                           query: str,
                           framework: str = None,
@@ -435,28 +864,14 @@ class HybridRAGSystem:
         
         search_results = []
         
-        # Construct Cypher query for API search
-        base_query = """
-        CALL db.index.fulltext.queryNodes('entitySearch', $query) YIELD node, score
-        """
-        
-        if framework:
-            base_query += " WHERE node.framework = $framework OR 'Framework' in labels(node)"
-        
-        base_query += """
-        RETURN node, score
-        ORDER BY score DESC
-        LIMIT $max_results
-        """
-        
         async with self.neo4j_driver.session() as session:
-            result = await session.run(base_query, {
+            records = await session.execute_read(self._run_read, _GRAPH_SEARCH_QUERY, {
                 "query": query,
                 "framework": framework,
                 "max_results": max_results
             })
             
-            async for record in result:
+            for record in records:
                 node = record["node"]
                 score = record["score"]
                 
@@ -467,7 +882,7 @@ class HybridRAGSystem:
                     content += f"Signature: {node.get('signature')}\n"
                     content += f"Description: {node.get('description')}\n"
                     if node.get('examples'):
-                        examples = json.loads(node.get('examples', '[]'))
+                        examples = orjson.loads(node.get('examples', '[]'))
                         content += f"Examples: {', '.join(examples)}\n"
                 
                 elif "Class" in node.labels:
@@ -500,52 +915,59 @@ class HybridRAGSystem:
                               graph_results: List[SearchResult]) -> List[SearchResult]:
         """Combine and rank search results from multiple sources"""
         
-        all_results = []
-        
-        # Add vector results with weight
+        # Weight vector search, and graph search slightly higher
         for result in vector_results:
-            result.relevance_score *= 0.7  # Weight vector search
-            all_results.append(result)
-        
-        # Add graph results with weight
+            result.relevance_score *= 0.7
         for result in graph_results:
-            result.relevance_score *= 0.8  # Weight graph search slightly higher
-            all_results.append(result)
+            result.relevance_score *= 0.8
         
         # Sort by relevance score
-        all_results.sort(key=lambda x: x.relevance_score, reverse=True)
+        all_results = sorted(vector_results + graph_results, key=_RELEVANCE, reverse=True)
         
-        # Remove duplicates based on content similarity
+        # Remove duplicates based on content similarity, tokenizing each result once
         unique_results = []
+        unique_words = []
         for result in all_results:
+            words = frozenset(result.content.lower().split())
+            size = len(words)
             is_duplicate = False
-            for existing in unique_results:
-                if self._calculate_content_similarity(result.content, existing.content) > 0.8:
+            for i, existing_words in enumerate(unique_words):
+                # Jaccard similarity is bounded by the ratio of the set sizes, so
+                # most pairs are ruled out without computing an intersection
+                existing_size = len(existing_words)
+                if min(size, existing_size) <= 0.8 * max(size, existing_size):
+                    continue
+                if self._word_set_similarity(words, existing_words) > 0.8:
                     is_duplicate = True
                     # Keep the higher scoring result
-                    if result.relevance_score > existing.relevance_score:
-                        unique_results.remove(existing)
+                    if result.relevance_score > unique_results[i].relevance_score:
+                        del unique_results[i]
+                        del unique_words[i]
                         unique_results.append(result)
+                        unique_words.append(words)
                     break
             
             if not is_duplicate:
                 unique_results.append(result)
+                unique_words.append(words)
         
         return unique_results
     
     def _calculate_content_similarity(self, content1: str, content2: str) -> float:
         """Calculate similarity between two content strings"""
         # Simple word-based similarity (could be enhanced with embeddings)
-        words1 = set(content1.lower().split())
-        words2 = set(content2.lower().split())
-        
+        return self._word_set_similarity(
+            frozenset(content1.lower().split()), frozenset(content2.lower().split())
+        )
+    
+    @staticmethod
+    def _word_set_similarity(words1: frozenset, words2: frozenset) -> float:
+        """Jaccard similarity of two word sets"""
         if not words1 or not words2:
             return 0.0
         
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
+        intersection = len(words1 & words2)
+        return intersection / (len(words1) + len(words2) - intersection)
     
     async def _extract_api_references_from_results(self, 
                                                  results: List[SearchResult]) -> List[APIReference]:
@@ -586,13 +1008,10 @@ class HybridRAGSystem:
         
         for result in results:
             # Look for code patterns in the content
-            import re
-            code_patterns = re.findall(r'```[\w]*\n(.*?)\n```', result.content, re.DOTALL)
-            patterns.extend(code_patterns)
+            patterns.extend(_CODEBLOCK_RE.findall(result.content))
             
             # Look for import statements
-            import_patterns = re.findall(r'from\s+\w+\s+import\s+\w+|import\s+\w+', result.content)
-            patterns.extend(import_patterns)
+            patterns.extend(_IMPORT_RE.findall(result.content))
         
         # Remove duplicates and return top patterns
         unique_patterns = list(set(patterns))
@@ -605,23 +1024,12 @@ class HybridRAGSystem:
             return 0.0
         
         # Average relevance score weighted by result type
-        total_score = 0.0
-        total_weight = 0.0
-        
-        for result in results:
-            weight = 1.0
-            if result.result_type == "graph":
-                weight = 1.2  # Graph results are more trusted
-            elif result.result_type == "vector":
-                weight = 1.0
-            
-            total_score += result.relevance_score * weight
-            total_weight += weight
-        
-        base_confidence = total_score / total_weight if total_weight > 0 else 0.0
+        weights = [_RESULT_TYPE_WEIGHTS.get(result.result_type, 1.0) for result in results]
+        total_score = math.fsum(map(mul, map(_RELEVANCE, results), weights))
+        base_confidence = total_score / math.fsum(weights)
         
         # Boost confidence if we have multiple types of results
-        result_types = set(result.result_type for result in results)
+        result_types = {result.result_type for result in results}
         type_diversity_bonus = len(result_types) * 0.1
         
         return min(base_confidence + type_diversity_bonus, 1.0)
@@ -631,44 +1039,141 @@ class HybridRAGSystem:
                                framework: str) -> ValidationResult:
         """Validate API usage against documentation and graph structure"""
         
-        issues = []
-        suggestions = []
+        cache_key = None
+        if self.result_cache:
+            cache_key = self.result_cache.make_key("apival", api_call, framework)
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # 1. Search for API documentation, while
+        # 2. querying the graph for the exact API structure
+        search_result, api_structures = await asyncio.gather(
+            self.hybrid_search(
+                f"{framework} {api_call} usage example",
+                framework=framework,
+                max_results=5
+            ),
+            self._query_api_structures([api_call], framework)
+        )
         
-        # 1. Search for API documentation
-        search_result = await self.hybrid_search(
-            f"{framework} {api_call} usage example",
-            framework=framework,
-            max_results=5
+        validation = self._build_validation_result(
+            api_call, framework, search_result, api_structures.get(api_call, [])
         )
         
-        # 2. Query graph for exact API structure
-        api_structure = []
-        async with self.neo4j_driver.session() as session:
-            query = """
-            MATCH (f:Framework {name: $framework})
-            -[:CONTAINS]->(c:Class)
-            -[:HAS_METHOD]->(m:Method)
-            WHERE m.name CONTAINS $api_call OR c.name CONTAINS $api_call
-            RETURN c.name as class_name, m.name as method_name, 
-                   m.signature, m.description, m.confidence, m.examples
-            ORDER BY m.confidence DESC
-            LIMIT 5
-            """
+        if cache_key:
+            await self.result_cache.set(cache_key, validation)
+        
+        return validation
+    
+    async def validate_api_usage_batch(self,
+                                     api_calls: List[str],
+                                     framework: str) -> Dict[str, ValidationResult]:
+        """Validate many API calls with a single graph round-trip"""
+        
+        if not api_calls:
+            return {}
+        
+        validations: Dict[str, ValidationResult] = {}
+        cache_keys: Dict[str, str] = {}
+        
+        # Serve what we can from the result cache in one round-trip
+        if self.result_cache:
+            cache_keys = {
+                api_call: self.result_cache.make_key("apival", api_call, framework)
+                for api_call in api_calls
+            }
+            cached = await self.result_cache.get_many(list(cache_keys.values()))
+            for api_call, validation in zip(cache_keys, cached):
+                if validation is not None:
+                    validations[api_call] = validation
+        
+        pending = [api_call for api_call in api_calls if api_call not in validations]
+        if pending:
+            # Documentation searches are independent, run them concurrently
+            # alongside one UNWIND query resolving the graph structure for every call
+            *search_results, api_structures = await asyncio.gather(
+                *(
+                    self.hybrid_search(
+                        f"{framework} {api_call} usage example",
+                        framework=framework,
+                        max_results=5
+                    )
+                    for api_call in pending
+                ),
+                self._query_api_structures(pending, framework)
+            )
             
+            for api_call, search_result in zip(pending, search_results):
+                validation = self._build_validation_result(
+                    api_call, framework, search_result, api_structures.get(api_call, [])
+                )
+                validations[api_call] = validation
+                if self.result_cache:
+                    await self.result_cache.set(cache_keys[api_call], validation)
+        
+        return {api_call: validations[api_call] for api_call in api_calls}
+    
+    async def _query_api_structures(self,
+                                  api_calls: List[str],
+                                  framework: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Look up the graph API structure for each call using UNWIND batching"""
+        
+        query = """
+        UNWIND $calls AS call
+        MATCH (f:Framework {name: $framework})
+        -[:CONTAINS]->(c:Class)
+        -[:HAS_METHOD]->(m:Method)
+        WHERE m.name CONTAINS call.name OR c.name CONTAINS call.name
+        WITH call, c, m
+        ORDER BY m.confidence DESC
+        WITH call, collect({
+            class_name: c.name,
+            method_name: m.name,
+            signature: m.signature,
+            description: m.description,
+            confidence: m.confidence,
+            examples: m.examples
+        })[..5] AS apis
+        RETURN call.api_call AS api_call, apis
+        """
+        
+        calls = [
+            {"api_call": api_call, "name": api_call.split('.')[-1]}  # Get method name
+            for api_call in api_calls
+        ]
+        
+        api_structures: Dict[str, List[Dict[str, Any]]] = {}
+        async with self.neo4j_driver.session() as session:
             result = await session.run(query, {
                 "framework": framework,
-                "api_call": api_call.split('.')[-1]  # Get method name
+                "calls": calls
             })
             
             async for record in result:
-                api_structure.append({
-                    "class_name": record["class_name"],
-                    "method_name": record["method_name"],
-                    "signature": record["signature"],
-                    "description": record["description"],
-                    "confidence": record["confidence"],
-                    "examples": json.loads(record["examples"]) if record["examples"] else []
-                })
+                api_structures[record["api_call"]] = [
+                    {
+                        "class_name": api["class_name"],
+                        "method_name": api["method_name"],
+                        "signature": api["signature"],
+                        "description": api["description"],
+                        "confidence": api["confidence"],
+                        "examples": orjson.loads(api["examples"]) if api["examples"] else []
+                    }
+                    for api in record["apis"]
+                ]
+        
+        return api_structures
+    
+    def _build_validation_result(self,
+                                 api_call: str,
+                                 framework: str,
+                                 search_result: HybridSearchResult,
+                                 api_structure: List[Dict[str, Any]]) -> ValidationResult:
+        """Combine documentation search and graph structure into a validation result"""
+        
+        issues = []
+        suggestions = []
         
         # 3. Validate usage pattern
         is_valid = False
@@ -707,7 +1212,7 @@ class HybridRAGSystem:
         """Get performance statistics for the hybrid RAG system"""
         
         # Get ChromaDB collection stats
-        collection_count = self.collection.count() if self.collection else 0
+        collection_count = await asyncio.to_thread(self.collection.count) if self.collection else 0
         
         return {
             "search_count": self.search_count,
@@ -719,8 +1224,13 @@ class HybridRAGSystem:
     
     async def close(self):
         """Close the hybrid RAG system"""
-        if self.neo4j_driver:
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self.neo4j_driver and self._owns_neo4j_driver:
             await self.neo4j_driver.close()
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
+            self._embedding_cache = None
         self.logger.info("Hybrid RAG system closed")
 
 
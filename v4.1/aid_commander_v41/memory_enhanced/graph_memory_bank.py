@@ -8,8 +8,13 @@ context retrieval, relationship tracking, and cross-project learning.
 
 import asyncio
 import json
+import re
 import sqlite3
+import sys
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -19,7 +24,6 @@ from pydantic import BaseModel, Field
 import structlog
 
 # Import v4.0 memory components
-import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "v4"))
 from memory_service import MemoryBank, MemoryContext
@@ -28,6 +32,104 @@ from ..knowledge_graph.neo4j.graph_client import Neo4jClient
 
 logger = structlog.get_logger(__name__)
 
+# Connection tuning for graph_memory.db; page_size must be set before the first write
+_SQLITE_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Memories below this success score are left out of the partial top-K index; the
+# literal is inlined into queries because SQLite only uses partial indexes for
+# WHERE terms it can prove at prepare time
+_HOT_SUCCESS_SCORE = 0.3
+
+# Word tokens used to build FTS5 MATCH expressions from free-form decision text
+_FTS_TOKEN_RE = re.compile(r"\w+")
+
+# Tokens for the token-set similarity fallback; short words carry little signal
+_TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+def _tokenize(text: str) -> frozenset:
+    """Token set of a decision, persisted once so stored decisions are never re-tokenized
+    
+    Tokens are interned so set operations between decisions compare by identity.
+    """
+    return frozenset(map(sys.intern, _TOKEN_RE.findall(text.lower())))
+
+
+_INSERT_MEMORY_SQL = """
+    INSERT INTO cross_project_memories 
+    (memory_id, project_path, decision, decision_tokens, framework, decision_type, success_score, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Keeps the per-framework rollup current; decision_type is keyed as '' because
+# SQLite treats NULLs as distinct in primary keys
+_UPSERT_FRAMEWORK_STATS_SQL = """
+    INSERT INTO cpm_framework_stats (framework, decision_type, total, sum_success, updated_at)
+    VALUES (?, IFNULL(?, ''), 1, ?, ?)
+    ON CONFLICT (framework, decision_type) DO UPDATE SET
+        total = total + 1,
+        sum_success = sum_success + excluded.sum_success,
+        updated_at = excluded.updated_at
+"""
+
+# Memory node creation for one or many rows; properties are set from a map so null
+# fields are skipped, and the framework branch is a FOREACH so the query text is static
+_CREATE_MEMORY_NODES_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Project {path: row.project_path})
+CREATE (m:Memory)
+SET m = row.props, m.created_at = datetime()
+CREATE (m)-[:BELONGS_TO]->(p)
+FOREACH (ignored IN CASE WHEN row.props.framework IS NULL THEN [] ELSE [1] END |
+    MERGE (f:Framework {name: row.props.framework})
+    MERGE (m)-[:USES_FRAMEWORK]->(f)
+)
+"""
+
+# Related projects, cross-framework insights and the framework's historical success
+# in one statement; rows are told apart by the kind column
+_ENHANCED_CONTEXT_SQL = """
+    WITH proj AS (
+        SELECT project_path, COUNT(*) AS relevance_count
+        FROM cross_project_memories
+        WHERE project_path != :project_path
+        AND (:framework IS NULL OR framework = :framework)
+        GROUP BY project_path
+        ORDER BY relevance_count DESC
+        LIMIT 5
+    ),
+    fw AS (
+        SELECT framework, NULLIF(decision_type, '') AS decision_type, avg_success, total
+        FROM cpm_framework_stats
+        WHERE total >= 2
+        ORDER BY avg_success DESC
+        LIMIT 5
+    ),
+    base AS (
+        SELECT SUM(sum_success) / SUM(total) AS avg_success, SUM(total) AS total
+        FROM cpm_framework_stats
+        WHERE framework = :framework
+    )
+    SELECT 'project', project_path, NULL, NULL, relevance_count FROM proj WHERE :cross_project
+    UNION ALL
+    SELECT 'insight', framework, decision_type, avg_success, total FROM fw WHERE :cross_project
+    UNION ALL
+    SELECT 'base', NULL, NULL, avg_success, total FROM base
+"""
+
+_INSERT_RELATIONSHIP_SQL = """
+    INSERT INTO memory_relationships 
+    (source_memory_id, target_memory_id, relationship_type, strength, metadata, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 @dataclass
 class GraphMemoryRelationship:
@@ -70,6 +172,12 @@ class GraphEnhancedMemoryBank(MemoryBank):
     - Enhanced context retrieval through graph traversal
     """
     
+    # Inserts between ANALYZE runs that keep query planner statistics current
+    ANALYZE_INTERVAL = 1000
+    
+    CONTEXT_CACHE_SIZE = 512
+    CONTEXT_CACHE_TTL = 60  # seconds
+    
     def __init__(self, 
                  project_path: str,
                  graphiti_engine: AIDGraphitiEngine,
@@ -85,6 +193,14 @@ class GraphEnhancedMemoryBank(MemoryBank):
         # Enhanced memory database schema
         self.graph_memory_db = None
         self.graph_initialized = False
+        self._fts_enabled = False
+        self._graph_db_lock = threading.Lock()
+        self._inserts_since_analyze = 0
+        
+        # (kind, *args, generation) -> (expiry, result), least recently used first;
+        # every indexed write bumps the generation so stale entries are never hit
+        self._context_cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+        self._cache_generation = 0
         
         self.logger = logger.bind(component="GraphMemoryBank", project=project_path)
     
@@ -98,7 +214,7 @@ class GraphEnhancedMemoryBank(MemoryBank):
                 return False
             
             # Initialize graph-enhanced database
-            await self._initialize_graph_memory_db()
+            await self._run_db(self._initialize_graph_memory_db)
             
             # Initialize knowledge graph schemas
             await self._initialize_graph_schemas()
@@ -111,11 +227,20 @@ class GraphEnhancedMemoryBank(MemoryBank):
             self.logger.error(f"Failed to initialize graph-enhanced memory bank: {e}")
             return False
     
-    async def _initialize_graph_memory_db(self):
+    def _initialize_graph_memory_db(self):
         """Initialize enhanced SQLite database with graph relationship tables"""
         
         graph_db_path = self.memory_dir / "graph_memory.db"
-        self.graph_memory_db = sqlite3.connect(str(graph_db_path))
+        # Autocommit mode so transactions are managed explicitly; TIMESTAMP columns
+        # come back as datetime objects
+        self.graph_memory_db = sqlite3.connect(
+            str(graph_db_path),
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        for pragma in _SQLITE_PRAGMAS:
+            self.graph_memory_db.execute(pragma)
         
         # Create graph relationship table
         self.graph_memory_db.execute("""
@@ -139,16 +264,42 @@ class GraphEnhancedMemoryBank(MemoryBank):
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 memory_id TEXT NOT NULL,
                 project_path TEXT NOT NULL,
+                decision TEXT,
+                decision_tokens TEXT,
                 framework TEXT,
                 decision_type TEXT,
                 success_score REAL,
-                created_at TIMESTAMP,
-                INDEX(framework),
-                INDEX(decision_type),
-                INDEX(success_score)
+                created_at TIMESTAMP
             )
         """)
         
+        columns = {row[1] for row in self.graph_memory_db.execute("PRAGMA table_info(cross_project_memories)")}
+        if "decision_tokens" not in columns:
+            self.graph_memory_db.execute("ALTER TABLE cross_project_memories ADD COLUMN decision_tokens TEXT")
+        
+        # Covering indexes for the similarity, project and relationship lookups
+        self.graph_memory_db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cpm_fw_dt_score
+            ON cross_project_memories(framework, decision_type, success_score DESC, memory_id, decision)
+        """)
+        self.graph_memory_db.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_cpm_hot
+            ON cross_project_memories(framework, decision_type, success_score DESC)
+            WHERE success_score >= {_HOT_SUCCESS_SCORE}
+        """)
+        self.graph_memory_db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cpm_project
+            ON cross_project_memories(project_path, framework)
+        """)
+        self.graph_memory_db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_mr_source_strength
+            ON memory_relationships(source_memory_id, strength DESC)
+        """)
+        self.graph_memory_db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_mr_target_strength
+            ON memory_relationships(target_memory_id, strength DESC)
+        """)
+        
         # Create temporal pattern tracking
         self.graph_memory_db.execute("""
             CREATE TABLE IF NOT EXISTS temporal_patterns (
@@ -163,7 +314,75 @@ class GraphEnhancedMemoryBank(MemoryBank):
             )
         """)
         
+        # Full-text index over decisions; falls back to stored token sets without FTS5
+        self._fts_enabled = self._initialize_fts_index()
+        
+        # Materialized per-framework success rollup, updated alongside each insert
+        stats_exist = self.graph_memory_db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cpm_framework_stats'"
+        ).fetchone()
+        self.graph_memory_db.execute("""
+            CREATE TABLE IF NOT EXISTS cpm_framework_stats (
+                framework TEXT NOT NULL,
+                decision_type TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                sum_success REAL NOT NULL,
+                avg_success REAL AS (sum_success / total) STORED,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (framework, decision_type)
+            )
+        """)
+        if not stats_exist:
+            self.graph_memory_db.execute("""
+                INSERT INTO cpm_framework_stats (framework, decision_type, total, sum_success, updated_at)
+                SELECT framework, IFNULL(decision_type, ''), COUNT(*), TOTAL(success_score), MAX(created_at)
+                FROM cross_project_memories
+                WHERE framework IS NOT NULL
+                GROUP BY framework, IFNULL(decision_type, '')
+            """)
+        
         self.graph_memory_db.commit()
+        
+        # Refresh planner statistics so the partial index is preferred for top-K lookups
+        self.graph_memory_db.execute("ANALYZE cross_project_memories")
+    
+    def _initialize_fts_index(self) -> bool:
+        """Create the FTS5 decision index and its sync triggers, if SQLite supports FTS5"""
+        try:
+            fts_exists = self.graph_memory_db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cpm_fts'"
+            ).fetchone()
+            self.graph_memory_db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS cpm_fts USING fts5(
+                    decision,
+                    content='cross_project_memories',
+                    content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """)
+            self.graph_memory_db.execute("""
+                CREATE TRIGGER IF NOT EXISTS cpm_fts_ai AFTER INSERT ON cross_project_memories BEGIN
+                    INSERT INTO cpm_fts(rowid, decision) VALUES (new.id, new.decision);
+                END
+            """)
+            self.graph_memory_db.execute("""
+                CREATE TRIGGER IF NOT EXISTS cpm_fts_ad AFTER DELETE ON cross_project_memories BEGIN
+                    INSERT INTO cpm_fts(cpm_fts, rowid, decision) VALUES ('delete', old.id, old.decision);
+                END
+            """)
+            self.graph_memory_db.execute("""
+                CREATE TRIGGER IF NOT EXISTS cpm_fts_au AFTER UPDATE OF decision ON cross_project_memories BEGIN
+                    INSERT INTO cpm_fts(cpm_fts, rowid, decision) VALUES ('delete', old.id, old.decision);
+                    INSERT INTO cpm_fts(rowid, decision) VALUES (new.id, new.decision);
+                END
+            """)
+            if not fts_exists:
+                self.graph_memory_db.execute("INSERT INTO cpm_fts(cpm_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"FTS5 unavailable, using token-set similarity: {e}")
+            return False
+        
+        return True
     
     async def _initialize_graph_schemas(self):
         """Initialize knowledge graph schemas for memory integration"""
@@ -184,12 +403,16 @@ class GraphEnhancedMemoryBank(MemoryBank):
                 "CREATE INDEX project_framework IF NOT EXISTS FOR ()-[r:USED_IN_PROJECT]-() ON (r.framework)",
             ]
             
-            async with self.neo4j_client.session() as session:
-                for query in memory_schema_queries:
-                    try:
-                        await session.run(query)
-                    except Exception as e:
-                        self.logger.debug(f"Schema query warning: {e}")
+            await asyncio.gather(*(self._run_schema_query(query) for query in memory_schema_queries))
+    
+    async def _run_schema_query(self, query: str):
+        """Run one schema statement in a managed transaction, retrying schema lock conflicts"""
+        try:
+            async with self.neo4j_client.session(database=self.neo4j_client.database) as session:
+                await session.execute_write(self._run_write, query, {})
+        except Exception as e:
+            # Statements are IF NOT EXISTS, so a failure here means a missing index
+            self.logger.warning(f"Schema query failed: {query}: {e}")
     
     async def store_decision_with_graph(self,
                                       decision: str,
@@ -205,13 +428,6 @@ class GraphEnhancedMemoryBank(MemoryBank):
         memory_id = await super().store_decision(decision, context, outcome, rationale)
         
         try:
-            # Store in cross-project index
-            self.graph_memory_db.execute("""
-                INSERT INTO cross_project_memories 
-                (memory_id, project_path, framework, decision_type, success_score, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (memory_id, self.project_path, framework, decision_type, success_score, datetime.now()))
-            
             # Create temporal entity in Graphiti
             if self.graphiti_engine:
                 temporal_entity_id = await self.graphiti_engine.create_temporal_entity(
@@ -237,10 +453,9 @@ class GraphEnhancedMemoryBank(MemoryBank):
                     framework, decision_type, success_score
                 )
             
-            # Find and create relationships with similar memories
-            await self._create_memory_relationships(memory_id, decision, framework, decision_type)
-            
-            self.graph_memory_db.commit()
+            await self._run_db(
+                self._index_memories, [(memory_id, decision, framework, decision_type, success_score)]
+            )
             
             self.logger.info(f"Stored decision with graph enhancement: {memory_id}")
             return memory_id
@@ -249,6 +464,145 @@ class GraphEnhancedMemoryBank(MemoryBank):
             self.logger.error(f"Failed to store decision with graph enhancement: {e}")
             return memory_id  # Return base memory ID even if graph enhancement fails
     
+    async def store_decisions_with_graph(self, records: List[Dict[str, Any]]) -> List[str]:
+        """Store a batch of decisions with one Graphiti, Neo4j and SQLite write each
+        
+        Each record holds ``decision``, ``context``, ``outcome`` and ``rationale``,
+        and optionally ``framework``, ``decision_type`` and ``success_score``.
+        Memory IDs are returned in input order.
+        """
+        
+        memory_ids = []
+        for record in records:
+            memory_ids.append(await super().store_decision(
+                record["decision"], record["context"], record["outcome"], record["rationale"]
+            ))
+        
+        if not records:
+            return memory_ids
+        
+        decisions = [
+            {
+                "decision": record["decision"],
+                "context": record["context"],
+                "outcome": record["outcome"],
+                "rationale": record["rationale"],
+                "framework": record.get("framework"),
+                "decision_type": record.get("decision_type"),
+                "success_score": record.get("success_score", 0.5),
+                "project_path": self.project_path
+            }
+            for record in records
+        ]
+        
+        try:
+            # Create temporal entities in Graphiti
+            if self.graphiti_engine:
+                await self.graphiti_engine.create_temporal_entities_bulk([
+                    {
+                        "name": f"memory_{memory_id}",
+                        "type": "ProjectMemory",
+                        "properties": properties,
+                        "framework": properties["framework"]
+                    }
+                    for memory_id, properties in zip(memory_ids, decisions)
+                ])
+            
+            # Create memory nodes in Neo4j
+            if self.neo4j_client:
+                rows = [
+                    {"project_path": self.project_path, "props": {"id": memory_id, **properties}}
+                    for memory_id, properties in zip(memory_ids, decisions)
+                ]
+                async with self.neo4j_client.session(database=self.neo4j_client.database) as session:
+                    await session.execute_write(self._run_write, _CREATE_MEMORY_NODES_QUERY, {"rows": rows})
+            
+            await self._run_db(self._index_memories, [
+                (memory_id, properties["decision"], properties["framework"],
+                 properties["decision_type"], properties["success_score"])
+                for memory_id, properties in zip(memory_ids, decisions)
+            ])
+            
+            self.logger.info(f"Stored {len(decisions)} decisions with graph enhancement")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to store decisions with graph enhancement: {e}")
+        
+        return memory_ids  # Base memory IDs are returned even if graph enhancement fails
+    
+    @staticmethod
+    async def _run_write(tx, query: str, parameters: Dict[str, Any]):
+        """Transaction function for writes, retried by the driver on transient errors"""
+        result = await tx.run(query, parameters)
+        await result.consume()
+    
+    async def _run_db(self, func, *args):
+        """Run blocking SQLite work in a worker thread so it doesn't stall the event loop"""
+        return await asyncio.to_thread(self._run_db_locked, func, *args)
+    
+    def _run_db_locked(self, func, *args):
+        """Serialize access to the shared SQLite connection across worker threads"""
+        with self._graph_db_lock:
+            return func(*args)
+    
+    def _fetchall(self, query: str, params: Any = ()) -> List[tuple]:
+        """Execute a query on the graph memory database and fetch every row"""
+        return self.graph_memory_db.execute(query, params).fetchall()
+    
+    def _get_cached(self, key: tuple) -> Optional[Any]:
+        """Return an unexpired cached result, if any"""
+        cached = self._context_cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._context_cache.move_to_end(key)
+                return cached[1]
+            del self._context_cache[key]
+        return None
+    
+    def _set_cached(self, key: tuple, value: Any):
+        """Cache a result, evicting the least recently used"""
+        self._context_cache[key] = (time.monotonic() + self.CONTEXT_CACHE_TTL, value)
+        if len(self._context_cache) > self.CONTEXT_CACHE_SIZE:
+            self._context_cache.popitem(last=False)
+    
+    def _index_memories(self, memories: List[Tuple[str, str, Optional[str], Optional[str], float]]):
+        """Index memories, their framework rollups and relationships in one transaction (one fsync)
+        
+        Each memory is ``(memory_id, decision, framework, decision_type, success_score)``.
+        """
+        
+        now = datetime.now()
+        tokens = [_tokenize(decision) for _, decision, _, _, _ in memories]
+        
+        self.graph_memory_db.execute("BEGIN")
+        try:
+            # Insert and link each memory in turn, so it only links to memories
+            # stored before it and every similar pair gets one new -> old edge
+            for (memory_id, decision, framework, decision_type, success_score), decision_tokens in zip(memories, tokens):
+                self.graph_memory_db.execute(_INSERT_MEMORY_SQL, (
+                    memory_id, self.project_path, decision, " ".join(decision_tokens),
+                    framework, decision_type, success_score, now
+                ))
+                self._create_memory_relationships(
+                    memory_id, decision, framework, decision_type, decision_tokens
+                )
+            self.graph_memory_db.executemany(_UPSERT_FRAMEWORK_STATS_SQL, [
+                (framework, decision_type, success_score, now)
+                for _, _, framework, decision_type, success_score in memories
+                if framework
+            ])
+            
+            self.graph_memory_db.execute("COMMIT")
+        except Exception:
+            self.graph_memory_db.execute("ROLLBACK")
+            raise
+        
+        self._cache_generation += 1
+        self._inserts_since_analyze += len(memories)
+        if self._inserts_since_analyze >= self.ANALYZE_INTERVAL:
+            self.graph_memory_db.execute("ANALYZE cross_project_memories")
+            self._inserts_since_analyze = 0
+    
     async def _create_memory_node_in_neo4j(self,
                                          memory_id: str,
                                          decision: str,
@@ -260,32 +614,11 @@ class GraphEnhancedMemoryBank(MemoryBank):
                                          success_score: float):
         """Create memory node in Neo4j knowledge graph"""
         
-        query = """
-        MERGE (p:Project {path: $project_path})
-        CREATE (m:Memory {
-            id: $memory_id,
-            decision: $decision,
-            context: $context,
-            outcome: $outcome,
-            rationale: $rationale,
-            framework: $framework,
-            decision_type: $decision_type,
-            success_score: $success_score,
-            created_at: datetime(),
-            project_path: $project_path
-        })
-        CREATE (m)-[:BELONGS_TO]->(p)
-        """
-        
-        if framework:
-            query += """
-            MERGE (f:Framework {name: $framework})
-            CREATE (m)-[:USES_FRAMEWORK]->(f)
-            """
-        
-        async with self.neo4j_client.session() as session:
-            await session.run(query, {
-                "memory_id": memory_id,
+        # Same static statement as the batch path, so both share one cached plan
+        row = {
+            "project_path": self.project_path,
+            "props": {
+                "id": memory_id,
                 "decision": decision,
                 "context": context,
                 "outcome": outcome,
@@ -294,56 +627,81 @@ class GraphEnhancedMemoryBank(MemoryBank):
                 "decision_type": decision_type,
                 "success_score": success_score,
                 "project_path": self.project_path
-            })
+            }
+        }
+        
+        async with self.neo4j_client.session(database=self.neo4j_client.database) as session:
+            await session.execute_write(self._run_write, _CREATE_MEMORY_NODES_QUERY, {"rows": [row]})
     
-    async def _create_memory_relationships(self,
-                                         memory_id: str,
-                                         decision: str,
-                                         framework: Optional[str],
-                                         decision_type: Optional[str]):
+    def _create_memory_relationships(self,
+                                   memory_id: str,
+                                   decision: str,
+                                   framework: Optional[str],
+                                   decision_type: Optional[str],
+                                   decision_tokens: Optional[frozenset] = None):
         """Create relationships between similar memories"""
         
-        # Find similar memories in current project
-        similar_memories = await self._find_similar_memories(
-            decision, framework, decision_type, limit=5
+        # Find similar memories in current project, other than the new memory itself
+        similar_memories = self._find_similar_memories(
+            decision, framework, decision_type, limit=5,
+            decision_tokens=decision_tokens, exclude_memory_id=memory_id
         )
         
+        rows = []
+        created_at = datetime.now()
         for similar_memory in similar_memories:
-            if similar_memory["memory_id"] != memory_id:
-                # Calculate relationship strength
-                strength = await self._calculate_relationship_strength(
-                    decision, similar_memory["decision"]
-                )
-                
-                if strength > 0.3:  # Only create significant relationships
-                    relationship = GraphMemoryRelationship(
-                        source_memory_id=memory_id,
-                        target_memory_id=similar_memory["memory_id"],
-                        relationship_type="similar_decision",
-                        strength=strength,
-                        metadata={
-                            "framework": framework,
-                            "decision_type": decision_type,
-                            "similarity_score": strength
-                        },
-                        created_at=datetime.now()
-                    )
-                    
-                    await self._store_memory_relationship(relationship)
-    
-    async def _find_similar_memories(self,
-                                   decision: str,
-                                   framework: Optional[str],
-                                   decision_type: Optional[str],
-                                   limit: int = 10) -> List[Dict[str, Any]]:
-        """Find similar memories using FTS and filters"""
+            strength = similar_memory["strength"]
+            
+            if strength > 0.3:  # Only create significant relationships
+                metadata = {
+                    "framework": framework,
+                    "decision_type": decision_type,
+                    "similarity_score": strength
+                }
+                rows.append((
+                    memory_id, similar_memory["memory_id"], "similar_decision",
+                    strength, json.dumps(metadata), created_at, created_at
+                ))
+        
+        if rows:
+            self.graph_memory_db.executemany(_INSERT_RELATIONSHIP_SQL, rows)
+    
+    def _find_similar_memories(self,
+                             decision: str,
+                             framework: Optional[str],
+                             decision_type: Optional[str],
+                             limit: int = 10,
+                             decision_tokens: Optional[frozenset] = None,
+                             exclude_memory_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Find similar memories with FTS5 candidate retrieval and token-set similarity
+        
+        bm25 only picks and orders the candidates: its scale depends on the
+        corpus, so strength is the Jaccard similarity of the stored token sets.
+        """
+        
+        decision_tokens = decision_tokens or _tokenize(decision)
+        if not self._fts_enabled:
+            return self._find_similar_memories_by_tokens(
+                decision_tokens, framework, decision_type, limit, exclude_memory_id
+            )
+        
+        tokens = _FTS_TOKEN_RE.findall(decision.lower())
+        if not tokens:
+            return []
+        match_expr = " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
         
         query = """
-            SELECT m.memory_id, m.decision, m.framework, m.decision_type, m.success_score
-            FROM cross_project_memories m
-            WHERE 1=1
+            SELECT m.memory_id, m.decision, m.framework, m.decision_type, m.success_score,
+                   m.decision_tokens
+            FROM cpm_fts
+            JOIN cross_project_memories m ON m.id = cpm_fts.rowid
+            WHERE cpm_fts MATCH ?
         """
-        params = []
+        params = [match_expr]
+        
+        if exclude_memory_id:
+            query += " AND m.memory_id != ?"
+            params.append(exclude_memory_id)
         
         if framework:
             query += " AND m.framework = ?"
@@ -353,54 +711,69 @@ class GraphEnhancedMemoryBank(MemoryBank):
             query += " AND m.decision_type = ?"
             params.append(decision_type)
         
-        query += " ORDER BY m.success_score DESC LIMIT ?"
+        query += " ORDER BY bm25(cpm_fts) LIMIT ?"
         params.append(limit)
         
         cursor = self.graph_memory_db.execute(query, params)
-        return [
-            {
-                "memory_id": row[0],
-                "decision": row[1],
-                "framework": row[2],
-                "decision_type": row[3],
-                "success_score": row[4]
-            }
-            for row in cursor.fetchall()
-        ]
+        return [self._similar_memory(decision_tokens, row) for row in cursor.fetchall()]
     
-    async def _calculate_relationship_strength(self, 
-                                             decision1: str, 
-                                             decision2: str) -> float:
-        """Calculate relationship strength between two decisions"""
+    def _find_similar_memories_by_tokens(self,
+                                         decision_tokens: frozenset,
+                                         framework: Optional[str],
+                                         decision_type: Optional[str],
+                                         limit: int,
+                                         exclude_memory_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fallback candidate search by success score when FTS5 is unavailable"""
+        
+        # Candidates come from the partial index of successful memories
+        query = f"""
+            SELECT m.memory_id, m.decision, m.framework, m.decision_type, m.success_score,
+                   m.decision_tokens
+            FROM cross_project_memories m
+            WHERE m.success_score >= {_HOT_SUCCESS_SCORE}
+        """
+        params = []
         
-        # Simple word-based similarity
-        words1 = set(decision1.lower().split())
-        words2 = set(decision2.lower().split())
+        if exclude_memory_id:
+            query += " AND m.memory_id != ?"
+            params.append(exclude_memory_id)
         
-        if not words1 or not words2:
-            return 0.0
+        if framework:
+            query += " AND m.framework = ?"
+            params.append(framework)
+        
+        if decision_type:
+            query += " AND m.decision_type = ?"
+            params.append(decision_type)
         
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        query += " ORDER BY m.success_score DESC LIMIT ?"
+        params.append(limit)
         
-        return intersection / union if union > 0 else 0.0
+        cursor = self.graph_memory_db.execute(query, params)
+        return [self._similar_memory(decision_tokens, row) for row in cursor.fetchall()]
+    
+    def _similar_memory(self, decision_tokens: frozenset, row: tuple) -> Dict[str, Any]:
+        """Build a similar-memory entry, scoring it against its persisted token set"""
+        stored_tokens = (
+            frozenset(map(sys.intern, row[5].split())) if row[5] is not None
+            else _tokenize(row[1] or "")
+        )
+        return {
+            "memory_id": row[0],
+            "decision": row[1],
+            "framework": row[2],
+            "decision_type": row[3],
+            "success_score": row[4],
+            "strength": self._calculate_relationship_strength(decision_tokens, stored_tokens)
+        }
     
-    async def _store_memory_relationship(self, relationship: GraphMemoryRelationship):
-        """Store memory relationship in database"""
+    @staticmethod
+    def _calculate_relationship_strength(tokens1: frozenset, tokens2: frozenset) -> float:
+        """Jaccard similarity between two decision token sets"""
+        if not tokens1 or not tokens2:
+            return 0.0
         
-        self.graph_memory_db.execute("""
-            INSERT INTO memory_relationships 
-            (source_memory_id, target_memory_id, relationship_type, strength, metadata, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            relationship.source_memory_id,
-            relationship.target_memory_id,
-            relationship.relationship_type,
-            relationship.strength,
-            json.dumps(relationship.metadata),
-            relationship.created_at,
-            relationship.created_at
-        ))
+        return len(tokens1 & tokens2) / len(tokens1 | tokens2)
     
     async def get_enhanced_context(self, 
                                  query: str,
@@ -408,6 +781,13 @@ class GraphEnhancedMemoryBank(MemoryBank):
                                  include_cross_project: bool = True) -> EnhancedMemoryContext:
         """Get enhanced memory context with graph relationships"""
         
+        # Keyed on the generation at call time, so a write racing this call can't
+        # publish a result computed from older data under the new generation
+        cache_key = ("context", query, framework, include_cross_project, self._cache_generation)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
         # Get base context from v4.0
         base_context = await super().get_relevant_context(query)
         
@@ -416,29 +796,24 @@ class GraphEnhancedMemoryBank(MemoryBank):
         decision_relationships = []
         temporal_patterns = []
         cross_framework_insights = []
+        success_probability = 0.5
+        cacheable = True
         
         try:
-            # Find related decisions through graph relationships
-            if include_cross_project:
-                related_projects = await self._get_related_projects(query, framework)
-                cross_framework_insights = await self._get_cross_framework_insights(query)
-            
-            # Get decision relationships
-            decision_relationships = await self._get_decision_relationships(query, framework)
-            
-            # Get temporal patterns from Graphiti
-            if self.graphiti_engine:
-                temporal_patterns = await self._get_temporal_patterns(query, framework)
-            
-            # Calculate enhanced success probability
-            success_probability = await self._calculate_success_probability(
-                query, framework, decision_relationships
+            # SQLite context in one worker-thread round trip, concurrently with
+            # temporal patterns from Graphiti
+            sqlite_context, temporal_patterns = await asyncio.gather(
+                self._run_db(self._load_enhanced_context, query, framework, include_cross_project),
+                self._get_temporal_patterns(query, framework)
             )
+            related_projects, cross_framework_insights, decision_relationships, success_probability = sqlite_context
             
         except Exception as e:
             self.logger.error(f"Failed to get enhanced context: {e}")
+            # Don't serve the degraded context to later calls
+            cacheable = False
         
-        return EnhancedMemoryContext(
+        enhanced_context = EnhancedMemoryContext(
             relevant_decisions=base_context.relevant_decisions,
             patterns=base_context.patterns,
             success_factors=base_context.success_factors,
@@ -450,39 +825,48 @@ class GraphEnhancedMemoryBank(MemoryBank):
             cross_framework_insights=cross_framework_insights,
             success_probability=success_probability
         )
-    
-    async def _get_related_projects(self, 
-                                  query: str, 
-                                  framework: Optional[str]) -> List[str]:
-        """Get related projects that dealt with similar issues"""
-        
-        query_sql = """
-            SELECT DISTINCT project_path, COUNT(*) as relevance_count
-            FROM cross_project_memories m
-            WHERE m.project_path != ?
-        """
-        params = [self.project_path]
+        if cacheable:
+            self._set_cached(cache_key, enhanced_context)
         
-        if framework:
-            query_sql += " AND m.framework = ?"
-            params.append(framework)
+        return enhanced_context
+    
+    def _load_enhanced_context(self,
+                               query: str,
+                               framework: Optional[str],
+                               include_cross_project: bool) -> Tuple[List[str], List[str], List[GraphMemoryRelationship], float]:
+        """Load related projects, cross-framework insights, relationships and success probability"""
+        
+        rows = self.graph_memory_db.execute(_ENHANCED_CONTEXT_SQL, {
+            "project_path": self.project_path,
+            "framework": framework or None,
+            "cross_project": include_cross_project
+        }).fetchall()
+        
+        projects = sorted((row for row in rows if row[0] == "project"), key=lambda row: row[4], reverse=True)
+        insights = sorted((row for row in rows if row[0] == "insight"), key=lambda row: row[3], reverse=True)
+        historical = next((row for row in rows if row[0] == "base"), None)
+        
+        related_projects = [row[1] for row in projects]
+        cross_framework_insights = [
+            f"{insight_framework} {decision_type}: {avg_success:.1%} avg success "
+            f"({count} decisions)"
+            for _, insight_framework, decision_type, avg_success, count in insights
+        ]
         
-        query_sql += """
-            GROUP BY project_path
-            ORDER BY relevance_count DESC
-            LIMIT 5
-        """
+        decision_relationships = self._get_decision_relationships(query, framework)
+        success_probability = self._calculate_success_probability(
+            framework, historical, decision_relationships
+        )
         
-        cursor = self.graph_memory_db.execute(query_sql, params)
-        return [row[0] for row in cursor.fetchall()]
+        return related_projects, cross_framework_insights, decision_relationships, success_probability
     
-    async def _get_decision_relationships(self, 
-                                        query: str,
-                                        framework: Optional[str]) -> List[GraphMemoryRelationship]:
+    def _get_decision_relationships(self, 
+                                  query: str,
+                                  framework: Optional[str]) -> List[GraphMemoryRelationship]:
         """Get decision relationships relevant to the query"""
         
         # Find memories relevant to the query first
-        relevant_memories = await self._find_similar_memories(query, framework, None, limit=10)
+        relevant_memories = self._find_similar_memories(query, framework, None, limit=10)
         
         if not relevant_memories:
             return []
@@ -490,15 +874,21 @@ class GraphEnhancedMemoryBank(MemoryBank):
         memory_ids = [mem["memory_id"] for mem in relevant_memories]
         placeholders = ",".join("?" * len(memory_ids))
         
+        # Two index range scans instead of an OR, which SQLite would run as a full scan;
+        # the second branch skips edges the first one already returned
         query_sql = f"""
             SELECT source_memory_id, target_memory_id, relationship_type, strength, metadata, created_at
             FROM memory_relationships
-            WHERE source_memory_id IN ({placeholders}) OR target_memory_id IN ({placeholders})
+            WHERE source_memory_id IN ({placeholders})
+            UNION ALL
+            SELECT source_memory_id, target_memory_id, relationship_type, strength, metadata, created_at
+            FROM memory_relationships
+            WHERE target_memory_id IN ({placeholders}) AND source_memory_id NOT IN ({placeholders})
             ORDER BY strength DESC
             LIMIT 10
         """
         
-        cursor = self.graph_memory_db.execute(query_sql, memory_ids + memory_ids)
+        cursor = self.graph_memory_db.execute(query_sql, memory_ids * 3)
         
         relationships = []
         for row in cursor.fetchall():
@@ -508,7 +898,7 @@ class GraphEnhancedMemoryBank(MemoryBank):
                 relationship_type=row[2],
                 strength=row[3],
                 metadata=json.loads(row[4]) if row[4] else {},
-                created_at=datetime.fromisoformat(row[5])
+                created_at=row[5]
             ))
         
         return relationships
@@ -542,52 +932,17 @@ class GraphEnhancedMemoryBank(MemoryBank):
             self.logger.error(f"Failed to get temporal patterns: {e}")
             return []
     
-    async def _get_cross_framework_insights(self, query: str) -> List[str]:
-        """Get insights from similar decisions across different frameworks"""
-        
-        query_sql = """
-            SELECT framework, decision_type, AVG(success_score) as avg_success, COUNT(*) as count
-            FROM cross_project_memories
-            WHERE framework IS NOT NULL
-            GROUP BY framework, decision_type
-            HAVING count >= 2
-            ORDER BY avg_success DESC
-            LIMIT 5
-        """
-        
-        cursor = self.graph_memory_db.execute(query_sql)
-        
-        insights = []
-        for row in cursor.fetchall():
-            framework, decision_type, avg_success, count = row
-            insights.append(
-                f"{framework} {decision_type}: {avg_success:.1%} avg success "
-                f"({count} decisions)"
-            )
-        
-        return insights
-    
-    async def _calculate_success_probability(self,
-                                           query: str,
-                                           framework: Optional[str],
-                                           relationships: List[GraphMemoryRelationship]) -> float:
+    def _calculate_success_probability(self,
+                                     framework: Optional[str],
+                                     historical: Optional[tuple],
+                                     relationships: List[GraphMemoryRelationship]) -> float:
         """Calculate success probability based on historical data"""
         
         if not framework:
             return 0.5  # Neutral when no framework context
         
-        # Get historical success rates for similar decisions
-        query_sql = """
-            SELECT AVG(success_score) as avg_success, COUNT(*) as count
-            FROM cross_project_memories
-            WHERE framework = ?
-        """
-        
-        cursor = self.graph_memory_db.execute(query_sql, [framework])
-        row = cursor.fetchone()
-        
-        if row and row[1] > 0:  # Has historical data
-            base_probability = row[0]
+        if historical and historical[4]:  # Has historical data
+            base_probability = historical[3]
             
             # Adjust based on relationship strength
             if relationships:
@@ -603,6 +958,11 @@ class GraphEnhancedMemoryBank(MemoryBank):
                                         decision_type: Optional[str] = None) -> Dict[str, Any]:
         """Get learnings from across all projects using the same framework"""
         
+        cache_key = ("learnings", framework, decision_type, self._cache_generation)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
         query_sql = """
             SELECT 
                 COUNT(*) as total_decisions,
@@ -621,7 +981,7 @@ class GraphEnhancedMemoryBank(MemoryBank):
         
         query_sql += " GROUP BY decision_type ORDER BY avg_success DESC"
         
-        cursor = self.graph_memory_db.execute(query_sql, params)
+        rows = await self._run_db(self._fetchall, query_sql, params)
         
         learnings = {
             "framework": framework,
@@ -632,7 +992,7 @@ class GraphEnhancedMemoryBank(MemoryBank):
         total_decisions = 0
         total_success = 0.0
         
-        for row in cursor.fetchall():
+        for row in rows:
             decision_data = {
                 "decision_type": row[3],
                 "total_decisions": row[0],
@@ -652,6 +1012,8 @@ class GraphEnhancedMemoryBank(MemoryBank):
                 "frameworks_analyzed": 1
             }
         
+        self._set_cached(cache_key, learnings)
+        
         return learnings
     
     async def optimize_decision_with_graph(self, 
@@ -706,14 +1068,13 @@ class GraphEnhancedMemoryBank(MemoryBank):
         base_stats = super().get_performance_stats()
         
         # Add graph-specific stats
-        cursor = self.graph_memory_db.execute("SELECT COUNT(*) FROM memory_relationships")
-        relationship_count = cursor.fetchone()[0]
-        
-        cursor = self.graph_memory_db.execute("SELECT COUNT(DISTINCT project_path) FROM cross_project_memories")
-        project_count = cursor.fetchone()[0]
-        
-        cursor = self.graph_memory_db.execute("SELECT COUNT(DISTINCT framework) FROM cross_project_memories WHERE framework IS NOT NULL")
-        framework_count = cursor.fetchone()[0]
+        rows = await self._run_db(self._fetchall, """
+            SELECT
+                (SELECT COUNT(*) FROM memory_relationships),
+                (SELECT COUNT(DISTINCT project_path) FROM cross_project_memories),
+                (SELECT COUNT(DISTINCT framework) FROM cross_project_memories WHERE framework IS NOT NULL)
+        """)
+        relationship_count, project_count, framework_count = rows[0]
         
         base_stats.update({
             "graph_initialized": self.graph_initialized,
@@ -729,7 +1090,8 @@ class GraphEnhancedMemoryBank(MemoryBank):
         super().close()
         
         if self.graph_memory_db:
-            self.graph_memory_db.close()
+            with self._graph_db_lock:
+                self.graph_memory_db.close()
             self.logger.info("Graph-enhanced memory bank closed")
 
 
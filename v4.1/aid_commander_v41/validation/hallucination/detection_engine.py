@@ -7,6 +7,7 @@ multi-source validation consensus and automatic code correction.
 """
 
 import asyncio
+import hashlib
 import json
 import ast
 import re
@@ -22,6 +23,7 @@ import structlog
 from ..multi_layer.validation_engine import MultiLayerValidationEngine, ValidationResult, CodeAnalysis
 from ...knowledge_graph.graphiti.temporal_engine import AIDGraphitiEngine
 from ...knowledge_graph.rag.hybrid_search import HybridRAGSystem
+from ...caching.result_cache import RedisResultCache
 
 logger = structlog.get_logger(__name__)
 
@@ -86,11 +88,13 @@ class HallucinationDetectionEngine:
     def __init__(self,
                  validation_engine: MultiLayerValidationEngine,
                  graphiti_engine: AIDGraphitiEngine,
-                 rag_system: HybridRAGSystem):
+                 rag_system: HybridRAGSystem,
+                 result_cache: Optional[RedisResultCache] = None):
         
         self.validation_engine = validation_engine
         self.graphiti_engine = graphiti_engine
         self.rag_system = rag_system
+        self.result_cache = result_cache
         
         # Detection configuration
         self.confidence_threshold = 0.92
@@ -157,6 +161,22 @@ class HallucinationDetectionEngine:
         Comprehensive hallucination detection for generated code
         """
         
+        cache_key = None
+        if self.result_cache:
+            # The verdict depends on the thresholds, so changing either one
+            # must not serve results computed under the old values
+            cache_key = self.result_cache.make_key(
+                "hallucination",
+                hashlib.blake2b(generated_code.encode("utf-8")).hexdigest(),
+                ",".join(sorted(frameworks)),
+                code_intent,
+                self.confidence_threshold,
+                self.hallucination_threshold
+            )
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         start_time = datetime.now()
         self.logger.info(f"Starting hallucination detection for frameworks: {frameworks}")
         
@@ -230,6 +250,9 @@ class HallucinationDetectionEngine:
             self.detection_count += 1
             self.total_detection_time += processing_time
             
+            if cache_key:
+                await self.result_cache.set(cache_key, result)
+            
             self.logger.info(f"Hallucination detection completed: {len(all_hallucinations)} hallucinations, {confidence_score:.1%} confidence")
             return result
             
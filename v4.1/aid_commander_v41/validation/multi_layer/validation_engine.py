@@ -622,19 +622,13 @@ class TemporalValidator:
         issues = []
         validated_items = []
         
-        # Query successful patterns
-        successful_patterns = await self.graphiti_engine.query_successful_patterns(
+        # Query successful and failed patterns together
+        successful_patterns, failed_patterns = await self.graphiti_engine.query_patterns(
             framework=framework,
             min_success_rate=0.8,
             time_window_days=180
         )
         
-        # Query failed patterns
-        failed_patterns = await self.graphiti_engine.query_failed_patterns(
-            framework=framework,
-            time_window_days=180
-        )
-        
         if code_analysis:
             # Check if patterns match successful ones
             for pattern in code_analysis.patterns:
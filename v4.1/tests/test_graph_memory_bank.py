@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+AID Commander v4.1 - Graph-Enhanced Memory Bank Test Suite
+
+Tests for decision relationship tracking in the graph memory SQLite store.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from ..memory_enhanced.graph_memory_bank import GraphEnhancedMemoryBank
+
+
+class TestGraphMemoryRelationships:
+    """Test suite for similar-decision relationships"""
+    
+    @pytest.fixture
+    def memory_bank(self, tmp_path):
+        """Create a memory bank with only the graph memory database initialized"""
+        base_class = GraphEnhancedMemoryBank.__bases__[0]
+        with patch.object(base_class, "__init__", return_value=None):
+            bank = GraphEnhancedMemoryBank(str(tmp_path), graphiti_engine=None)
+        bank.project_path = str(tmp_path)
+        bank.memory_dir = tmp_path
+        bank._initialize_graph_memory_db()
+        yield bank
+        bank.graph_memory_db.close()
+    
+    def _relationships(self, bank):
+        return bank.graph_memory_db.execute(
+            "SELECT source_memory_id, target_memory_id, strength FROM memory_relationships"
+        ).fetchall()
+    
+    def test_similar_decisions_are_linked(self, memory_bank):
+        """Near-identical decisions are linked even in a tiny corpus"""
+        
+        assert memory_bank._fts_enabled
+        memory_bank._index_memories([(
+            "mem1", "Use FastAPI dependency injection for database sessions",
+            "FastAPI", "architecture", 0.9
+        )])
+        memory_bank._index_memories([(
+            "mem2", "Use FastAPI dependency injection for database connections",
+            "FastAPI", "architecture", 0.8
+        )])
+        
+        relationships = self._relationships(memory_bank)
+        
+        assert len(relationships) == 1
+        source, target, strength = relationships[0]
+        assert (source, target) == ("mem2", "mem1")
+        assert strength > 0.3
+    
+    def test_unrelated_decisions_are_not_linked(self, memory_bank):
+        """A single shared word does not create a relationship"""
+        
+        memory_bank._index_memories([(
+            "mem1", "Use FastAPI dependency injection for database sessions",
+            "FastAPI", "architecture", 0.9
+        )])
+        memory_bank._index_memories([(
+            "mem2", "Configure Redis eviction policy for the session cache",
+            "FastAPI", "architecture", 0.8
+        )])
+        
+        assert self._relationships(memory_bank) == []
+    
+    def test_memory_is_never_linked_to_itself(self, memory_bank):
+        """The new memory is excluded from its own candidate set"""
+        
+        memory_bank._index_memories([(
+            "mem1", "Use FastAPI dependency injection for database sessions",
+            "FastAPI", "architecture", 0.9
+        )])
+        
+        assert self._relationships(memory_bank) == []
+        similar = memory_bank._find_similar_memories(
+            "Use FastAPI dependency injection for database sessions",
+            "FastAPI", None, exclude_memory_id="mem1"
+        )
+        assert similar == []
+    
+    def test_similar_decisions_are_linked_without_fts(self, memory_bank):
+        """The token-set fallback links the same decisions"""
+        
+        memory_bank._fts_enabled = False
+        memory_bank._index_memories([(
+            "mem1", "Use FastAPI dependency injection for database sessions",
+            "FastAPI", "architecture", 0.9
+        )])
+        memory_bank._index_memories([(
+            "mem2", "Use FastAPI dependency injection for database connections",
+            "FastAPI", "architecture", 0.8
+        )])
+        
+        assert [(s, t) for s, t, _ in self._relationships(memory_bank)] == [("mem2", "mem1")]
+    
+    def test_batch_links_each_pair_once(self, memory_bank):
+        """A batch links each memory only to those stored before it"""
+        
+        memory_bank._index_memories([
+            ("mem1", "Use FastAPI dependency injection for database sessions",
+             "FastAPI", "architecture", 0.9),
+            ("mem2", "Use FastAPI dependency injection for database connections",
+             "FastAPI", "architecture", 0.8),
+            ("mem3", "Use FastAPI dependency injection for database pools",
+             "FastAPI", "architecture", 0.7)
+        ])
+        
+        edges = sorted((s, t) for s, t, _ in self._relationships(memory_bank))
+        assert edges == [("mem2", "mem1"), ("mem3", "mem1"), ("mem3", "mem2")]
+    
+    @pytest.mark.asyncio
+    async def test_store_decisions_batch_matches_single_path(self, memory_bank):
+        """Storing two similar decisions in one batch writes one new -> old edge"""
+        
+        memory_bank.graphiti_engine = None
+        memory_bank.neo4j_client = None
+        decisions = [
+            "Use FastAPI dependency injection for database sessions",
+            "Use FastAPI dependency injection for database connections"
+        ]
+        with patch.object(GraphEnhancedMemoryBank.__bases__[0], "store_decision",
+                          AsyncMock(side_effect=["mem1", "mem2"]), create=True):
+            memory_ids = await memory_bank.store_decisions_with_graph([
+                {"decision": decision, "context": "", "outcome": "success", "rationale": "",
+                 "framework": "FastAPI", "decision_type": "architecture", "success_score": 0.9}
+                for decision in decisions
+            ])
+        
+        relationships = self._relationships(memory_bank)
+        assert len(relationships) == 1
+        assert relationships[0][:2] == (memory_ids[1], memory_ids[0])
+
+
+class TestGraphSchema:
+    """Test suite for Neo4j memory schema initialization"""
+    
+    @pytest.mark.asyncio
+    async def test_schema_runs_in_retried_transactions(self, tmp_path):
+        """Each statement uses a managed write and failures are logged as warnings"""
+        
+        with patch.object(GraphEnhancedMemoryBank.__bases__[0], "__init__", return_value=None):
+            bank = GraphEnhancedMemoryBank(str(tmp_path), graphiti_engine=None)
+        session = Mock()
+        session.execute_write = AsyncMock(side_effect=[RuntimeError("lock conflict")] + [None] * 10)
+        bank.neo4j_client = Mock(database="neo4j")
+        bank.neo4j_client.session.return_value.__aenter__ = AsyncMock(return_value=session)
+        bank.neo4j_client.session.return_value.__aexit__ = AsyncMock(return_value=False)
+        bank.logger = Mock()
+        
+        await bank._initialize_graph_schemas()
+        
+        assert session.execute_write.await_count == 6
+        assert all(call.args[0] is bank._run_write for call in session.execute_write.await_args_list)
+        bank.logger.warning.assert_called_once()
+
+
+class TestEnhancedContextCache:
+    """Test suite for enhanced context caching"""
+    
+    @pytest.fixture
+    def memory_bank(self, tmp_path):
+        """Create a memory bank with a stubbed v4.0 base context"""
+        base_class = GraphEnhancedMemoryBank.__bases__[0]
+        base_context = Mock(
+            relevant_decisions=[], patterns=[], success_factors=[], warnings=[], confidence=0.5
+        )
+        with patch.object(base_class, "__init__", return_value=None), \
+             patch.object(base_class, "get_relevant_context", AsyncMock(return_value=base_context), create=True):
+            bank = GraphEnhancedMemoryBank(str(tmp_path), graphiti_engine=None)
+            bank.project_path = str(tmp_path)
+            bank.memory_dir = tmp_path
+            bank._initialize_graph_memory_db()
+            yield bank
+        bank.graph_memory_db.close()
+    
+    @pytest.mark.asyncio
+    async def test_context_is_cached(self, memory_bank):
+        """Repeated queries reuse the cached context"""
+        
+        with patch.object(memory_bank, "_load_enhanced_context", return_value=([], [], [], 0.8)) as load:
+            first = await memory_bank.get_enhanced_context("dependency injection", "FastAPI")
+            second = await memory_bank.get_enhanced_context("dependency injection", "FastAPI")
+        
+        assert second is first
+        assert load.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_context_is_not_cached(self, memory_bank):
+        """A context degraded by a load failure is recomputed on the next call"""
+        
+        with patch.object(memory_bank, "_load_enhanced_context",
+                          side_effect=[RuntimeError("database is locked"), ([], [], [], 0.8)]):
+            degraded = await memory_bank.get_enhanced_context("dependency injection", "FastAPI")
+            recovered = await memory_bank.get_enhanced_context("dependency injection", "FastAPI")
+        
+        assert degraded.success_probability == 0.5
+        assert recovered.success_probability == 0.8
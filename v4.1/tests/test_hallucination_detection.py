@@ -23,6 +23,7 @@ from ..validation.multi_layer.validation_engine import (
 )
 from ..knowledge_graph.graphiti.temporal_engine import AIDGraphitiEngine
 from ..knowledge_graph.rag.hybrid_search import HybridRAGSystem
+from ..caching.result_cache import RedisResultCache
 
 
 class TestHallucinationDetectionEngine:
@@ -526,6 +527,29 @@ obj.method_call()
         
         # Check frameworks detection
         assert "PydanticAI" in analysis.frameworks
+    
+    @pytest.mark.asyncio
+    async def test_result_cache_key_tracks_thresholds(self, hallucination_detector):
+        """Changing a threshold misses results cached under the old thresholds"""
+        
+        cache = RedisResultCache("redis://localhost:6379")
+        hallucination_detector.result_cache = Mock()
+        hallucination_detector.result_cache.make_key = Mock(side_effect=cache.make_key)
+        hallucination_detector.result_cache.get = AsyncMock(return_value=None)
+        hallucination_detector.result_cache.set = AsyncMock()
+        hallucination_detector.validation_engine.validate_code_generation.return_value = ValidationResult(
+            consensus_score=0.95, layer_results={}, overall_issues=[], confidence_breakdown={}
+        )
+        code = "from pydantic_ai import Agent"
+        
+        keys = []
+        for confidence_threshold, hallucination_threshold in [(0.92, 0.3), (0.92, 0.5), (0.8, 0.5)]:
+            hallucination_detector.confidence_threshold = confidence_threshold
+            hallucination_detector.hallucination_threshold = hallucination_threshold
+            await hallucination_detector.detect_hallucination(code, ["PydanticAI"])
+            keys.append(hallucination_detector.result_cache.get.await_args.args[0])
+        
+        assert len(set(keys)) == 3
 
 
 class TestHallucinationAccuracyBenchmark:
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+AID Commander v4.1 - Hybrid RAG System Test Suite
+
+Tests for vector search scoring, the binary two-stage index and batched
+API usage validation.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from ..knowledge_graph.rag import hybrid_search
+from ..knowledge_graph.rag.hybrid_search import (
+    HybridRAGSystem, HybridSearchResult, ValidationResult
+)
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class TestVectorSearch:
+    """Test suite for Chroma and binary index vector search"""
+    
+    @pytest.fixture
+    def rag_system(self):
+        """Create a RAG system with a mocked embedding model and collection"""
+        with patch.object(hybrid_search, "SentenceTransformer"):
+            system = HybridRAGSystem({}, {})
+        system.collection = Mock()
+        return system
+    
+    def _load_index(self, system, embeddings, frameworks):
+        """Populate the binary index and the FP32 store behind it"""
+        ids = [f"chunk{i}" for i in range(len(embeddings))]
+        system._binary_codes = system._binary_quantize(np.asarray([_unit(e) for e in embeddings]))
+        system._binary_ids = ids
+        system._binary_frameworks = frameworks
+        stored = dict(zip(ids, embeddings))
+        
+        def get(ids, include):
+            return {
+                "ids": ids,
+                "embeddings": [stored[chunk_id] for chunk_id in ids],
+                "documents": [f"doc {chunk_id}" for chunk_id in ids],
+                "metadatas": [{"source": chunk_id} for chunk_id in ids]
+            }
+        system.collection.get.side_effect = get
+    
+    def test_binary_search_reranks_by_cosine(self, rag_system):
+        """Candidates are ordered by FP32 cosine similarity"""
+        
+        query = _unit([1.0, 0.2, 0.0, 0.0])
+        self._load_index(rag_system, [
+            _unit([0.0, 1.0, 0.0, 0.0]),
+            _unit([1.0, 0.1, 0.0, 0.0]),
+            _unit([1.0, 1.0, 0.0, 0.0])
+        ], ["PydanticAI"] * 3)
+        
+        results = rag_system._binary_vector_search(query, None, 2)
+        
+        assert [result.source for result in results] == ["chunk1", "chunk2"]
+        assert results[0].relevance_score == pytest.approx(float(query @ _unit([1.0, 0.1, 0.0, 0.0])))
+    
+    def test_binary_search_normalizes_legacy_embeddings(self, rag_system):
+        """Unnormalized legacy embeddings still score as cosine similarity"""
+        
+        query = _unit([1.0, 0.0, 0.0, 0.0])
+        self._load_index(rag_system, [
+            np.asarray([5.0, 0.0, 0.0, 0.0], dtype=np.float32),
+            _unit([1.0, 1.0, 0.0, 0.0])
+        ], ["PydanticAI"] * 2)
+        
+        results = rag_system._binary_vector_search(query, None, 2)
+        
+        assert results[0].source == "chunk0"
+        assert results[0].relevance_score == pytest.approx(1.0)
+        assert results[1].relevance_score == pytest.approx(float(np.sqrt(0.5)))
+    
+    def test_binary_search_filters_by_framework(self, rag_system):
+        """Only chunks of the requested framework are considered"""
+        
+        query = _unit([1.0, 0.0, 0.0, 0.0])
+        self._load_index(rag_system, [
+            _unit([1.0, 0.0, 0.0, 0.0]),
+            _unit([1.0, 0.5, 0.0, 0.0])
+        ], ["FastAPI", "PydanticAI"])
+        
+        results = rag_system._binary_vector_search(query, "PydanticAI", 5)
+        assert [result.source for result in results] == ["chunk1"]
+        assert rag_system._binary_vector_search(query, "Django", 5) == []
+    
+    @pytest.mark.asyncio
+    async def test_chroma_search_reports_cosine(self, rag_system):
+        """Chroma squared L2 distances map onto the binary index's cosine scale"""
+        
+        rag_system._embed_query = Mock(return_value=_unit([1.0, 0.0]))
+        rag_system.collection.count.return_value = 2
+        rag_system.collection.query.return_value = {
+            "documents": [["same", "opposite"]],
+            "metadatas": [[{"source": "a"}, {"source": "b"}]],
+            "distances": [[0.0, 4.0]]
+        }
+        
+        results = await rag_system._vector_search("agents", max_results=2)
+        
+        assert [result.relevance_score for result in results] == [1.0, -1.0]
+
+
+class TestEmbeddingCache:
+    """Test suite for the persistent document embedding cache"""
+    
+    @pytest.fixture
+    def rag_system(self, tmp_path):
+        """Create a RAG system whose model returns fixed full-precision embeddings"""
+        with patch.object(hybrid_search, "SentenceTransformer"):
+            system = HybridRAGSystem({"embedding_cache_path": str(tmp_path / "emb.sqlite")}, {})
+        system.embedding_model.encode = Mock(
+            side_effect=lambda documents, **kwargs: np.asarray(
+                [_unit([1.0, 1.0 / 3.0, 0.1234567]) for _ in documents], dtype=np.float32
+            )
+        )
+        yield system
+        if system._embedding_cache is not None:
+            system._embedding_cache.close()
+    
+    def test_fresh_embeddings_keep_float32_precision(self, rag_system):
+        """A cache miss returns the model output unrounded"""
+        
+        embeddings = rag_system._encode_documents(["Agent docs"])
+        
+        assert embeddings.dtype == np.float32
+        np.testing.assert_array_equal(embeddings[0], _unit([1.0, 1.0 / 3.0, 0.1234567]))
+    
+    def test_cache_hits_skip_the_model(self, rag_system):
+        """Cached documents are served from float16 storage within rounding error"""
+        
+        fresh = rag_system._encode_documents(["Agent docs"])
+        cached = rag_system._encode_documents(["Agent docs", "Tool docs"])
+        
+        assert rag_system.embedding_model.encode.call_count == 2
+        assert rag_system.embedding_model.encode.call_args.args[0] == ["Tool docs"]
+        assert cached.dtype == np.float32
+        np.testing.assert_allclose(cached[0], fresh[0], atol=1e-3)
+        np.testing.assert_array_equal(cached[1], fresh[0])
+
+
+class TestAPIUsageValidation:
+    """Test suite for batched API usage validation"""
+    
+    @pytest.fixture
+    def rag_system(self):
+        """Create a RAG system with mocked search and graph lookups"""
+        with patch.object(hybrid_search, "SentenceTransformer"):
+            system = HybridRAGSystem({}, {})
+        system.hybrid_search = AsyncMock(return_value=HybridSearchResult())
+        system._query_api_structures = AsyncMock(return_value={
+            "Agent.run": [{"class_name": "Agent", "method_name": "run", "confidence": 0.95}]
+        })
+        return system
+    
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_graph_query(self, rag_system):
+        """Every pending call is resolved by a single graph round-trip"""
+        
+        validations = await rag_system.validate_api_usage_batch(
+            ["Agent.run", "Agent.fly"], "PydanticAI"
+        )
+        
+        assert list(validations) == ["Agent.run", "Agent.fly"]
+        assert validations["Agent.run"].is_valid
+        assert not validations["Agent.fly"].is_valid
+        rag_system._query_api_structures.assert_awaited_once_with(
+            ["Agent.run", "Agent.fly"], "PydanticAI"
+        )
+        assert rag_system.hybrid_search.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_batch_serves_cached_validations(self, rag_system):
+        """Cached calls skip search and are not written back"""
+        
+        cached = ValidationResult(is_valid=True, confidence=0.9)
+        rag_system.result_cache = Mock()
+        rag_system.result_cache.make_key = Mock(side_effect=lambda prefix, call, framework: call)
+        rag_system.result_cache.get_many = AsyncMock(return_value=[cached, None])
+        rag_system.result_cache.set = AsyncMock()
+        
+        validations = await rag_system.validate_api_usage_batch(
+            ["Agent.run", "Agent.fly"], "PydanticAI"
+        )
+        
+        assert validations["Agent.run"] is cached
+        rag_system._query_api_structures.assert_awaited_once_with(["Agent.fly"], "PydanticAI")
+        rag_system.result_cache.set.assert_awaited_once_with("Agent.fly", validations["Agent.fly"])
+    
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, rag_system):
+        """An empty batch does no work"""
+        
+        assert await rag_system.validate_api_usage_batch([], "PydanticAI") == {}
+        rag_system._query_api_structures.assert_not_awaited()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+AID Commander v4.1 - Pydantic AI Knowledge Builder Test Suite
+
+Tests for the ETag-keyed documentation cache used by incremental rebuilds.
+"""
+
+import httpx
+import lxml.html
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from ..frameworks.pydantic_ai import knowledge_builder
+from ..frameworks.pydantic_ai.knowledge_builder import PydanticAIKnowledgeBuilder, ValidationPattern
+
+
+DOCS_PAGES = {
+    "https://ai.pydantic.dev": (
+        "<html><body><h2>Agent class</h2><p>Agent(\"openai:gpt-4\")</p>"
+        "<a href=\"/agents/\">Agents</a><a href=\"/tools/\">Tools</a></body></html>"
+    ),
+    "https://ai.pydantic.dev/agents/": (
+        "<html><body><pre>from pydantic_ai import RunContext</pre></body></html>"
+    ),
+    "https://ai.pydantic.dev/tools/": (
+        "<html><body><pre>from pydantic_ai import Tool</pre></body></html>"
+    )
+}
+
+
+class TestDocumentationCache:
+    """Test suite for the documentation extraction cache"""
+    
+    @pytest.fixture
+    def make_builder(self, tmp_path):
+        """Create builders sharing one cache directory and a mocked docs site"""
+        
+        def make(etag='"v1"', failing_pages=()):
+            with patch.object(knowledge_builder.httpx, "AsyncClient"):
+                builder = PydanticAIKnowledgeBuilder(Mock(), Mock(), cache_dir=str(tmp_path))
+            builder._client.head = AsyncMock(return_value=Mock(headers={"etag": etag}))
+            
+            async def fetch_page(url):
+                if url in failing_pages:
+                    raise httpx.ConnectError("connection reset")
+                return lxml.html.fromstring(DOCS_PAGES[url])
+            builder._fetch_page = AsyncMock(side_effect=fetch_page)
+            return builder
+        return make
+    
+    async def _extract(self, builder):
+        return [entity.name async for entity in builder._extract_from_documentation()]
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_docs_are_served_from_cache(self, make_builder):
+        """A second build with the same ETag skips every page download"""
+        
+        first = make_builder()
+        extracted = await self._extract(first)
+        assert extracted and first.docs_cache_path.exists()
+        
+        second = make_builder()
+        cached = await self._extract(second)
+        
+        assert sorted(cached) == sorted(extracted)
+        assert set(second.entities) == set(first.entities)
+        second._fetch_page.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_changed_etag_refetches(self, make_builder):
+        """A new ETag invalidates the cached extraction"""
+        
+        await self._extract(make_builder())
+        
+        changed = make_builder(etag='"v2"')
+        await self._extract(changed)
+        
+        assert changed._fetch_page.await_count == len(DOCS_PAGES)
+    
+    @pytest.mark.asyncio
+    async def test_partial_extraction_is_not_cached(self, make_builder):
+        """A failed sub-page download leaves no cache behind"""
+        
+        builder = make_builder(failing_pages={"https://ai.pydantic.dev/tools/"})
+        await self._extract(builder)
+        
+        assert not builder.docs_cache_path.exists()
+    
+    @pytest.mark.asyncio
+    async def test_cache_version_is_part_of_the_key(self, make_builder):
+        """Caches written by an older extraction version are ignored"""
+        
+        await self._extract(make_builder())
+        
+        with patch.object(knowledge_builder, "_DOCS_CACHE_VERSION", knowledge_builder._DOCS_CACHE_VERSION + 1):
+            builder = make_builder()
+            await self._extract(builder)
+        
+        assert builder._fetch_page.await_count == len(DOCS_PAGES)
+
+
+class TestPatternMatching:
+    """Test suite for the validation pattern matcher"""
+    
+    def test_overlapping_needles_all_match(self):
+        """Needles starting at the same position are all reported"""
+        
+        with patch.object(knowledge_builder.httpx, "AsyncClient"):
+            builder = PydanticAIKnowledgeBuilder(Mock(), Mock(), cache_dir=None)
+        builder._pattern_matcher = builder._build_pattern_matcher([
+            ValidationPattern("sync_run", "PydanticAI", "agent.run_sync(", ["agent.sync_run("], 0.9, []),
+            ValidationPattern("async_run", "PydanticAI", "agent.run", ["agent.execute("], 0.9, [])
+        ])
+        
+        mistakes, correct = builder._match_patterns("result = agent.run_sync('hi')")
+        
+        assert mistakes == set()
+        assert correct == {"sync_run", "async_run"}
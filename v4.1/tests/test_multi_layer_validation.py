@@ -38,7 +38,7 @@ class TestMultiLayerValidationEngine:
     async def mock_graphiti_engine(self):
         """Create mock Graphiti engine"""
         engine = Mock(spec=AIDGraphitiEngine)
-        engine.query_successful_patterns = AsyncMock(return_value=[
+        successful_patterns = [
             Pattern(
                 id="pattern1",
                 name="BasicAgentSetup",
@@ -52,8 +52,10 @@ class TestMultiLayerValidationEngine:
                 last_used=datetime.now(),
                 usage_count=50
             )
-        ])
+        ]
+        engine.query_successful_patterns = AsyncMock(return_value=successful_patterns)
         engine.query_failed_patterns = AsyncMock(return_value=[])
+        engine.query_patterns = AsyncMock(return_value=(successful_patterns, []))
         engine.neo4j_driver = Mock()
         return engine
     
@@ -457,8 +459,7 @@ class TestIndividualValidators:
             usage_count=100
         )
         
-        mock_graphiti_engine.query_successful_patterns.return_value = [successful_pattern]
-        mock_graphiti_engine.query_failed_patterns.return_value = []
+        mock_graphiti_engine.query_patterns.return_value = ([successful_pattern], [])
         
         validator = TemporalValidator(mock_graphiti_engine)
         
@@ -483,6 +484,9 @@ class TestIndividualValidators:
         assert result.confidence >= 0.8  # High confidence due to successful patterns
         assert result.metadata["successful_patterns_found"] == 1
         assert result.metadata["failed_patterns_found"] == 0
+        mock_graphiti_engine.query_patterns.assert_awaited_once_with(
+            framework="PydanticAI", min_success_rate=0.8, time_window_days=180
+        )
     
     @pytest.mark.asyncio
     async def test_documentation_validator(self):
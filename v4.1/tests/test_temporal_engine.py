@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+AID Commander v4.1 - Graphiti Temporal Engine Test Suite
+
+Tests for pattern queries and pattern cache invalidation in the temporal engine.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from ..knowledge_graph.graphiti import temporal_engine
+from ..knowledge_graph.graphiti.temporal_engine import AIDGraphitiEngine
+
+
+class _GraphNode(dict):
+    """Neo4j node stand-in: a property mapping with labels"""
+    
+    def __init__(self, labels, **properties):
+        super().__init__(properties)
+        self.labels = frozenset(labels)
+
+
+class _Result:
+    """Neo4j result stand-in that yields records one at a time"""
+    
+    def __init__(self, rows):
+        self.rows = rows
+    
+    async def __aiter__(self):
+        for row in self.rows:
+            yield Mock(values=Mock(return_value=row))
+
+
+def _pattern_node(pattern_id, pattern_type, success_rate):
+    return {
+        "id": pattern_id,
+        "name": f"Pattern {pattern_id}",
+        "framework": "PydanticAI",
+        "pattern_type": pattern_type,
+        "code_template": "agent = Agent('openai:gpt-4')",
+        "success_rate": success_rate,
+        "use_cases": ["agents"],
+        "usage_count": 3
+    }
+
+
+class TestPatternQueries:
+    """Test suite for combined and cached pattern queries"""
+    
+    @pytest.fixture
+    def engine(self):
+        """Create an engine with a mocked Neo4j driver"""
+        driver = Mock()
+        driver.execute_query = AsyncMock(return_value=([
+            {"p": _pattern_node("s1", "success", 0.95), "category": "success"},
+            {"p": _pattern_node("f1", "failure", 0.1), "category": "failure"},
+            {"p": _pattern_node("s2", "success", 0.9), "category": "success"}
+        ], None, None))
+        return AIDGraphitiEngine({}, driver=driver)
+    
+    @pytest.mark.asyncio
+    async def test_query_patterns_splits_categories(self, engine):
+        """One round trip returns successful and failed patterns separately"""
+        
+        successful, failed = await engine.query_patterns("PydanticAI")
+        
+        assert [p.id for p in successful] == ["s1", "s2"]
+        assert [p.id for p in failed] == ["f1"]
+        assert engine.driver.execute_query.await_count == 1
+        assert engine.query_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_query_patterns_fills_both_cache_entries(self, engine):
+        """Follow-up single-category queries are served from the local cache"""
+        
+        await engine.query_patterns("PydanticAI")
+        successful = await engine.query_successful_patterns("PydanticAI")
+        failed = await engine.query_failed_patterns("PydanticAI")
+        
+        assert [p.id for p in successful] == ["s1", "s2"]
+        assert [p.id for p in failed] == ["f1"]
+        assert engine.driver.execute_query.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_usage_update_invalidates_cached_patterns(self, engine):
+        """Recording usage drops both cache tiers for the affected framework"""
+        
+        engine.result_cache = Mock()
+        engine.result_cache.delete_prefix = AsyncMock(return_value=1)
+        await engine.query_patterns("PydanticAI")
+        engine._cache_patterns(("success", "FastAPI", None, 0.8, 180), [])
+        
+        engine.driver.execute_query.return_value = (
+            [{"id": "s1", "framework": "PydanticAI", "success_rate": 0.75}], None, None
+        )
+        success_rates = await engine.update_pattern_usage_batch([("s1", False)])
+        
+        assert success_rates == {"s1": 0.75}
+        assert [key[1] for key in engine._pattern_cache] == ["FastAPI"]
+        engine.result_cache.delete_prefix.assert_awaited_once_with("patterns:PydanticAI")
+    
+    @pytest.mark.asyncio
+    async def test_redis_pattern_keys_are_scoped_by_framework(self, engine):
+        """Redis pattern keys carry the prefix that invalidation deletes"""
+        
+        engine.result_cache = Mock()
+        engine.result_cache.make_key = Mock(return_value="aid:v41:patterns:PydanticAI:abc")
+        engine.result_cache.get = AsyncMock(return_value=None)
+        engine.result_cache.set = AsyncMock()
+        engine.driver.execute_query.return_value = (
+            [{"p": _pattern_node("s1", "success", 0.95)}], None, None
+        )
+        
+        await engine.query_successful_patterns("PydanticAI")
+        
+        assert engine.result_cache.make_key.call_args.args[0] == "patterns:PydanticAI"
+        engine.result_cache.set.assert_awaited_once()
+
+
+class TestLegacyPatterns:
+    """Test suite for patterns stored before the current pattern schema"""
+    
+    @pytest.fixture
+    def legacy_node(self):
+        """A pattern node written before created_at_epoch and list use_cases existed"""
+        node = _pattern_node("legacy", "success", 0.9)
+        node["created_at"] = SimpleNamespace(epochSeconds=int(time.time()) - 86400)
+        node["use_cases"] = '["agents", "tools"]'
+        return node
+    
+    @pytest.fixture
+    def engine(self, legacy_node):
+        """Create an engine over a driver that applies the migrations to one node"""
+        
+        async def execute_query(query, parameters=None, **kwargs):
+            if "SET p.created_at_epoch" in query:
+                if legacy_node.get("created_at_epoch") is None:
+                    legacy_node["created_at_epoch"] = legacy_node["created_at"].epochSeconds
+            elif "STARTS WITH" in query:
+                # String predicates are null for list values in Cypher
+                if isinstance(legacy_node["use_cases"], str):
+                    return [{"id": "legacy", "use_cases": legacy_node["use_cases"]}], None, None
+            elif "SET p.use_cases" in query:
+                legacy_node["use_cases"] = parameters["rows"][0]["use_cases"]
+            elif query in (temporal_engine._Q_SUCCESS_NO_USECASE, temporal_engine._Q_SUCCESS_WITH_USECASE):
+                # Comparisons against a missing property are null in Cypher
+                epoch = legacy_node.get("created_at_epoch")
+                in_window = epoch is not None and epoch >= parameters["cutoff"]
+                use_cases = legacy_node["use_cases"]
+                matches_use_case = "use_case" not in parameters or (
+                    isinstance(use_cases, list) and parameters["use_case"] in use_cases
+                )
+                if in_window and matches_use_case:
+                    return [{"p": dict(legacy_node)}], None, None
+            return [], None, None
+        
+        driver = Mock()
+        driver.execute_query = AsyncMock(side_effect=execute_query)
+        session = AsyncMock()
+        session.run.return_value.single = AsyncMock()
+        driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+        driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+        return AIDGraphitiEngine({}, driver=driver)
+    
+    @pytest.mark.asyncio
+    async def test_legacy_pattern_is_returned_after_initialize(self, engine, legacy_node):
+        """Initialization backfills created_at_epoch so old patterns stay in range"""
+        
+        assert await engine.initialize()
+        patterns = await engine.query_successful_patterns("PydanticAI")
+        
+        assert [p.id for p in patterns] == ["legacy"]
+        assert legacy_node["created_at_epoch"] == legacy_node["created_at"].epochSeconds
+    
+    @pytest.mark.asyncio
+    async def test_epoch_backfill_is_idempotent(self, engine, legacy_node):
+        """Running the backfill again leaves migrated patterns untouched"""
+        
+        await engine._backfill_pattern_epochs()
+        legacy_node["created_at_epoch"] = 1
+        await engine._backfill_pattern_epochs()
+        
+        assert legacy_node["created_at_epoch"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_legacy_use_cases_are_filterable_after_initialize(self, engine, legacy_node):
+        """JSON-string use_cases are migrated to lists that use-case filters match"""
+        
+        assert await engine.initialize()
+        patterns = await engine.query_successful_patterns("PydanticAI", use_case="tools")
+        
+        assert legacy_node["use_cases"] == ["agents", "tools"]
+        assert [p.use_cases for p in patterns] == [["agents", "tools"]]
+    
+    @pytest.mark.asyncio
+    async def test_use_case_migration_skips_migrated_patterns(self, engine, legacy_node):
+        """A second migration run finds nothing to rewrite"""
+        
+        await engine._migrate_pattern_use_cases()
+        await engine._migrate_pattern_use_cases()
+        
+        writes = [call for call in engine.driver.execute_query.await_args_list
+                  if "SET p.use_cases" in call.args[0]]
+        assert len(writes) == 1
+
+
+class TestTemporalQueries:
+    """Test suite for buffered and streamed custom temporal queries"""
+    
+    @pytest.fixture
+    def engine(self):
+        """Create an engine whose sessions return one entity row and one pattern row"""
+        rows = [
+            [_GraphNode(["TemporalEntity"], id="e1", name="Agent", type="class", properties="{}"), 42],
+            [_GraphNode(["Pattern"], **_pattern_node("p1", "success", 0.9))]
+        ]
+        session = Mock()
+        session.run = AsyncMock(return_value=_Result(rows))
+        driver = Mock()
+        driver.session.return_value.__aenter__ = AsyncMock(return_value=session)
+        driver.session.return_value.__aexit__ = AsyncMock(return_value=False)
+        return AIDGraphitiEngine({"fetch_size": 500}, driver=driver)
+    
+    @pytest.mark.asyncio
+    async def test_temporal_query_groups_results(self, engine):
+        """The buffered query sorts parsed values into entities and patterns"""
+        
+        result = await engine.temporal_query("MATCH (n) RETURN n", {"limit": 2})
+        
+        assert [entity.id for entity in result.entities] == ["e1"]
+        assert [pattern.id for pattern in result.patterns] == ["p1"]
+        assert result.relationships == []
+        assert engine.driver.session.call_args.kwargs["fetch_size"] == 500
+        assert "default_access_mode" not in engine.driver.session.call_args.kwargs
+    
+    @pytest.mark.asyncio
+    async def test_temporal_query_stream_yields_in_order(self, engine):
+        """The streamed query yields parsed values as records arrive, on a read session"""
+        
+        streamed = [item.id async for item in engine.temporal_query_stream("MATCH (n) RETURN n")]
+        
+        assert streamed == ["e1", "p1"]
+        assert engine.driver.session.call_args.kwargs["default_access_mode"] == temporal_engine.READ_ACCESS
+        assert engine.driver.session.call_args.kwargs["fetch_size"] == 500